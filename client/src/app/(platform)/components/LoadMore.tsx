@@ -0,0 +1,34 @@
+"use client";
+
+import React from "react";
+
+type LoadMoreProps = {
+    hasNextPage: boolean;
+    isFetchingNextPage: boolean;
+    fetchNextPage: () => void;
+    label?: string;
+};
+
+const LoadMore = ({
+    hasNextPage,
+    isFetchingNextPage,
+    fetchNextPage,
+    label = "Load more",
+}: LoadMoreProps) => {
+    if (!hasNextPage) return null;
+
+    return (
+        <div className="flex justify-center">
+            <button
+                type="button"
+                onClick={() => fetchNextPage()}
+                disabled={isFetchingNextPage}
+                className="rounded-lg border border-primarypurple/40 bg-white px-4 py-1.5 text-sm font-semibold text-primarypurple transition hover:bg-primarypurple/5 disabled:opacity-60"
+            >
+                {isFetchingNextPage ? "Loading..." : label}
+            </button>
+        </div>
+    );
+};
+
+export default LoadMore;
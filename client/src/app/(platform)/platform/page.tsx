@@ -1,23 +1,58 @@
 "use client";
 
-import React, { useMemo, useState } from "react";
-import { useQuery } from "@tanstack/react-query";
+import React, { useEffect, useState } from "react";
+import { useInfiniteQuery } from "@tanstack/react-query";
 import { authFetch } from "@/lib/authFetch";
+import { flattenPages, nextCursor, withParams, Page } from "@/lib/pagination";
 import ProjectCard from "../components/ProjectCard";
+import LoadMore from "../components/LoadMore";
+
+const AVAILABLE_TAGS = [
+  "frontend",
+  "backend",
+  "fullstack",
+  "machine-learning",
+  "devops",
+  "mobile",
+];
 
 const Platform = () => {
   const [search, setSearch] = useState("");
+  const [debouncedSearch, setDebouncedSearch] = useState("");
   const [selectedTag, setSelectedTag] = useState("all");
 
+  // Debounce search input: every change is a server query
+  useEffect(() => {
+    const id = setTimeout(() => setDebouncedSearch(search.trim()), 300);
+    return () => clearTimeout(id);
+  }, [search]);
+
+  // Searching and tag filtering run on the server (/projects/search/);
+  // without either, page through every project.
+  const tag = selectedTag === "all" ? "" : selectedTag;
+  const isFiltering = debouncedSearch !== "" || tag !== "";
+
   const {
     data,
     isLoading,
     isError,
     error,
-  } = useQuery({
-    queryKey: ["projects"],
-    queryFn: async () => {
-      const res = await authFetch("/api/projects/all", {
+    hasNextPage,
+    isFetchingNextPage,
+    fetchNextPage,
+  } = useInfiniteQuery({
+    queryKey: ["projects", debouncedSearch, tag],
+    initialPageParam: undefined as string | undefined,
+    queryFn: async ({ pageParam }): Promise<Page<any>> => {
+      const url = isFiltering
+        ? withParams("/api/projects/search", {
+            q: debouncedSearch,
+            tag,
+            cursor: pageParam,
+          })
+        : withParams("/api/projects/all", { cursor: pageParam });
+
+      const res = await authFetch(url, {
         method: "GET",
         headers: {
           "Content-Type": "application/json",
@@ -30,37 +65,13 @@ const Platform = () => {
 
       return res.json();
     },
+    getNextPageParam: (lastPage) => nextCursor(lastPage),
   });
 
-  const projects = Array.isArray(data) ? data : [];
-
-  const allTags = useMemo(() => {
-    const tags = new Set<string>();
-    projects.forEach((project: any) => {
-      project.tags.forEach((t: any) => tags.add(t.tag));
-    });
-    return ["all", ...Array.from(tags)];
-  }, [projects]);
-
-  const filteredProjects = useMemo(() => {
-    const q = search.trim().toLowerCase();
-
-    return projects.filter((project: any) => {
-      const matchesSearch =
-        project.title.toLowerCase().includes(q) ||
-        project.owner_full_name.toLowerCase().includes(q) ||
-        project.owner_nu_email.toLowerCase().includes(q);
-
-      const matchesTag =
-        selectedTag === "all" ||
-        project.tags.some((t: any) => t.tag === selectedTag);
-
-      return matchesSearch && matchesTag;
-    });
-  }, [search, selectedTag, projects]);
+  const projects = flattenPages(data?.pages);
 
   const showEmptyState =
-    !isLoading && !isError && filteredProjects.length === 0;
+    !isLoading && !isError && projects.length === 0;
 
   return (
     <div className="p-6 px-8 space-y-6">
@@ -86,7 +97,7 @@ const Platform = () => {
             onChange={(e) => setSelectedTag(e.target.value)}
             className="w-full max-w-xs rounded border-2 border-gray-300 p-2 text-sm outline-none transition-colors duration-200 focus:border-primarypurple/80"
           >
-            {allTags.map((t) => (
+            {["all", ...AVAILABLE_TAGS].map((t) => (
               <option key={t} value={t}>
                 {t === "all" ? "All Tags" : t}
               </option>
@@ -101,7 +112,13 @@ const Platform = () => {
         error={error}
         isLoading={isLoading}
         showEmptyState={showEmptyState}
-        filteredProjects={filteredProjects}
+        filteredProjects={projects}
+      />
+
+      <LoadMore
+        hasNextPage={hasNextPage}
+        isFetchingNextPage={isFetchingNextPage}
+        fetchNextPage={fetchNextPage}
       />
     </div>
   );
@@ -1,8 +1,10 @@
 "use client";
 
 import React from "react";
-import { useQuery } from "@tanstack/react-query";
+import { useInfiniteQuery } from "@tanstack/react-query";
 import { authFetch } from "@/lib/authFetch";
+import { flattenPages, nextCursor, withParams, Page } from "@/lib/pagination";
+import LoadMore from "@/app/(platform)/components/LoadMore";
 import Link from "next/link";
 
 type Collaborator = {
@@ -37,11 +39,17 @@ const ProjectCollaborators = ({ projectid }: { projectid: number }) => {
         isLoading,
         isError,
         error,
-    } = useQuery({
+        hasNextPage,
+        isFetchingNextPage,
+        fetchNextPage,
+    } = useInfiniteQuery({
         queryKey: ["project-collaborators", projectid],
-        queryFn: async () => {
+        initialPageParam: undefined as string | undefined,
+        queryFn: async ({ pageParam }): Promise<Page<Collaborator>> => {
             const res = await authFetch(
-                `/api/projects/${projectid}/collaborators`,
+                withParams(`/api/projects/${projectid}/collaborators`, {
+                    cursor: pageParam,
+                }),
                 {
                     method: "GET",
                     headers: { "Content-Type": "application/json" },
@@ -52,12 +60,12 @@ const ProjectCollaborators = ({ projectid }: { projectid: number }) => {
                 throw new Error("Failed to fetch collaborators");
             }
 
-            const body = await res.json();
-            return Array.isArray(body) ? body : [];
+            return res.json();
         },
+        getNextPageParam: (lastPage) => nextCursor(lastPage),
     });
 
-    const collaborators: Collaborator[] = data || [];
+    const collaborators = flattenPages(data?.pages);
 
     return (
         <div className="space-y-3 border-t border-primarypurple/20 pt-4">
@@ -126,6 +134,13 @@ const ProjectCollaborators = ({ projectid }: { projectid: number }) => {
                     ))}
                 </div>
             )}
+
+            <LoadMore
+                hasNextPage={hasNextPage}
+                isFetchingNextPage={isFetchingNextPage}
+                fetchNextPage={fetchNextPage}
+                label="Load more collaborators"
+            />
         </div>
     );
 };
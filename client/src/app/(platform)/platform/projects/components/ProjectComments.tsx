@@ -1,8 +1,15 @@
 "use client";
 
 import React from "react";
-import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
+import {
+    InfiniteData,
+    useInfiniteQuery,
+    useMutation,
+    useQueryClient,
+} from "@tanstack/react-query";
 import { authFetch } from "@/lib/authFetch";
+import { flattenPages, nextCursor, withParams, Page } from "@/lib/pagination";
+import LoadMore from "@/app/(platform)/components/LoadMore";
 import { useAuthStore } from "@/stores";
 import { Trash2 } from "lucide-react";
 
@@ -15,6 +22,8 @@ type Comment = {
     user_nu_email?: string;
 };
 
+type CommentPages = InfiniteData<Page<Comment>, string | undefined>;
+
 type ProjectCommentsProps = {
     projectid: string;
     projectOwnerId?: number;
@@ -51,11 +60,17 @@ const ProjectComments = ({ projectid, projectOwnerId }: ProjectCommentsProps) =>
         isLoading,
         isError,
         error,
-    } = useQuery({
+        hasNextPage,
+        isFetchingNextPage,
+        fetchNextPage,
+    } = useInfiniteQuery({
         queryKey: ["project-comments", projectid],
-        queryFn: async () => {
+        initialPageParam: undefined as string | undefined,
+        queryFn: async ({ pageParam }): Promise<Page<Comment>> => {
             const res = await authFetch(
-                `/api/projects/${projectid}/comments`,
+                withParams(`/api/projects/${projectid}/comments`, {
+                    cursor: pageParam,
+                }),
                 {
                     method: "GET",
                     headers: { "Content-Type": "application/json" },
@@ -66,12 +81,12 @@ const ProjectComments = ({ projectid, projectOwnerId }: ProjectCommentsProps) =>
                 throw new Error("Failed to fetch comments");
             }
 
-            const body = await res.json();
-            return Array.isArray(body) ? body : [];
+            return res.json();
         },
+        getNextPageParam: (lastPage) => nextCursor(lastPage),
     });
 
-    const comments: Comment[] = data || [];
+    const comments = flattenPages(data?.pages);
 
     // Create comment mutation
     const createCommentMutation = useMutation({
@@ -103,11 +118,10 @@ const ProjectComments = ({ projectid, projectOwnerId }: ProjectCommentsProps) =>
                 queryKey: ["project-comments", projectid],
             });
 
-            const previousComments =
-                queryClient.getQueryData<Comment[]>([
-                    "project-comments",
-                    projectid,
-                ]) || [];
+            const previousComments = queryClient.getQueryData<CommentPages>([
+                "project-comments",
+                projectid,
+            ]);
 
             const optimistic: Comment = {
                 comment_id: Date.now(),
@@ -115,9 +129,18 @@ const ProjectComments = ({ projectid, projectOwnerId }: ProjectCommentsProps) =>
                 created_at: new Date().toISOString(),
             };
 
-            queryClient.setQueryData<Comment[]>(
+            // Newest first: the new comment leads the first page.
+            queryClient.setQueryData<CommentPages>(
                 ["project-comments", projectid],
-                [optimistic, ...previousComments]
+                (old) =>
+                    old && {
+                        ...old,
+                        pages: old.pages.map((page, idx) =>
+                            idx === 0
+                                ? { ...page, results: [optimistic, ...page.results] }
+                                : page
+                        ),
+                    }
             );
 
             return { previousComments };
@@ -165,15 +188,23 @@ const ProjectComments = ({ projectid, projectOwnerId }: ProjectCommentsProps) =>
                 queryKey: ["project-comments", projectid],
             });
 
-            const previousComments =
-                queryClient.getQueryData<Comment[]>([
-                    "project-comments",
-                    projectid,
-                ]) || [];
+            const previousComments = queryClient.getQueryData<CommentPages>([
+                "project-comments",
+                projectid,
+            ]);
 
-            queryClient.setQueryData<Comment[]>(
+            queryClient.setQueryData<CommentPages>(
                 ["project-comments", projectid],
-                previousComments.filter((c) => c.comment_id !== commentId)
+                (old) =>
+                    old && {
+                        ...old,
+                        pages: old.pages.map((page) => ({
+                            ...page,
+                            results: page.results.filter(
+                                (c) => c.comment_id !== commentId
+                            ),
+                        })),
+                    }
             );
 
             return { previousComments };
@@ -330,6 +361,13 @@ const ProjectComments = ({ projectid, projectOwnerId }: ProjectCommentsProps) =>
                     ))}
                 </div>
             )}
+
+            <LoadMore
+                hasNextPage={hasNextPage}
+                isFetchingNextPage={isFetchingNextPage}
+                fetchNextPage={fetchNextPage}
+                label="Load more comments"
+            />
         </div>
     );
 };
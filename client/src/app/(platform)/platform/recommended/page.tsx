@@ -1,9 +1,11 @@
 "use client";
 
 import React, { useMemo, useState } from "react";
-import { useQuery } from "@tanstack/react-query";
+import { useInfiniteQuery } from "@tanstack/react-query";
 import { authFetch } from "@/lib/authFetch";
+import { flattenPages, nextCursor, withParams, Page } from "@/lib/pagination";
 import ProjectCard from "../../components/ProjectCard";
+import LoadMore from "../../components/LoadMore";
 import { useAuthStore } from "@/stores";
 
 type RecommendationResult = {
@@ -23,10 +25,15 @@ const RecommendedProjects = () => {
     isLoading,
     isError,
     error,
-  } = useQuery({
+    hasNextPage,
+    isFetchingNextPage,
+    fetchNextPage,
+  } = useInfiniteQuery({
     queryKey: ["recommended-projects"],
-    queryFn: async () => {
-      const res = await authFetch("/api/projects/all", {
+    initialPageParam: undefined as string | undefined,
+    queryFn: async ({ pageParam }): Promise<Page<any>> => {
+      const url = withParams("/api/projects/all", { cursor: pageParam });
+      const res = await authFetch(url, {
         method: "GET",
         headers: {
           "Content-Type": "application/json",
@@ -39,9 +46,11 @@ const RecommendedProjects = () => {
 
       return res.json();
     },
+    getNextPageParam: (lastPage) => nextCursor(lastPage),
   });
 
-  const projects = Array.isArray(data) ? data : [];
+  // Modes and filters rank the pages loaded so far; "Load more" widens them.
+  const projects = flattenPages(data?.pages);
 
   const userSkillSet = useMemo(() => {
     if (!loggedInUser?.skills) return new Set<string>();
@@ -321,6 +330,12 @@ const RecommendedProjects = () => {
         filteredProjects={filteredProjects}
         basePath="/platform/recommended"
       />
+
+      <LoadMore
+        hasNextPage={hasNextPage}
+        isFetchingNextPage={isFetchingNextPage}
+        fetchNextPage={fetchNextPage}
+      />
     </div>
   );
 };
@@ -1,7 +1,9 @@
 import ProjectCard from '@/app/(platform)/components/ProjectCard'
 import React, { useMemo, useState } from 'react'
-import { useQuery } from "@tanstack/react-query";
+import { useInfiniteQuery } from "@tanstack/react-query";
 import { authFetch } from "@/lib/authFetch";
+import { flattenPages, nextCursor, withParams, Page } from "@/lib/pagination";
+import LoadMore from "@/app/(platform)/components/LoadMore";
 
 const UserProjects = ({ userid }: { userid: string }) => {
     const [search, setSearch] = useState("");
@@ -12,10 +14,15 @@ const UserProjects = ({ userid }: { userid: string }) => {
         isLoading,
         isError,
         error,
-    } = useQuery({
-        queryKey: ["my-projects"],
-        queryFn: async () => {
-            const res = await authFetch(`/api/projects/by-user/${userid}`, {
+        hasNextPage,
+        isFetchingNextPage,
+        fetchNextPage,
+    } = useInfiniteQuery({
+        queryKey: ["user-projects", userid],
+        initialPageParam: undefined as string | undefined,
+        queryFn: async ({ pageParam }): Promise<Page<any>> => {
+            const url = withParams(`/api/projects/by-user/${userid}`, { cursor: pageParam });
+            const res = await authFetch(url, {
                 method: "GET",
                 headers: {
                     "Content-Type": "application/json",
@@ -28,9 +35,10 @@ const UserProjects = ({ userid }: { userid: string }) => {
 
             return res.json();
         },
+        getNextPageParam: (lastPage) => nextCursor(lastPage),
     });
 
-    const projects = Array.isArray(data) ? data : [];
+    const projects = flattenPages(data?.pages);
 
     const allTags = useMemo(() => {
         const tags = new Set<string>();
@@ -73,6 +81,12 @@ const UserProjects = ({ userid }: { userid: string }) => {
                 showEmptyState={showEmptyState}
                 filteredProjects={filteredProjects}
             />
+
+            <LoadMore
+                hasNextPage={hasNextPage}
+                isFetchingNextPage={isFetchingNextPage}
+                fetchNextPage={fetchNextPage}
+            />
         </div>
     )
 }
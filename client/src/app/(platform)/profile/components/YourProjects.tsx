@@ -1,8 +1,10 @@
 "use client";
 
 import React, { useMemo, useState } from "react";
-import { useQuery } from "@tanstack/react-query";
+import { useInfiniteQuery } from "@tanstack/react-query";
 import { authFetch } from "@/lib/authFetch";
+import { flattenPages, nextCursor, withParams, Page } from "@/lib/pagination";
+import LoadMore from "@/app/(platform)/components/LoadMore";
 import ProjectCard from "@/app/(platform)/components/ProjectCard";
 
 const YourProjects = () => {
@@ -14,10 +16,15 @@ const YourProjects = () => {
         isLoading,
         isError,
         error,
-    } = useQuery({
+        hasNextPage,
+        isFetchingNextPage,
+        fetchNextPage,
+    } = useInfiniteQuery({
         queryKey: ["my-projects"],
-        queryFn: async () => {
-            const res = await authFetch("/api/projects/", {
+        initialPageParam: undefined as string | undefined,
+        queryFn: async ({ pageParam }): Promise<Page<any>> => {
+            const url = withParams("/api/projects/", { cursor: pageParam });
+            const res = await authFetch(url, {
                 method: "GET",
                 headers: {
                     "Content-Type": "application/json",
@@ -30,9 +37,10 @@ const YourProjects = () => {
 
             return res.json();
         },
+        getNextPageParam: (lastPage) => nextCursor(lastPage),
     });
 
-    const projects = Array.isArray(data) ? data : [];
+    const projects = flattenPages(data?.pages);
 
     const allTags = useMemo(() => {
         const tags = new Set<string>();
@@ -103,6 +111,12 @@ const YourProjects = () => {
                 showEmptyState={showEmptyState}
                 filteredProjects={filteredProjects}
             />
+
+            <LoadMore
+                hasNextPage={hasNextPage}
+                isFetchingNextPage={isFetchingNextPage}
+                fetchNextPage={fetchNextPage}
+            />
         </div>
     );
 };
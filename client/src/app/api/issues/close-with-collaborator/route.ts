@@ -26,10 +26,12 @@ export async function POST(req: NextRequest) {
         );
     }
 
-    const { issue_id, user_id, user_ids } = body as {
+    const { issue_id, user_id, user_ids, issues } = body as {
         issue_id?: number;
         user_id?: number;
         user_ids?: number[];
+        // Batch form: close several issues in one call.
+        issues?: { issue_id: number; user_ids?: number[] }[];
     };
 
     const drfRes = await fetch(DRF_CLOSEISSUE_URL, {
@@ -42,6 +44,7 @@ export async function POST(req: NextRequest) {
             issue_id,
             user_id,
             user_ids,
+            issues,
         }),
     });
 
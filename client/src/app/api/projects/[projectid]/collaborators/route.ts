@@ -19,7 +19,7 @@ export async function GET(
         );
     }
 
-    const drfUrl = `${DRF_BASE}/api/projects/${projectid}/collaborators/`;
+    const drfUrl = `${DRF_BASE}/api/projects/${projectid}/collaborators/${req.nextUrl.search}`;
 
     const drfRes = await fetch(drfUrl, {
         method: "GET",
@@ -1,5 +1,6 @@
 import { NextRequest, NextResponse } from "next/server";
 import { cookies } from "next/headers";
+import { conditionalRequestHeaders, notModified, validatorHeaders } from "@/lib/conditional";
 
 const DRF_BASE = process.env.DRF_API_BASE_URL || "http://localhost:8000";
 
@@ -19,16 +20,21 @@ export async function GET(
         );
     }
 
-    const drfUrl = `${DRF_BASE}/api/interactions/projects/${projectid}/comments/`;
+    const drfUrl = `${DRF_BASE}/api/interactions/projects/${projectid}/comments/${req.nextUrl.search}`;
 
     const drfRes = await fetch(drfUrl, {
         method: "GET",
         headers: {
             "Content-Type": "application/json",
             Authorization: `Bearer ${access}`,
+            ...conditionalRequestHeaders(req),
         },
     });
 
+    if (drfRes.status === 304) {
+        return notModified(drfRes);
+    }
+
     const drfBody = await drfRes.json().catch(() => null);
 
     if (!drfRes.ok) {
@@ -38,5 +44,5 @@ export async function GET(
         );
     }
 
-    return NextResponse.json(drfBody, { status: 200 });
+    return NextResponse.json(drfBody, { status: 200, headers: validatorHeaders(drfRes) });
 }
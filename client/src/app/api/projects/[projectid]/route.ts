@@ -1,5 +1,6 @@
 import { NextRequest, NextResponse } from "next/server";
 import { cookies } from "next/headers";
+import { conditionalRequestHeaders, notModified, validatorHeaders } from "@/lib/conditional";
 
 const DRF_BASE = process.env.DRF_API_BASE_URL || "http://localhost:8000";
 
@@ -26,9 +27,14 @@ export async function GET(
         headers: {
             "Content-Type": "application/json",
             Authorization: `Bearer ${access}`,
+            ...conditionalRequestHeaders(req),
         },
     });
 
+    if (drfRes.status === 304) {
+        return notModified(drfRes);
+    }
+
     const drfBody = await drfRes.json().catch(() => null);
 
     if (!drfRes.ok) {
@@ -38,7 +44,7 @@ export async function GET(
         );
     }
 
-    return NextResponse.json(drfBody, { status: 200 });
+    return NextResponse.json(drfBody, { status: 200, headers: validatorHeaders(drfRes) });
 }
 
 export async function PUT(req: NextRequest,
@@ -1,5 +1,6 @@
 import { NextRequest, NextResponse } from "next/server";
 import { cookies } from "next/headers";
+import { conditionalRequestHeaders, notModified, validatorHeaders } from "@/lib/conditional";
 
 const DRF_BASE = process.env.DRF_API_BASE_URL || "http://localhost:8000";
 
@@ -16,14 +17,19 @@ export async function GET(req: NextRequest) {
         );
     }
 
-    const drfRes = await fetch(DRF_PROJECTS_URL, {
+    const drfRes = await fetch(`${DRF_PROJECTS_URL}${req.nextUrl.search}`, {
         method: "GET",
         headers: {
             "Content-Type": "application/json",
             Authorization: `Bearer ${access}`,
+            ...conditionalRequestHeaders(req),
         }
     });
 
+    if (drfRes.status === 304) {
+        return notModified(drfRes);
+    }
+
     const drfBody = await drfRes.json().catch(() => null);
 
     if (!drfRes.ok) {
@@ -33,5 +39,5 @@ export async function GET(req: NextRequest) {
         );
     }
 
-    return NextResponse.json(drfBody, { status: 200 });
+    return NextResponse.json(drfBody, { status: 200, headers: validatorHeaders(drfRes) });
 }
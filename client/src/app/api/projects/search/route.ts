@@ -0,0 +1,44 @@
+import { NextRequest, NextResponse } from "next/server";
+import { cookies } from "next/headers";
+import { conditionalRequestHeaders, notModified, validatorHeaders } from "@/lib/conditional";
+
+const DRF_BASE = process.env.DRF_API_BASE_URL || "http://localhost:8000";
+
+const DRF_PROJECT_SEARCH_URL = `${DRF_BASE}/api/projects/search/`;
+
+export async function GET(req: NextRequest) {
+    const cookieStore = await cookies();
+    const access = cookieStore.get("access_token")?.value;
+
+    if (!access) {
+        return NextResponse.json(
+            { detail: "Unauthenticated. Access token missing." },
+            { status: 401 }
+        );
+    }
+
+    // Forward q / tag / cursor / page_size / view untouched.
+    const drfRes = await fetch(`${DRF_PROJECT_SEARCH_URL}${req.nextUrl.search}`, {
+        method: "GET",
+        headers: {
+            "Content-Type": "application/json",
+            Authorization: `Bearer ${access}`,
+            ...conditionalRequestHeaders(req),
+        }
+    });
+
+    if (drfRes.status === 304) {
+        return notModified(drfRes);
+    }
+
+    const drfBody = await drfRes.json().catch(() => null);
+
+    if (!drfRes.ok) {
+        return NextResponse.json(
+            drfBody || { detail: "Failed to search projects" },
+            { status: drfRes.status }
+        );
+    }
+
+    return NextResponse.json(drfBody, { status: 200, headers: validatorHeaders(drfRes) });
+}
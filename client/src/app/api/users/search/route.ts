@@ -15,15 +15,10 @@ export async function GET(req: NextRequest) {
         );
     }
 
-    const { searchParams } = new URL(req.url);
-    const nuEmail = searchParams.get("nu_email")?.trim().toLowerCase() || "";
+    // Forward q / nu_email / cursor / page_size untouched.
+    const drfUrl = `${DRF_USER_SEARCH_URL}${req.nextUrl.search}`;
 
-    const drfUrl = new URL(DRF_USER_SEARCH_URL);
-    if (nuEmail) {
-        drfUrl.searchParams.set("nu_email", nuEmail);
-    }
-
-    const drfRes = await fetch(drfUrl.toString(), {
+    const drfRes = await fetch(drfUrl, {
         method: "GET",
         headers: {
             "Content-Type": "application/json",
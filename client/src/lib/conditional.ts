@@ -0,0 +1,30 @@
+import { NextRequest, NextResponse } from "next/server";
+
+// Conditional GET support for the DRF proxy routes: the browser's
+// validators are forwarded to DRF, and DRF's ETag / Last-Modified come
+// back on our response, so a revalidation is a 304 with no body.
+
+const REQUEST_HEADERS = ["if-none-match", "if-modified-since"];
+const RESPONSE_HEADERS = ["etag", "last-modified", "cache-control"];
+
+export function conditionalRequestHeaders(req: NextRequest): Record<string, string> {
+    const headers: Record<string, string> = {};
+    for (const name of REQUEST_HEADERS) {
+        const value = req.headers.get(name);
+        if (value) headers[name] = value;
+    }
+    return headers;
+}
+
+export function validatorHeaders(drfRes: Response): Headers {
+    const headers = new Headers();
+    for (const name of RESPONSE_HEADERS) {
+        const value = drfRes.headers.get(name);
+        if (value) headers.set(name, value);
+    }
+    return headers;
+}
+
+export function notModified(drfRes: Response): NextResponse {
+    return new NextResponse(null, { status: 304, headers: validatorHeaders(drfRes) });
+}
@@ -0,0 +1,29 @@
+// Keyset-paginated DRF lists answer { next, results }, where `next` is the
+// backend's absolute URL for the following page (null on the last one).
+// The proxy routes forward the query string, so only its ?cursor= is reused.
+
+export type Page<T> = {
+    next: string | null;
+    results: T[];
+};
+
+export function nextCursor(page: Page<unknown>): string | undefined {
+    if (!page?.next) return undefined;
+    return new URL(page.next).searchParams.get("cursor") ?? undefined;
+}
+
+export function withParams(
+    path: string,
+    params: Record<string, string | undefined>
+): string {
+    const search = new URLSearchParams();
+    for (const [key, value] of Object.entries(params)) {
+        if (value) search.set(key, value);
+    }
+    const query = search.toString();
+    return query ? `${path}?${query}` : path;
+}
+
+export function flattenPages<T>(pages: Page<T>[] | undefined): T[] {
+    return pages?.flatMap((page) => page.results) ?? [];
+}
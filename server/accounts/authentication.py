@@ -0,0 +1,176 @@
+"""
+JWT authentication with cached user resolution.
+
+simplejwt's JWTAuthentication loads the user by ``user_id`` on every
+request. CachedJWTAuthentication resolves it through two layers instead:
+
+* a process-local LRU (AUTH_USER_LOCAL_CACHE_SIZE entries, kept for
+  AUTH_USER_LOCAL_CACHE_TTL seconds) that needs no round trip at all;
+* the default cache (Redis when REDIS_URL is set), shared by every
+  worker, kept for AUTH_USER_CACHE_TTL seconds.
+
+Entries hold the user's columns except the password hash, which is left
+deferred: it is loaded on access, and ``save()`` without update_fields
+writes only the loaded columns. ``invalidate_user()`` (wired to User
+post_save/post_delete in accounts.signals) drops the shared entry and
+this process's copy once the transaction commits; other processes drop
+theirs within AUTH_USER_LOCAL_CACHE_TTL seconds. Writes that bypass
+signals (``queryset.update()``) must call it themselves.
+
+Views that only need the caller's id can set ``trust_token_claims =
+True``: their GET/HEAD/OPTIONS requests are served from the signed token
+alone (a ClaimsUser, no lookup). A deactivated user keeps that
+access until the access token expires (ACCESS_TOKEN_LIFETIME).
+
+AUTH_USER_CACHE_TTL = 0 turns the cache off (``manage.py
+benchmark_auth`` compares both).
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User
+
+# Columns kept in the cache: everything but the password hash.
+CACHED_FIELDS = [
+    field.attname for field in User._meta.concrete_fields if field.attname != "password"
+]
+
+
+def user_key(user_id):
+    return f"authuser:{user_id}"
+
+
+class ClaimsUser(TokenUser):
+    """
+    A TokenUser whose ``id``/``pk``/``user_id`` are ints like the model's.
+    simplejwt writes the user_id claim as a string, and views compare it
+    with integer columns.
+    """
+
+    @cached_property
+    def id(self):
+        return User._meta.pk.to_python(self.token[api_settings.USER_ID_CLAIM])
+
+    @property
+    def pk(self):
+        return self.id
+
+    @property
+    def user_id(self):
+        return self.id
+
+
+class LocalUserCache:
+    """Thread-safe LRU of ``user_id -> cached columns`` with a per-entry TTL."""
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, values = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return values
+
+    def set(self, user_id, values):
+        ttl = settings.AUTH_USER_LOCAL_CACHE_TTL
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + ttl, values)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > settings.AUTH_USER_LOCAL_CACHE_SIZE:
+                self._entries.popitem(last=False)
+
+    def discard(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+local_users = LocalUserCache()
+
+
+def get_cached_user(user_id):
+    """The user as a model instance (password deferred), or None if absent."""
+    values = local_users.get(user_id)
+    if values is None:
+        values = cache.get(user_key(user_id))
+        if values is None:
+            values = (
+                User.objects.filter(user_id=user_id).values_list(*CACHED_FIELDS).first()
+            )
+            if values is None:
+                return None
+            cache.set(user_key(user_id), values, settings.AUTH_USER_CACHE_TTL)
+        local_users.set(user_id, values)
+    # A fresh instance per request: views may modify request.user.
+    return User.from_db("default", CACHED_FIELDS, values)
+
+
+def invalidate_user(user_id):
+    """Drop cached copies of the user once the surrounding transaction commits."""
+    def drop():
+        local_users.discard(user_id)
+        cache.delete(user_key(user_id))
+
+    transaction.on_commit(drop)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+
+        view = (getattr(request, "parser_context", None) or {}).get("view")
+        if request.method in SAFE_METHODS and getattr(view, "trust_token_claims", False):
+            if api_settings.USER_ID_CLAIM not in validated_token:
+                raise InvalidToken(_("Token contained no recognizable user identification"))
+            return ClaimsUser(validated_token), validated_token
+
+        return self.get_user(validated_token), validated_token
+
+    def get_user(self, validated_token):
+        # Revocation checks compare the password hash, which is not cached.
+        if settings.AUTH_USER_CACHE_TTL <= 0 or api_settings.CHECK_REVOKE_TOKEN:
+            return super().get_user(validated_token)
+
+        try:
+            # The claim is a string; key the caches by the int primary key.
+            user_id = User._meta.pk.to_python(validated_token[api_settings.USER_ID_CLAIM])
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        user = get_cached_user(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
@@ -0,0 +1,76 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import resolve, reverse
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.authentication import local_users
+from accounts.models import User
+
+ENDPOINTS = [
+    ("user-profile", {}),
+    ("top-contributors", {"limit": 10}),
+    ("recommended-projects", {"mode": "spotlight"}),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Queries and latency per authenticated request for a few endpoints: "
+        "user loaded from the database on every request, cached user, and "
+        "(for views with trust_token_claims) the token's claims alone."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, help="user_id to authenticate as (default: first active user).")
+        parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint and mode.")
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(is_active=True).order_by("user_id")
+        if options["user"]:
+            users = users.filter(user_id=options["user"])
+        user = users.first()
+        if user is None:
+            raise CommandError("No active user to authenticate as.")
+
+        factory = APIRequestFactory()
+        auth = f"Bearer {AccessToken.for_user(user)}"
+        self.stdout.write(f"{'endpoint':<22} {'mode':<8} {'queries':>7} {'mean ms':>8}")
+
+        for name, params in ENDPOINTS:
+            path = reverse(name)
+            view = resolve(path).func
+            trusted = getattr(view.cls, "trust_token_claims", False)
+            throttles = view.cls.throttle_classes
+            # The user rate limit would cut the run short.
+            view.cls.throttle_classes = []
+            modes = [("db", 0, False), ("cached", 300, False)]
+            if trusted:
+                modes.append(("claims", 300, True))
+
+            for mode, ttl, trust in modes:
+                view.cls.trust_token_claims = trust
+                local_users.clear()
+                with override_settings(AUTH_USER_CACHE_TTL=ttl):
+                    # Warm-up request fills the caches (user, recommendations).
+                    view(factory.get(path, params, HTTP_AUTHORIZATION=auth))
+                    queries, timings = [], []
+                    for _ in range(options["requests"]):
+                        request = factory.get(path, params, HTTP_AUTHORIZATION=auth)
+                        with CaptureQueriesContext(connection) as captured:
+                            started = time.perf_counter()
+                            response = view(request)
+                            timings.append((time.perf_counter() - started) * 1000)
+                        if response.status_code != 200:
+                            raise CommandError(f"{path} returned {response.status_code}.")
+                        queries.append(len(captured))
+                self.stdout.write(
+                    f"{name:<22} {mode:<8} {statistics.mean(queries):>7.1f} "
+                    f"{statistics.mean(timings):>8.2f}"
+                )
+            view.cls.trust_token_claims = trusted
+            view.cls.throttle_classes = throttles
@@ -0,0 +1,68 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+from django.urls import resolve, reverse
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from projects.models import Project
+
+
+class Command(BaseCommand):
+    help = (
+        "Latency of small endpoints (user-profile/, likes/toggle/) including "
+        "the end-of-request connection handling, for the current DATABASES "
+        "setting. Run once as is and once with DB_POOL=False to compare the "
+        "connection pool with connecting per request."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, help="user_id to authenticate as (default: first active user).")
+        parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint.")
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(is_active=True).order_by("user_id")
+        if options["user"]:
+            users = users.filter(user_id=options["user"])
+        user = users.first()
+        project_id = Project.objects.values_list("project_id", flat=True).order_by("project_id").first()
+        if user is None or project_id is None:
+            raise CommandError("Needs an active user and a project.")
+
+        factory = APIRequestFactory()
+        auth = f"Bearer {AccessToken.for_user(user)}"
+        requests = {
+            "user-profile": lambda path: factory.get(path, HTTP_AUTHORIZATION=auth),
+            # An even number of toggles leaves the like as it was.
+            "project-like-toggle": lambda path: factory.post(
+                path, {"project_id": project_id}, format="json", HTTP_AUTHORIZATION=auth
+            ),
+        }
+        pooled = connection.pool is not None
+        self.stdout.write(f"DB_POOL={'True' if pooled else 'False'}")
+        self.stdout.write(f"{'endpoint':<22} {'p50 ms':>8} {'mean ms':>8}")
+
+        for name, build in requests.items():
+            path = reverse(name)
+            view = resolve(path).func
+            throttles = view.cls.throttle_classes
+            view.cls.throttle_classes = []
+            count = options["requests"] + options["requests"] % 2
+            timings = []
+            for _ in range(count):
+                request = build(path)
+                started = time.perf_counter()
+                response = view(request)
+                # What request_finished does: with CONN_MAX_AGE = 0 the
+                # connection is closed, or returned to the pool.
+                close_old_connections()
+                timings.append((time.perf_counter() - started) * 1000)
+                if response.status_code >= 400:
+                    raise CommandError(f"{path} returned {response.status_code}.")
+            view.cls.throttle_classes = throttles
+            self.stdout.write(
+                f"{name:<22} {statistics.median(timings):>8.2f} {statistics.mean(timings):>8.2f}"
+            )
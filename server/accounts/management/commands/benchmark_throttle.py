@@ -0,0 +1,55 @@
+import statistics
+import time
+from types import SimpleNamespace
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework import throttling
+
+from drf_backend import throttling as sliding
+from drf_backend.redis import get_redis
+
+
+class Command(BaseCommand):
+    help = (
+        "Per-request cost of the throttle check against Redis: DRF's cached "
+        "history list vs the sliding-window Lua script. One client sends "
+        "--requests requests inside a window large enough to allow them all, "
+        "so DRF's history grows to that length."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        client = get_redis()
+        if client is None:
+            raise CommandError("REDIS_URL is not set; both implementations would use LocMemCache.")
+
+        count = options["requests"]
+        request = SimpleNamespace(user=SimpleNamespace(is_authenticated=True, pk="benchmark"))
+        for name, base in (("drf", throttling.UserRateThrottle), ("sliding", sliding.UserRateThrottle)):
+            throttle_class = type("BenchmarkThrottle", (base,), {"scope": "benchmark", "rate": f"{count}/hour"})
+            key = throttle_class().get_cache_key(request, None)
+            cache.delete(key)
+            client.delete(key)
+
+            timings = []
+            for _ in range(count):
+                throttle = throttle_class()
+                started = time.perf_counter()
+                allowed = throttle.allow_request(request, None)
+                timings.append((time.perf_counter() - started) * 1_000_000)
+                if not allowed:
+                    raise CommandError(f"{name} throttled a request inside the window.")
+            cache.delete(key)
+            client.delete(key)
+
+            timings.sort()
+            tail = statistics.mean(timings[-len(timings) // 10:])
+            self.stdout.write(
+                f"{name:>8}: mean {statistics.mean(timings):7.0f} us, "
+                f"p50 {statistics.median(timings):7.0f} us, "
+                f"p99 {timings[int(len(timings) * 0.99) - 1]:7.0f} us, "
+                f"slowest 10% {tail:7.0f} us"
+            )
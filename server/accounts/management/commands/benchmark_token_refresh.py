@@ -0,0 +1,103 @@
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken as SimpleRefreshToken
+from rest_framework_simplejwt.views import TokenRefreshView
+
+from accounts.authentication import local_users
+from accounts.models import User
+from accounts.serializers import RefreshTokenSerializer
+from accounts.tokens import RefreshToken, flush_outstanding
+
+IMPLEMENTATIONS = {
+    "simplejwt": (SimpleRefreshToken, TokenRefreshSerializer),
+    "accounts": (RefreshToken, RefreshTokenSerializer),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Hammer POST /api/token/refresh/ from concurrent clients, each rotating "
+        "its own refresh token, with simplejwt's stock serializer and with "
+        "accounts.tokens. Reports throughput, latency and queries per refresh; "
+        "the benchmark's tokens are deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clients", type=int, default=8, help="Concurrent clients (threads).")
+        parser.add_argument("--refreshes", type=int, default=50, help="Refreshes per client.")
+        parser.add_argument("--user", type=int, help="user_id the tokens belong to (default: first active user).")
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(is_active=True).order_by("user_id")
+        if options["user"]:
+            users = users.filter(user_id=options["user"])
+        user = users.first()
+        if user is None:
+            raise CommandError("No active user to issue tokens for.")
+
+        started_at = timezone.now()
+        try:
+            for name, (token_class, serializer_class) in IMPLEMENTATIONS.items():
+                local_users.clear()
+                self.run(name, token_class, serializer_class, user, options)
+        finally:
+            flush_outstanding()
+            deleted, _ = OutstandingToken.objects.filter(
+                user=user, created_at__gte=started_at
+            ).delete()
+            self.stdout.write(f"Deleted {deleted} benchmark token row(s).")
+
+    def run(self, name, token_class, serializer_class, user, options):
+        view = TokenRefreshView.as_view(
+            serializer_class=serializer_class,
+            throttle_classes=[],
+        )
+        factory = APIRequestFactory()
+        timings, queries, failures = [], [], []
+        lock = threading.Lock()
+
+        def client():
+            refresh = str(token_class.for_user(user))
+            mine_t, mine_q, failed = [], [], 0
+            for _ in range(options["refreshes"]):
+                request = factory.post("/api/token/refresh/", {"refresh": refresh}, format="json")
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    response = view(request)
+                    mine_t.append((time.perf_counter() - started) * 1000)
+                mine_q.append(len(captured))
+                if response.status_code != 200:
+                    failed += 1
+                    break
+                refresh = response.data["refresh"]
+            close_old_connections()
+            connection.close()
+            with lock:
+                timings.extend(mine_t)
+                queries.extend(mine_q)
+                failures.append(failed)
+
+        threads = [threading.Thread(target=client) for _ in range(options["clients"])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1] if len(timings) >= 20 else timings[-1]
+        self.stdout.write(
+            f"{name:>9}: {len(timings) / elapsed:7.0f} refresh/s, "
+            f"p50 {statistics.median(timings):.1f} ms, p95 {p95:.1f} ms, "
+            f"{statistics.mean(queries):.1f} queries/refresh, {sum(failures)} failed"
+        )
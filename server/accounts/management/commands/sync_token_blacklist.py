@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from accounts.tokens import flush_outstanding, rebuild_blacklist_mirror
+from drf_backend.redis import get_redis
+
+
+class Command(BaseCommand):
+    help = (
+        "Insert the OutstandingToken rows queued in Redis and rebuild the "
+        "Redis mirror of the refresh-token blacklist. Run it before "
+        "flushexpiredtokens so no queued row is missed."
+    )
+
+    def handle(self, *args, **options):
+        if get_redis() is None:
+            self.stdout.write(self.style.WARNING("REDIS_URL is not set; nothing to sync."))
+            return
+
+        flushed = flush_outstanding()
+        self.stdout.write(f"Inserted {flushed} queued outstanding token(s).")
+        total = rebuild_blacklist_mirror()
+        self.stdout.write(self.style.SUCCESS(f"Mirrored {total} blacklisted token(s) to Redis."))
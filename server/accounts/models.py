@@ -6,8 +6,10 @@ from django.contrib.auth.models import (
     PermissionsMixin,
     BaseUserManager,
 )
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils import timezone
 import secrets
 
@@ -87,6 +89,20 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = "nu_email"
     REQUIRED_FIELDS = ["full_name"]
 
+    class Meta:
+        indexes = [
+            # pg_trgm indexes for UserSearchView. They are built on UPPER(col)
+            # because that is what Django emits for __icontains on PostgreSQL.
+            GinIndex(
+                OpClass(Upper("nu_email"), name="gin_trgm_ops"),
+                name="user_email_trgm_idx",
+            ),
+            GinIndex(
+                OpClass(Upper("full_name"), name="gin_trgm_ops"),
+                name="user_full_name_trgm_idx",
+            ),
+        ]
+
     def __str__(self):
         return self.nu_email
 
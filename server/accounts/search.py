@@ -0,0 +1,61 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.postgres.search import TrigramSimilarity
+from django.core.cache import cache
+from django.db.models import FloatField, Q, Value
+from django.db.models.functions import Cast, Greatest
+
+from .models import User
+
+# Longer text cannot be contained in nu_email or full_name.
+MAX_QUERY_LENGTH = 255
+# Only typeahead-length queries are shared through the cache; longer ones
+# are rarely repeated and go to the live query.
+MAX_CACHED_QUERY_LENGTH = 32
+
+
+def search_users(queryset, query):
+    """
+    Filter ``queryset`` to users whose nu_email or full_name contains
+    ``query`` and annotate ``similarity`` (the better of the two trigram
+    similarities). ``__icontains`` compiles to ``UPPER(col) LIKE UPPER(%s)``,
+    which the UPPER(col) gin_trgm_ops indexes serve.
+
+    similarity is cast to double precision so it round-trips exactly
+    through the keyset pagination cursor.
+    """
+    if not query:
+        return queryset.annotate(similarity=Value(0.0, output_field=FloatField()))
+    return queryset.filter(
+        Q(nu_email__icontains=query) | Q(full_name__icontains=query)
+    ).annotate(
+        similarity=Cast(
+            Greatest(
+                TrigramSimilarity("nu_email", query),
+                TrigramSimilarity("full_name", query),
+            ),
+            FloatField(),
+        ),
+    )
+
+
+def get_cached_ranking(query, page_size):
+    """
+    Return ``[(user_id, similarity), ...]`` for the first page of ``query``.
+
+    Nobody is excluded, so one entry serves every caller; two extra rows
+    leave room to drop the caller and still detect a next page. The key
+    holds a digest of the (normalised) query, so its length is fixed.
+    """
+    digest = hashlib.sha1(query.encode()).hexdigest()
+    key = f"usersearch:{page_size}:{digest}"
+    ranking = cache.get(key)
+    if ranking is None:
+        ranking = list(
+            search_users(User.objects.all(), query)
+            .order_by("-similarity", "user_id")
+            .values_list("user_id", "similarity")[: page_size + 2]
+        )
+        cache.set(key, ranking, settings.USER_SEARCH_CACHE_TTL)
+    return ranking
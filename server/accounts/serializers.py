@@ -6,10 +6,16 @@ from django.conf import settings
 from django.core.mail import EmailMultiAlternatives
 from django.urls import reverse
 
+from .authentication import get_cached_user
 from .models import User, VerificationToken, Skill
+from .tokens import RefreshToken
 from .utils import generate_random_avatar_url
+from projects.cache import invalidate_user_recommendations
+from jobs.queue import enqueue
 
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -82,8 +88,8 @@ class RegisterSerializer(serializers.ModelSerializer):
 
         token_obj = VerificationToken.create_for_user(user)
 
-        request = self.context.get("request")
-        send_verification_email(user, token_obj, request=request)
+        # Sent by the job worker once the registration commits
+        enqueue("accounts.send_verification_email", token_id=str(token_obj.pk))
 
         user._verification_token = token_obj
         return user
@@ -130,7 +136,7 @@ class EmailVerificationSerializer(serializers.Serializer):
 
 
 
-def send_verification_email(user, token_obj, request=None):
+def send_verification_email(user, token_obj, request=None, connection=None):
     frontend_base = getattr(settings, "FRONTEND_BASE_URL", "http://localhost:3000").rstrip("/")
     verify_url = f"{frontend_base}/verify-email?token={token_obj.token}&nu_email={user.nu_email}"
     display_name = user.full_name or "there"
@@ -274,6 +280,7 @@ def send_verification_email(user, token_obj, request=None):
         body=plain_text,
         from_email=getattr(settings, "DEFAULT_FROM_EMAIL", None),
         to=[user.nu_email],
+        connection=connection,
     )
     msg.attach_alternative(html_body, "text/html")
     msg.send(fail_silently=False)
@@ -296,6 +303,7 @@ class ResendVerificationSerializer(serializers.Serializer):
         attrs["user"] = user
         return attrs
 
+    @transaction.atomic
     def save(self, **kwargs):
         user = self.validated_data["user"]
 
@@ -303,8 +311,7 @@ class ResendVerificationSerializer(serializers.Serializer):
         VerificationToken.objects.filter(user=user, used_at__isnull=True).delete()
 
         token_obj = VerificationToken.create_for_user(user)
-        request = self.context.get("request")
-        send_verification_email(user, token_obj, request=request)
+        enqueue("accounts.send_verification_email", token_id=str(token_obj.pk))
         return user
 
 
@@ -354,6 +361,52 @@ class LogoutSerializer(serializers.Serializer):
             raise serializers.ValidationError("Token is invalid or has already been blacklisted.")
 
 
+class RefreshTokenSerializer(TokenRefreshSerializer):
+    """
+    POST /api/token/refresh/ (SIMPLE_JWT["TOKEN_REFRESH_SERIALIZER"]).
+
+    Same contract as simplejwt's serializer, built on accounts.tokens: the
+    user comes from the authentication cache, the old token is blacklisted
+    in one statement (a replayed or concurrently reused token is rejected
+    there) and the new token's OutstandingToken row is batched.
+    """
+    token_class = RefreshToken
+
+    # No transaction: blacklisting is a single statement, and a new token is
+    # valid without its OutstandingToken row.
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        if user_id:
+            user = get_cached_user(int(user_id))
+            if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+                raise AuthenticationFailed(
+                    self.error_messages["no_active_account"],
+                    "no_active_account",
+                )
+
+        data = {"access": str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+
+            data["refresh"] = str(refresh)
+
+        return data
+
+
+class ObtainTokenPairSerializer(TokenObtainPairSerializer):
+    """POST /api/token/ (SIMPLE_JWT["TOKEN_OBTAIN_SERIALIZER"]) with batched bookkeeping."""
+    token_class = RefreshToken
+
+
 class UserUpdateSerializer(serializers.Serializer):
     full_name = serializers.CharField(required=False, allow_blank=False, max_length=255)
     bio = serializers.CharField(required=False, allow_blank=True, allow_null=True)
@@ -390,6 +443,9 @@ class UserUpdateSerializer(serializers.Serializer):
             Skill.objects.bulk_create(
                 [Skill(user=instance, skill=skill) for skill in unique_skills]
             )
+            # Bulk writes skip model signals, so drop the cached skill-match
+            # recommendations explicitly.
+            invalidate_user_recommendations(instance.user_id, ["skill-match"])
 
         return instance
 
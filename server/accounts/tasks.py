@@ -0,0 +1,18 @@
+from jobs.mail import get_mail_connection
+from jobs.queue import job
+
+from .models import VerificationToken
+from .serializers import send_verification_email
+
+
+@job("accounts.send_verification_email")
+def send_verification_email_job(token_id):
+    token_obj = (
+        VerificationToken.objects.select_related("user")
+        .filter(pk=token_id, used_at__isnull=True)
+        .first()
+    )
+    if token_obj is None:
+        # Replaced by a resend, or already used: nothing to send.
+        return
+    send_verification_email(token_obj.user, token_obj, connection=get_mail_connection())
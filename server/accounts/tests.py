@@ -1,8 +1,19 @@
-from django.test import TestCase
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken
+from .authentication import local_users
 from .models import User
+from .search import MAX_CACHED_QUERY_LENGTH
+from .tokens import RefreshToken
 
 
 class UserProfileViewTests(TestCase):
@@ -23,3 +34,203 @@ class UserProfileViewTests(TestCase):
     def test_get_user_profile_unauthenticated(self):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class UserSearchViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.me = User.objects.create_user(
+            nu_email="k201234@nu.edu.pk", password="testpassword123", full_name="Ali Khan"
+        )
+        self.by_name = User.objects.create_user(
+            nu_email="k205555@nu.edu.pk", password="testpassword123", full_name="Sara Khan"
+        )
+        self.by_email = User.objects.create_user(
+            nu_email="khanzada@nu.edu.pk", password="testpassword123", full_name="Bilal Ahmed"
+        )
+        User.objects.create_user(
+            nu_email="k209999@nu.edu.pk", password="testpassword123", full_name="Hina Raza"
+        )
+        self.client.force_authenticate(user=self.me)
+        self.url = reverse("user-search")
+
+    def search(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_matches_email_or_name_and_excludes_caller(self):
+        ids = {u["user_id"] for u in self.search(q="khan").data["results"]}
+        self.assertEqual(ids, {self.by_name.user_id, self.by_email.user_id})
+
+    def test_legacy_nu_email_param(self):
+        ids = [u["user_id"] for u in self.search(nu_email="KHANZADA").data["results"]]
+        self.assertEqual(ids, [self.by_email.user_id])
+
+    def test_cached_first_page_paginates_into_live_query(self):
+        first = self.search(q="k20", page_size=1)
+        self.assertEqual(len(first.data["results"]), 1)
+        second = self.client.get(first.data["next"])
+        seen = [u["user_id"] for u in first.data["results"] + second.data["results"]]
+        self.assertEqual(len(seen), 2)
+        self.assertNotIn(self.me.user_id, seen)
+
+        # A repeat of the popular prefix is served from the cached ranking.
+        with self.assertNumQueries(2):  # users + skills prefetch
+            self.search(q="k20", page_size=1)
+
+    def test_cache_key_is_a_fixed_length_digest(self):
+        with mock.patch("accounts.search.cache.set", wraps=cache.set) as cache_set:
+            self.search(q="Khan ")
+        [key] = [c[0][0] for c in cache_set.call_args_list if c[0][0].startswith("usersearch:")]
+        self.assertNotIn("khan", key)
+        self.assertEqual(len(key.rsplit(":", 1)[1]), 40)
+
+    def test_long_queries_are_capped_and_not_cached(self):
+        with mock.patch("accounts.views.get_cached_ranking") as cached:
+            self.assertEqual(self.search(q="k" * 10_000).data["results"], [])
+            self.search(q="k" * (MAX_CACHED_QUERY_LENGTH + 1))
+        cached.assert_not_called()
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        local_users.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            nu_email="test@nu.edu.pk", password="testpassword123", full_name="Test User"
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+
+    def user_lookups(self, method, url, **kwargs):
+        with CaptureQueriesContext(connection) as captured:
+            response = getattr(self.client, method)(url, format="json", **kwargs)
+        lookups = [q for q in captured if 'FROM "accounts_user"' in q["sql"]]
+        return response, len(lookups)
+
+    def test_user_is_loaded_once(self):
+        response, lookups = self.user_lookups("get", reverse("user-profile"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(lookups, 1)
+
+        response, lookups = self.user_lookups("get", reverse("user-profile"))
+        self.assertEqual(response.data["nu_email"], "test@nu.edu.pk")
+        self.assertEqual(lookups, 0)
+
+        # The shared cache serves a process whose local copy is gone.
+        local_users.clear()
+        _, lookups = self.user_lookups("get", reverse("user-profile"))
+        self.assertEqual(lookups, 0)
+
+    @override_settings(AUTH_USER_CACHE_TTL=0)
+    def test_cache_can_be_disabled(self):
+        self.user_lookups("get", reverse("user-profile"))
+        _, lookups = self.user_lookups("get", reverse("user-profile"))
+        self.assertEqual(lookups, 1)
+
+    def test_profile_update_invalidates(self):
+        self.client.get(reverse("user-profile"))
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(reverse("user-update"), {"full_name": "Renamed"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(reverse("user-profile"))
+        self.assertEqual(response.data["full_name"], "Renamed")
+        # The cached copy never holds the password hash.
+        self.assertTrue(User.objects.get(pk=self.user.pk).check_password("testpassword123"))
+
+    def test_deactivation_takes_effect(self):
+        self.client.get(reverse("user-profile"))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+
+        response = self.client.get(reverse("user-profile"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_read_only_views_can_trust_token_claims(self):
+        # TopContributorsView sets trust_token_claims: no user lookup,
+        # and the caller's id is an int like the model's.
+        response, lookups = self.user_lookups("get", reverse("top-contributors"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(lookups, 0)
+        self.assertEqual(response.data["me"]["user_id"], self.user.pk)
+        self.assertIsNone(local_users.get(self.user.pk))
+
+
+class TokenRefreshTests(TestCase):
+    def setUp(self):
+        local_users.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            nu_email="test@nu.edu.pk", password="testpassword123", full_name="Test User"
+        )
+        self.url = reverse("token_refresh")
+
+    def refresh(self, token):
+        return self.client.post(self.url, {"refresh": token}, format="json")
+
+    def test_rotation_blacklists_the_old_token(self):
+        old = str(RefreshToken.for_user(self.user))
+        self.assertEqual(OutstandingToken.objects.count(), 1)
+
+        response = self.refresh(old)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("access", response.data)
+        self.assertEqual(OutstandingToken.objects.count(), 2)
+        self.assertTrue(BlacklistedToken.objects.filter(token__jti=RefreshToken(old, verify=False)["jti"]).exists())
+
+        # Replaying the rotated-out token fails; its successor still works.
+        self.assertEqual(self.refresh(old).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.refresh(response.data["refresh"]).status_code, status.HTTP_200_OK)
+
+    def test_second_blacklist_of_a_token_is_rejected(self):
+        # What a concurrent refresh that passed the check would hit.
+        token = RefreshToken.for_user(self.user)
+        token.blacklist()
+        with self.assertRaises(TokenError):
+            RefreshToken(str(token), verify=False).blacklist()
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
+
+    def test_logged_out_token_cannot_refresh(self):
+        token = str(RefreshToken.for_user(self.user))
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(reverse("logout"), {"refresh": token}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_205_RESET_CONTENT)
+        self.client.force_authenticate(user=None)
+
+        self.assertEqual(self.refresh(token).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_inactive_user_cannot_refresh(self):
+        token = str(RefreshToken.for_user(self.user))
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.refresh(token).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_refresh_queries(self):
+        token = self.refresh(str(RefreshToken.for_user(self.user))).data["refresh"]
+        # Blacklist check, blacklist upsert, OutstandingToken insert (the
+        # check and the insert move to Redis when it is configured).
+        with self.assertNumQueries(3):
+            self.assertEqual(self.refresh(token).status_code, status.HTTP_200_OK)
+
+
+class LoginThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_login_has_its_own_scope(self):
+        payload = {"nu_email": "nobody@nu.edu.pk", "password": "wrong"}
+        for _ in range(10):
+            response = self.client.post(reverse("login"), payload, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(reverse("login"), payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", response.headers)
+
+        # Other endpoints still answer: only the login scope is exhausted.
+        response = self.client.post(reverse("resend-verification-email"), {"nu_email": "nobody@nu.edu.pk"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,250 @@
+"""
+Refresh tokens with a Redis blacklist mirror and batched bookkeeping.
+
+simplejwt's blacklist app costs about ten queries per refresh (user
+lookups, get_or_create of the OutstandingToken and BlacklistedToken rows,
+a blacklist join). ``RefreshToken`` here keeps the same tables but:
+
+* rotation blacklists the old token in one statement (upsert the
+  OutstandingToken row, insert the BlacklistedToken row). When the insert
+  finds the token already blacklisted, the refresh is rejected, so two
+  concurrent refreshes of one token cannot both succeed;
+* blacklist checks read ``jwt:bl:<jti>`` keys in Redis (expiring with the
+  token). The mirror is trusted only while ``jwt:bl:ready`` exists; it is
+  set by ``rebuild_blacklist_mirror()`` (``manage.py
+  sync_token_blacklist``, or the first check that finds it missing).
+  Until then, and without Redis, checks query the table;
+* OutstandingToken rows for newly issued tokens are queued in a Redis
+  list. Issuing a token flushes the list once JWT_OUTSTANDING_BATCH_SIZE
+  are waiting, or when JWT_OUTSTANDING_FLUSH_INTERVAL seconds have passed
+  since the last flush; the scheduler (``manage.py refresh_project_views
+  --loop``) flushes it every JWT_OUTSTANDING_FLUSH_INTERVAL seconds so
+  quiet periods do not leave rows behind, and ``manage.py
+  sync_token_blacklist`` drains it too. Nothing reads those rows on the
+  hot path: blacklisting upserts them itself. Without Redis they are
+  inserted immediately.
+"""
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from redis.exceptions import RedisError
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import BlacklistMixin
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from drf_backend.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+BLACKLIST_PREFIX = "jwt:bl:"
+BLACKLIST_READY_KEY = "jwt:bl:ready"
+BLACKLIST_REBUILD_LOCK_KEY = "jwt:bl:rebuilding"
+OUTSTANDING_KEY = "jwt:outstanding"
+OUTSTANDING_WINDOW_KEY = "jwt:outstanding:window"
+
+# Upsert the OutstandingToken row and blacklist it; RETURNING is empty when
+# the token was blacklisted already.
+BLACKLIST_SQL = """
+    WITH outstanding AS (
+        INSERT INTO token_blacklist_outstandingtoken (jti, token, user_id, created_at, expires_at)
+        SELECT %(jti)s, %(token)s, (SELECT user_id FROM accounts_user WHERE user_id = %(user_id)s),
+            %(created_at)s, %(expires_at)s
+        ON CONFLICT (jti) DO UPDATE SET jti = EXCLUDED.jti
+        RETURNING id
+    )
+    INSERT INTO token_blacklist_blacklistedtoken (token_id, blacklisted_at)
+    SELECT id, NOW() FROM outstanding
+    ON CONFLICT (token_id) DO NOTHING
+    RETURNING id
+"""
+
+OUTSTANDING_SQL = """
+    INSERT INTO token_blacklist_outstandingtoken (jti, token, user_id, created_at, expires_at)
+    SELECT t.jti, t.token, u.user_id, to_timestamp(t.created_at), to_timestamp(t.expires_at)
+    FROM unnest(%s::text[], %s::text[], %s::int[], %s::float8[], %s::float8[])
+        AS t(jti, token, user_id, created_at, expires_at)
+    LEFT JOIN accounts_user u ON u.user_id = t.user_id
+    ON CONFLICT (jti) DO NOTHING
+"""
+
+
+class RefreshToken(BaseRefreshToken):
+    def check_blacklist(self):
+        jti = self.payload[api_settings.JTI_CLAIM]
+        blacklisted = is_blacklisted_in_mirror(jti)
+        if blacklisted is None:
+            blacklisted = BlacklistedToken.objects.filter(token__jti=jti).exists()
+        if blacklisted:
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        """Blacklist this token; raises TokenError if it already was."""
+        with connection.cursor() as cursor:
+            cursor.execute(BLACKLIST_SQL, {
+                "jti": self.payload[api_settings.JTI_CLAIM],
+                "token": str(self),
+                "user_id": _user_id(self.payload),
+                "created_at": self.current_time,
+                "expires_at": datetime_from_epoch(self.payload["exp"]),
+            })
+            if cursor.fetchone() is None:
+                raise TokenError(_("Token is blacklisted"))
+        jti, exp = self.payload[api_settings.JTI_CLAIM], self.payload["exp"]
+        transaction.on_commit(lambda: mirror_blacklisted(jti, exp))
+
+    def outstand(self):
+        record_outstanding([_outstanding_entry(self)])
+
+    @classmethod
+    def for_user(cls, user):
+        # Skip BlacklistMixin.for_user's per-login OutstandingToken insert.
+        token = super(BlacklistMixin, cls).for_user(user)
+        token.outstand()
+        return token
+
+
+def _user_id(payload):
+    user_id = payload.get(api_settings.USER_ID_CLAIM)
+    return int(user_id) if user_id is not None else None
+
+
+def _outstanding_entry(token):
+    return {
+        "jti": token.payload[api_settings.JTI_CLAIM],
+        "token": str(token),
+        "user_id": _user_id(token.payload),
+        "created_at": token.current_time.timestamp(),
+        "expires_at": token.payload["exp"],
+    }
+
+
+# ── Blacklist mirror ───────────────────────────────────────────────────────
+
+
+def is_blacklisted_in_mirror(jti):
+    """True/False from the Redis mirror, or None when it cannot answer."""
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        ready, listed = client.mget(BLACKLIST_READY_KEY, BLACKLIST_PREFIX + jti)
+        if ready:
+            return listed is not None
+        # Lost (flush, eviction, first boot): one caller rebuilds it, the
+        # rest read the table meanwhile.
+        if cache.add(BLACKLIST_REBUILD_LOCK_KEY, 1, timeout=60):
+            try:
+                rebuild_blacklist_mirror()
+            finally:
+                cache.delete(BLACKLIST_REBUILD_LOCK_KEY)
+    except RedisError:
+        logger.warning("Token blacklist mirror unavailable", exc_info=True)
+    return None
+
+
+def mirror_blacklisted(jti, exp):
+    client = get_redis()
+    if client is None:
+        return
+    ttl = int(exp - timezone.now().timestamp()) + 1
+    if ttl <= 0:
+        return
+    try:
+        client.set(BLACKLIST_PREFIX + jti, 1, ex=ttl)
+    except RedisError:
+        logger.warning("Token blacklist mirror update failed", exc_info=True)
+        # The mirror no longer has every entry; stop trusting it.
+        try:
+            client.delete(BLACKLIST_READY_KEY)
+        except RedisError:
+            pass
+
+
+def rebuild_blacklist_mirror():
+    """Copy unexpired blacklist rows into Redis and mark the mirror ready."""
+    client = get_redis()
+    if client is None:
+        return 0
+    now = timezone.now()
+    rows = BlacklistedToken.objects.filter(token__expires_at__gt=now).values_list(
+        "token__jti", "token__expires_at"
+    )
+    total = 0
+    pipe = client.pipeline(transaction=False)
+    for jti, expires_at in rows.iterator(chunk_size=5000):
+        pipe.set(BLACKLIST_PREFIX + jti, 1, ex=int((expires_at - now).total_seconds()) + 1)
+        total += 1
+        if total % 5000 == 0:
+            pipe.execute()
+    pipe.set(BLACKLIST_READY_KEY, 1)
+    pipe.execute()
+    return total
+
+
+# ── Outstanding tokens ─────────────────────────────────────────────────────
+
+
+def record_outstanding(entries):
+    """
+    Queue OutstandingToken rows, flushing when the batch is full or the
+    flush window has lapsed. Only issuance reaches here, so the scheduler
+    flushes on a timer as well.
+    """
+    client = get_redis()
+    if client is not None:
+        try:
+            pipe = client.pipeline()
+            pipe.rpush(OUTSTANDING_KEY, *[json.dumps(entry) for entry in entries])
+            pipe.exists(OUTSTANDING_WINDOW_KEY)
+            queued, window_open = pipe.execute()
+        except RedisError:
+            logger.warning("Could not queue outstanding tokens", exc_info=True)
+        else:
+            if queued >= settings.JWT_OUTSTANDING_BATCH_SIZE or not window_open:
+                flush_outstanding(client)
+            return
+    insert_outstanding(entries)
+
+
+def flush_outstanding(client=None):
+    """Insert every queued OutstandingToken row. Returns how many."""
+    client = client or get_redis()
+    if client is None:
+        return 0
+    try:
+        client.set(OUTSTANDING_WINDOW_KEY, 1, ex=settings.JWT_OUTSTANDING_FLUSH_INTERVAL)
+        pipe = client.pipeline()
+        pipe.lrange(OUTSTANDING_KEY, 0, -1)
+        pipe.delete(OUTSTANDING_KEY)
+        raw, _ = pipe.execute()
+    except RedisError:
+        logger.warning("Could not drain outstanding tokens", exc_info=True)
+        return 0
+    if not raw:
+        return 0
+    entries = [json.loads(item) for item in raw]
+    try:
+        insert_outstanding(entries)
+    except Exception:
+        logger.exception("Inserting %d outstanding tokens failed; requeueing", len(entries))
+        try:
+            client.rpush(OUTSTANDING_KEY, *raw)
+        except RedisError:
+            logger.warning("Requeueing outstanding tokens failed", exc_info=True)
+        return 0
+    return len(entries)
+
+
+def insert_outstanding(entries):
+    names = ("jti", "token", "user_id", "created_at", "expires_at")
+    columns = [[entry[name] for entry in entries] for name in names]
+    with connection.cursor() as cursor:
+        cursor.execute(OUTSTANDING_SQL, columns)
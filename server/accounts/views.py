@@ -4,7 +4,11 @@ from rest_framework.response import Response
 from rest_framework import generics, status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 
+from drf_backend.conditional import ConditionalGetMixin
+from drf_backend.pagination import KeysetPagination
+
 from .models import User
+from .search import MAX_CACHED_QUERY_LENGTH, MAX_QUERY_LENGTH, get_cached_ranking, search_users
 from .serializers import (
     RegisterSerializer,
     UserSerializer,
@@ -69,6 +73,7 @@ class ResendVerificationEmailView(APIView):
 
 class LoginView(APIView):
     permission_classes = [AllowAny]
+    throttle_scope = "login"
 
     def post(self, request, *args, **kwargs):
         serializer = LoginSerializer(data=request.data)
@@ -122,21 +127,69 @@ class UserListView(generics.ListAPIView):
         return User.objects.exclude(pk=user.pk)
 
 
-class UserDetailView(generics.RetrieveAPIView):
+class UserDetailView(ConditionalGetMixin, generics.RetrieveAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = UserSerializer
     lookup_field = "user_id"
     queryset = User.objects.all()
 
+    def get_version_rows(self):
+        # UserUpdateSerializer saves updated_at alongside any skills rewrite.
+        rows = list(User.objects.filter(user_id=self.kwargs["user_id"]).values_list("updated_at"))
+        return rows or None
+
+    def get_last_modified(self, rows):
+        return rows[0][0]
+
 
 class UserSearchView(generics.ListAPIView):
+    """
+    GET /auth/users/search/?q=<text>   (``nu_email=`` is accepted too)
+
+    Matches the text anywhere in nu_email or full_name (pg_trgm GIN
+    indexes), ranks by trigram similarity and keyset-paginates. The
+    ranking for a short query's first page is cached for
+    USER_SEARCH_CACHE_TTL seconds and shared by every caller, so typeahead
+    keystrokes for popular prefixes skip the search entirely. The text is
+    cut to MAX_QUERY_LENGTH characters.
+    """
     permission_classes = [IsAuthenticated]
     serializer_class = UserSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-similarity", "user_id")
+
+    def get_search_term(self):
+        params = self.request.query_params
+        text = (params.get("q") or params.get("nu_email") or "").strip().lower()
+        return text[:MAX_QUERY_LENGTH]
 
     def get_queryset(self):
         current_user = self.request.user
-        query = self.request.query_params.get("nu_email", "").strip().lower()
-        qs = User.objects.exclude(pk=current_user.pk)
-        if query:
-            qs = qs.filter(nu_email__icontains=query)
-        return qs
\ No newline at end of file
+        qs = User.objects.exclude(pk=current_user.pk).prefetch_related("skills")
+        return search_users(qs, self.get_search_term())
+
+    def list(self, request, *args, **kwargs):
+        query = self.get_search_term()
+        if (
+            not query
+            or len(query) > MAX_CACHED_QUERY_LENGTH
+            or request.query_params.get(self.paginator.cursor_query_param)
+        ):
+            return super().list(request, *args, **kwargs)
+
+        # First page of a short query: serve it from the shared ranking.
+        page_size = self.paginator.get_page_size(request)
+        ranking = get_cached_ranking(query, page_size)
+        ranking = [row for row in ranking if row[0] != request.user.pk]
+
+        page = ranking[:page_size]
+        users = User.objects.prefetch_related("skills").in_bulk([user_id for user_id, _ in page])
+        results = [users[user_id] for user_id, _ in page if user_id in users]
+
+        self.paginator.request = request
+        self.paginator.next_position = None
+        if len(ranking) > page_size and page:
+            user_id, similarity = page[-1]
+            self.paginator.next_position = [similarity, user_id]
+        serializer = self.get_serializer(results, many=True)
+        return self.paginator.get_paginated_response(serializer.data)
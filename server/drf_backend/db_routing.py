@@ -0,0 +1,156 @@
+"""
+Read replica routing.
+
+With DB_REPLICA_HOST set, settings add a ``replica`` database alias (a
+streaming standby of ``default``). ``PrimaryReplicaRouter`` sends reads to
+it only while a request is being served by a view that opts in with
+``ReplicaReadMixin`` (the analytics and read-only list views in
+projects.views), and only for GET/HEAD/OPTIONS. Everything else, including
+management commands, the scheduler and the job worker, stays on the
+primary. Without a replica, or with DB_REPLICA_READS off, every read goes
+to the primary too.
+
+Replicas lag behind, so right after writing a user must not read from one:
+
+* within a request, once the ORM writes anything, later reads go to the
+  primary;
+* after a request that wrote (or any POST/PUT/PATCH/DELETE), the user is
+  pinned to the primary for DB_REPLICA_STICKY_SECONDS, tracked in the
+  default cache so every worker honours it.
+
+Raw SQL must pick its connection with ``read_connection()`` to be routed
+(``connection`` is always the primary). Raw-SQL writes are not seen by
+the router; they happen in non-GET requests, which pin the user anyway.
+
+``ReplicaRoutingMiddleware`` holds the per-request state and sets the pin.
+"""
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+REPLICA_DB_ALIAS = "replica"
+
+
+class RoutingState:
+    __slots__ = ("replica", "wrote")
+
+    def __init__(self):
+        self.replica = False
+        self.wrote = False
+
+
+_state = ContextVar("db_routing_state", default=None)
+
+
+def replica_configured():
+    return settings.DB_REPLICA_READS and REPLICA_DB_ALIAS in settings.DATABASES
+
+
+def sticky_key(user_id):
+    return f"dbsticky:{user_id}"
+
+
+def read_alias():
+    """The alias reads should use right now."""
+    state = _state.get()
+    if state is None or not state.replica or state.wrote:
+        return DEFAULT_DB_ALIAS
+    return REPLICA_DB_ALIAS
+
+
+def read_connection():
+    """The connection raw-SQL reads should use right now."""
+    return connections[read_alias()]
+
+
+def use_replica(user):
+    """Let the current request read from the replica unless ``user`` is pinned."""
+    state = _state.get()
+    if state is None or not replica_configured():
+        return
+    if user.is_authenticated and cache.get(sticky_key(user.pk)):
+        return
+    state.replica = True
+
+
+def _pin_key(request):
+    # DRF sets the authenticated user on the Django request as well.
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return sticky_key(user.pk)
+    return None
+
+
+def _should_pin(request, state):
+    return state.wrote or request.method not in SAFE_METHODS
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return read_alias()
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        state = RoutingState()
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        if replica_configured() and _should_pin(request, state):
+            key = _pin_key(request)
+            if key is not None:
+                cache.set(key, 1, settings.DB_REPLICA_STICKY_SECONDS)
+        return response
+
+    async def __acall__(self, request):
+        state = RoutingState()
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+        if replica_configured() and _should_pin(request, state):
+            # request.user may still be the lazy session user, which queries.
+            key = await sync_to_async(_pin_key)(request)
+            if key is not None:
+                await cache.aset(key, 1, settings.DB_REPLICA_STICKY_SECONDS)
+        return response
+
+
+class ReplicaReadMixin:
+    """Serve this view's safe requests from the replica (see module docstring)."""
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS:
+            use_replica(request.user)
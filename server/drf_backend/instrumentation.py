@@ -0,0 +1,261 @@
+"""
+Per-request SQL and serialization timing.
+
+``SQLInstrumentationMiddleware`` profiles a sample of requests
+(SQL_PROFILE_SAMPLE_RATE). For each profiled request it records:
+
+* the number of queries and the time spent in them, over every database
+  alias (primary and replica);
+* the slowest statements (SQL text only; parameters are never kept, so
+  no user data reaches the logs);
+* the time spent in serializers (``serializer.data``, i.e. every nested
+  ``to_representation``) excluding their SQL, and the number of queries
+  they issued, which is where N+1 patterns show up;
+* the time DRF spent rendering the response body (``JSONRenderer`` below);
+* the total time.
+
+The numbers go out as one JSON log line on the ``drf_backend.instrumentation``
+logger, and as a ``Server-Timing`` header (shown in the browser's network
+panel) for staff users, or for everyone with SQL_PROFILE_EXPOSE_HEADER.
+Requests slower than SQL_SLOW_REQUEST_MS are logged as warnings with
+their slowest statements.
+
+Queries are timed by one execute wrapper installed on every connection as
+it opens. Outside a profiled request it only reads a ContextVar, so
+unsampled requests, management commands and workers cost next to nothing.
+``manage.py benchmark_sql_profile`` measures the overhead.
+"""
+import heapq
+import json
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils.functional import SimpleLazyObject
+from rest_framework import renderers, serializers
+
+logger = logging.getLogger(__name__)
+
+# Statements kept per request for the slow-request log.
+SLOWEST_KEPT = 5
+# Longest SQL text logged per statement.
+SQL_LOG_LENGTH = 2000
+
+
+class RequestProfile:
+    __slots__ = (
+        "started", "queries", "db_seconds", "serialize_seconds", "serialize_queries",
+        "serializing", "render_seconds", "slowest", "_order",
+    )
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.serialize_queries = 0
+        self.serializing = False
+        self.render_seconds = 0.0
+        # Min-heap of (duration, order, alias, sql): the SLOWEST_KEPT slowest.
+        self.slowest = []
+        self._order = 0
+
+    def add_query(self, alias, sql, duration):
+        self.queries += 1
+        self.db_seconds += duration
+        self._order += 1
+        entry = (duration, self._order, alias, sql)
+        if len(self.slowest) < SLOWEST_KEPT:
+            heapq.heappush(self.slowest, entry)
+        elif duration > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    def slowest_first(self):
+        return sorted(self.slowest, reverse=True)
+
+
+_profile = ContextVar("request_profile", default=None)
+
+
+@contextmanager
+def profiling(profile):
+    """Record the queries and serializer/render time of this context in ``profile``."""
+    token = _profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _profile.reset(token)
+
+
+def _time_query(execute, sql, params, many, context):
+    profile = _profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.add_query(context["connection"].alias, sql, time.perf_counter() - started)
+
+
+def _install_wrapper(sender, connection, **kwargs):
+    # Fires on every connect (including each checkout from the pool) for
+    # the same DatabaseWrapper; install once. First in the list, because
+    # ``connection.execute_wrapper()`` blocks pop() the last entry.
+    if _time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _time_query)
+
+
+connection_created.connect(_install_wrapper, dispatch_uid="drf_backend.instrumentation")
+
+
+_serializer_data = serializers.BaseSerializer.data
+
+
+def _timed_serializer_data(self):
+    # Serializer.data and ListSerializer.data both go through here. Only
+    # the outermost serializer is timed: nested ones (fields, or a .data
+    # taken inside a SerializerMethodField) are part of its time.
+    profile = _profile.get()
+    if profile is None or profile.serializing:
+        return _serializer_data.fget(self)
+    profile.serializing = True
+    started, db_seconds, queries = time.perf_counter(), profile.db_seconds, profile.queries
+    try:
+        return _serializer_data.fget(self)
+    finally:
+        profile.serializing = False
+        db_spent = profile.db_seconds - db_seconds
+        profile.serialize_seconds += max(time.perf_counter() - started - db_spent, 0)
+        profile.serialize_queries += profile.queries - queries
+
+
+# Views build responses from serializer.data before any DRF hook runs,
+# so the timing has to sit on the property itself.
+serializers.BaseSerializer.data = property(_timed_serializer_data)
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    """DRF's JSONRenderer, timed when the request is being profiled."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        profile = _profile.get()
+        if profile is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        started = time.perf_counter()
+        try:
+            return super().render(data, accepted_media_type, renderer_context)
+        finally:
+            profile.render_seconds += time.perf_counter() - started
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2)
+
+
+def server_timing(profile, total):
+    app = max(total - profile.db_seconds - profile.serialize_seconds - profile.render_seconds, 0)
+    metrics = [
+        f'db;dur={_ms(profile.db_seconds)};desc="{profile.queries} queries"',
+        f'serialize;dur={_ms(profile.serialize_seconds)};desc="{profile.serialize_queries} queries"',
+        f"render;dur={_ms(profile.render_seconds)}",
+        f"app;dur={_ms(app)}",
+        f"total;dur={_ms(total)}",
+    ]
+    if profile.slowest:
+        metrics.insert(1, f"db-slowest;dur={_ms(max(profile.slowest)[0])}")
+    return ", ".join(metrics)
+
+
+def _user(request):
+    # DRF replaces request.user with the authenticated user; the session
+    # user left by AuthenticationMiddleware is not worth a query here.
+    user = getattr(request, "user", None)
+    if user is None or isinstance(user, SimpleLazyObject):
+        return None
+    return user
+
+
+def expose_header(request):
+    """Server-Timing reveals query counts and timings: staff only, unless opted in."""
+    if settings.SQL_PROFILE_EXPOSE_HEADER:
+        return True
+    user = _user(request)
+    return user is not None and user.is_staff
+
+
+def log_profile(request, response, profile, total):
+    match = request.resolver_match
+    record = {
+        "method": request.method,
+        "path": request.path,
+        "route": match.route if match else None,
+        "status": response.status_code,
+        "user_id": getattr(_user(request), "pk", None),
+        "queries": profile.queries,
+        "db_ms": _ms(profile.db_seconds),
+        "serialize_ms": _ms(profile.serialize_seconds),
+        "serialize_queries": profile.serialize_queries,
+        "render_ms": _ms(profile.render_seconds),
+        "total_ms": _ms(total),
+    }
+    slowest = profile.slowest_first()
+    if slowest:
+        record["slowest_ms"] = _ms(slowest[0][0])
+    if total * 1000 >= settings.SQL_SLOW_REQUEST_MS:
+        record["slow_statements"] = [
+            {"ms": _ms(duration), "db": alias, "sql": sql[:SQL_LOG_LENGTH]}
+            for duration, _, alias, sql in slowest
+        ]
+        logger.warning(json.dumps(record, default=str))
+    else:
+        logger.info(json.dumps(record, default=str))
+
+
+class SQLInstrumentationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        # Connections opened before this module was imported.
+        for connection in connections.all(initialized_only=True):
+            _install_wrapper(None, connection)
+
+    @staticmethod
+    def sampled():
+        rate = settings.SQL_PROFILE_SAMPLE_RATE
+        return rate >= 1 or (rate > 0 and random.random() < rate)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+        with profiling(RequestProfile()) as profile:
+            response = self.get_response(request)
+        return self.finish(request, response, profile)
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+        with profiling(RequestProfile()) as profile:
+            response = await self.get_response(request)
+        return self.finish(request, response, profile)
+
+    @staticmethod
+    def finish(request, response, profile):
+        total = time.perf_counter() - profile.started
+        if expose_header(request):
+            response["Server-Timing"] = server_timing(profile, total)
+        log_profile(request, response, profile, total)
+        return response
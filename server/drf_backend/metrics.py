@@ -0,0 +1,55 @@
+"""
+Internal metrics (staff only).
+
+Connection pools live in each worker process, so the numbers describe the
+worker that served the request (``pid``); scrape repeatedly, or run one
+worker, to see them all.
+"""
+import os
+
+from django.db import connections
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+
+def get_pool_stats(alias):
+    """Pool counters for a database alias, or None when it is not pooled."""
+    pool = connections[alias].pool
+    if pool is None:
+        return None
+    # psycopg_pool omits counters that are still zero.
+    stats = pool.get_stats()
+    queued = stats.get("requests_queued", 0)
+    wait_ms = stats.get("requests_wait_ms", 0)
+    return {
+        "min_size": stats.get("pool_min", 0),
+        "max_size": stats.get("pool_max", 0),
+        "size": stats.get("pool_size", 0),
+        "in_use": stats.get("pool_size", 0) - stats.get("pool_available", 0),
+        "available": stats.get("pool_available", 0),
+        "waiting": stats.get("requests_waiting", 0),
+        # Cumulative since the worker started.
+        "requests": stats.get("requests_num", 0),
+        "requests_queued": queued,
+        "requests_timed_out": stats.get("requests_errors", 0),
+        "wait_ms_total": wait_ms,
+        "wait_ms_avg": round(wait_ms / queued, 2) if queued else None,
+        "connections_opened": stats.get("connections_num", 0),
+        "connections_failed": stats.get("connections_errors", 0),
+        "connections_lost": stats.get("connections_lost", 0),
+    }
+
+
+class DatabasePoolStatsView(APIView):
+    """
+    GET /api/internal/metrics/db-pool/
+    Connection pool usage of this worker, per database alias.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response({
+            "pid": os.getpid(),
+            "databases": {alias: get_pool_stats(alias) for alias in connections},
+        })
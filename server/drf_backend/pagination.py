@@ -0,0 +1,158 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over a fixed, unique ordering.
+
+    The cursor is an opaque base64 token holding the ordering values of the
+    last row on the page. The next page is fetched with a
+    ``WHERE (a, b) < (last_a, last_b)`` style predicate instead of OFFSET,
+    so every page costs one index range scan no matter how deep it is.
+
+    ``ordering`` must end with a unique column (usually the primary key)
+    so that rows sharing a timestamp are never skipped or repeated.
+    Only forward navigation (``next``) is supported.
+    """
+
+    ordering = ("-created_at", "-pk")
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    invalid_cursor_message = "Invalid cursor."
+
+    def __init__(self):
+        self.page_size = getattr(settings, "API_PAGE_SIZE", 20)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        ordering = self.get_ordering(view)
+
+        position = self.decode_cursor(request, len(ordering))
+        if position is not None:
+            try:
+                queryset = queryset.filter(self.build_seek_filter(ordering, position))
+            except (DjangoValidationError, TypeError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+
+        # Fetch one extra row to learn whether there is a next page without
+        # running a separate COUNT query.
+        rows = list(queryset.order_by(*ordering)[: self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[: self.page_size]
+
+        self.next_position = None
+        if self.has_next and self.page:
+            self.next_position = [
+                self.get_row_value(self.page[-1], field) for field in ordering
+            ]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_ordering(self, view):
+        return tuple(getattr(view, "keyset_ordering", None) or self.ordering)
+
+    def get_page_size(self, request):
+        raw = request.query_params.get(self.page_size_query_param)
+        if raw is None:
+            return self.page_size
+        try:
+            size = int(raw)
+        except ValueError:
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        token = self.encode_cursor(self.next_position)
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    # ── Cursor encoding ────────────────────────────────────────────────────
+
+    def encode_cursor(self, values):
+        payload = json.dumps([self._to_json(v) for v in values], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+    def decode_cursor(self, request, expected_length):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        except (binascii.Error, UnicodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != expected_length:
+            raise NotFound(self.invalid_cursor_message)
+        return values
+
+    @staticmethod
+    def _to_json(value):
+        # Keep full precision: DjangoJSONEncoder truncates datetimes to
+        # milliseconds, which would make the seek predicate skip rows.
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return str(value)
+        return value
+
+    # ── Seek predicate ─────────────────────────────────────────────────────
+
+    @staticmethod
+    def get_row_value(row, field):
+        name = field.lstrip("-")
+        if isinstance(row, dict):
+            return row[name]
+        return getattr(row, name)
+
+    @staticmethod
+    def build_seek_filter(ordering, position):
+        """
+        Expand the row-value comparison ``(f1, f2, ...) > (v1, v2, ...)``
+        (direction per field) into
+        ``f1 > v1 OR (f1 = v1 AND f2 > v2) OR ...``.
+
+        The leading column is also bounded with ``>=``/``<=`` so PostgreSQL
+        can turn it into an index condition and stop after ``LIMIT`` rows.
+        """
+        seek = Q()
+        equal_prefix = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            seek |= equal_prefix & Q(**{f"{name}__{lookup}": value})
+            equal_prefix &= Q(**{name: value})
+
+        lead = ordering[0]
+        lead_name = lead.lstrip("-")
+        lead_lookup = "lte" if lead.startswith("-") else "gte"
+        return Q(**{f"{lead_name}__{lead_lookup}": position[0]}) & seek
@@ -0,0 +1,14 @@
+from django.conf import settings
+
+
+def get_redis():
+    """
+    The redis-py client behind the default cache, or None when the cache
+    is not Redis (REDIS_URL unset: local development and tests). Callers
+    must keep working without it.
+    """
+    if "django_redis" not in settings.CACHES["default"]["BACKEND"]:
+        return None
+    from django_redis import get_redis_connection
+
+    return get_redis_connection("default")
@@ -0,0 +1,56 @@
+from rest_framework import serializers
+
+
+def parse_field_list(value):
+    """Split a ``?fields=a,b`` style parameter; None when absent or empty."""
+    if not value:
+        return None
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    return names or None
+
+
+class SparseFieldsetsMixin:
+    """
+    Let clients pick which fields a serializer renders.
+
+    * ``?fields=a,b`` renders exactly those fields (any declared field,
+      including expandable ones).
+    * ``?expand=x`` adds fields listed in ``expandable_fields``, which are
+      left out of the default representation.
+
+    Both can also be passed as ``fields=`` / ``expand=`` keyword arguments,
+    which take precedence over the request. Unknown names are a 400.
+    Views read ``serializer.fields`` afterwards to load only what will be
+    rendered.
+    """
+
+    expandable_fields = ()
+    fields_query_param = "fields"
+    expand_query_param = "expand"
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        request = self.context.get("request")
+        if request is not None:
+            if fields is None:
+                fields = parse_field_list(request.query_params.get(self.fields_query_param))
+            if expand is None:
+                expand = parse_field_list(request.query_params.get(self.expand_query_param))
+
+        available = set(self.fields)
+        unknown = set(fields or ()).difference(available)
+        unknown.update(set(expand or ()).difference(self.expandable_fields))
+        if unknown:
+            raise serializers.ValidationError(
+                {"fields": f"Unknown field(s): {', '.join(sorted(unknown))}."}
+            )
+
+        if fields is not None:
+            keep = set(fields)
+        else:
+            keep = available.difference(self.expandable_fields)
+        keep.update(expand or ())
+
+        for name in available.difference(keep):
+            self.fields.pop(name)
@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from pathlib import Path
 from datetime import timedelta
 import os
+import sys
 from dotenv import load_dotenv
 
 load_dotenv(Path(__file__).resolve().parent.parent / ".env")
@@ -20,6 +21,9 @@ load_dotenv(Path(__file__).resolve().parent.parent / ".env")
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Running `manage.py test`
+TESTING = "test" in sys.argv[1:2]
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
@@ -43,15 +47,18 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "rest_framework_simplejwt",
     "rest_framework_simplejwt.token_blacklist",
     "accounts",
     "projects",
     "interactions",
+    "jobs",
 ]
 
 MIDDLEWARE = [
+    "drf_backend.instrumentation.SQLInstrumentationMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -60,6 +67,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "drf_backend.db_routing.ReplicaRoutingMiddleware",
 ]
 
 ROOT_URLCONF = "drf_backend.urls"
@@ -96,6 +104,51 @@ DATABASES = {
     }
 }
 
+# psycopg 3 connection pool, one per worker process: requests borrow an
+# open connection instead of connecting (TCP + auth) every time. Each
+# process holds at most DB_POOL_MAX_SIZE connections, so keep
+# workers × max size under PostgreSQL's max_connections. Requests wait up
+# to DB_POOL_TIMEOUT seconds for a free connection; idle connections above
+# DB_POOL_MIN_SIZE close after DB_POOL_MAX_IDLE seconds and every
+# connection is replaced after DB_POOL_MAX_LIFETIME. Stats:
+# /api/internal/metrics/db-pool/. DB_POOL=False connects per request.
+if os.environ.get("DB_POOL", "True") == "True":
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", 2)),
+            "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", 10)),
+            "timeout": float(os.environ.get("DB_POOL_TIMEOUT", 10)),
+            "max_idle": float(os.environ.get("DB_POOL_MAX_IDLE", 300)),
+            "max_lifetime": float(os.environ.get("DB_POOL_MAX_LIFETIME", 3600)),
+        },
+    }
+
+# Optional read replica (streaming standby of the primary). When
+# DB_REPLICA_HOST is set, analytics and read-only list views read from it
+# (drf_backend.db_routing); a user who just wrote reads from the primary
+# for DB_REPLICA_STICKY_SECONDS, which should exceed the replication lag.
+# Name, user and password default to the primary's. DB_REPLICA_READS=False
+# sends every read back to the primary without dropping the alias.
+#
+# Tests always get the alias, as a second connection to the test database
+# (TEST MIRROR), so routing runs against two real connections. Reads only
+# go to it in tests that turn DB_REPLICA_READS on: rows a TestCase writes
+# are uncommitted and invisible to another connection.
+if TESTING:
+    DATABASES["replica"] = {**DATABASES["default"], "TEST": {"MIRROR": "default"}}
+elif os.environ.get("DB_REPLICA_HOST"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": os.environ.get("DB_REPLICA_NAME", DATABASES["default"]["NAME"]),
+        "USER": os.environ.get("DB_REPLICA_USER", DATABASES["default"]["USER"]),
+        "PASSWORD": os.environ.get("DB_REPLICA_PASSWORD", DATABASES["default"]["PASSWORD"]),
+        "HOST": os.environ["DB_REPLICA_HOST"],
+        "PORT": os.environ.get("DB_REPLICA_PORT", DATABASES["default"]["PORT"]),
+    }
+DATABASE_ROUTERS = ["drf_backend.db_routing.PrimaryReplicaRouter"]
+DB_REPLICA_READS = not TESTING and os.environ.get("DB_REPLICA_READS", "True") == "True"
+DB_REPLICA_STICKY_SECONDS = int(os.environ.get("DB_REPLICA_STICKY_SECONDS", 10))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -140,23 +193,41 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.CachedJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
     ),
+    # JSON rendering timed for Server-Timing (drf_backend.instrumentation)
+    "DEFAULT_RENDERER_CLASSES": [
+        "drf_backend.instrumentation.JSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
     # ── Rate limiting ──────────────────────────────────────────────────────────
+    # Sliding windows in Redis when REDIS_URL is set (drf_backend.throttling)
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",   # unauthenticated users
-        "rest_framework.throttling.UserRateThrottle",   # authenticated users
+        "drf_backend.throttling.AnonRateThrottle",     # unauthenticated users
+        "drf_backend.throttling.UserRateThrottle",     # authenticated users
+        "drf_backend.throttling.ScopedRateThrottle",   # views with throttle_scope
     ],
     "DEFAULT_THROTTLE_RATES": {
-        "anon": "30/minute",    # 30 requests/min for guests (blocks bots/scrapers)
-        "user": "200/minute",   # 200 requests/min for logged-in users
+        "anon": os.environ.get("THROTTLE_ANON_RATE", "30/minute"),   # guests (blocks bots/scrapers)
+        "user": os.environ.get("THROTTLE_USER_RATE", "200/minute"),  # logged-in users
+        # Per-endpoint scopes, on top of the limits above
+        "login": os.environ.get("THROTTLE_LOGIN_RATE", "10/minute"),              # per IP
+        "recommended": os.environ.get("THROTTLE_RECOMMENDED_RATE", "60/minute"),  # per user
     },
 }
 
+# Default page size for keyset-paginated list endpoints
+# (drf_backend.pagination.KeysetPagination); clients may pass ?page_size=.
+API_PAGE_SIZE = int(os.environ.get("API_PAGE_SIZE", 20))
+
+# Seconds between refreshes of the project materialized views
+# (`manage.py refresh_project_views --loop`, run by the scheduler service).
+MATERIALIZED_VIEW_REFRESH_INTERVAL = int(os.environ.get("MATERIALIZED_VIEW_REFRESH_INTERVAL", 300))
+
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=15),
@@ -167,8 +238,19 @@ SIMPLE_JWT = {
     
     "USER_ID_FIELD": "user_id",
     "USER_ID_CLAIM": "user_id",
+
+    # accounts.tokens: Redis blacklist mirror, single-statement rotation
+    "TOKEN_OBTAIN_SERIALIZER": "accounts.serializers.ObtainTokenPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "accounts.serializers.RefreshTokenSerializer",
 }
 
+# OutstandingToken rows for newly issued refresh tokens are queued in Redis
+# and inserted JWT_OUTSTANDING_BATCH_SIZE at a time. The scheduler
+# (refresh_project_views --loop) also flushes the queue every
+# JWT_OUTSTANDING_FLUSH_INTERVAL seconds (accounts.tokens).
+JWT_OUTSTANDING_BATCH_SIZE = int(os.environ.get("JWT_OUTSTANDING_BATCH_SIZE", 100))
+JWT_OUTSTANDING_FLUSH_INTERVAL = int(os.environ.get("JWT_OUTSTANDING_FLUSH_INTERVAL", 10))
+
 # Email — uses Outlook SMTP in production
 # For local dev without email, set EMAIL_BACKEND=django.core.mail.backends.console.EmailBackend in .env
 EMAIL_BACKEND = os.environ.get("EMAIL_BACKEND", "django.core.mail.backends.console.EmailBackend")
@@ -207,3 +289,71 @@ else:
             "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
         }
     }
+
+# Seconds a RecommendedProjectsView result stays cached (per user for
+# skill-match/network, shared for the global modes).
+RECOMMENDATION_CACHE_TTL = int(os.environ.get("RECOMMENDATION_CACHE_TTL", 300))
+
+# Seconds the ranking for a user-search query's first page stays cached
+# (shared by all callers; keeps typeahead on popular prefixes cheap).
+USER_SEARCH_CACHE_TTL = int(os.environ.get("USER_SEARCH_CACHE_TTL", 30))
+
+# Days of activity_event rows kept for the activity feed
+# (prune_activity_events deletes older ones).
+ACTIVITY_RETENTION_DAYS = int(os.environ.get("ACTIVITY_RETENTION_DAYS", 90))
+
+# skill-match recommendations: "vector" scores projects with the in-process
+# TF-IDF matrix (projects.matching), "sql" uses the tag-overlap query.
+SKILL_MATCH_ENGINE = os.environ.get("SKILL_MATCH_ENGINE", "vector")
+# Seconds between checks whether the skill-match matrix needs a rebuild
+SKILL_MATCH_REFRESH_INTERVAL = int(os.environ.get("SKILL_MATCH_REFRESH_INTERVAL", 300))
+
+# Project.trending_score: an event's weight halves every
+# TRENDING_HALF_LIFE_HOURS; the scheduler renormalizes the stored scores
+# every TRENDING_RENORMALIZE_INTERVAL seconds (projects.trending).
+TRENDING_HALF_LIFE_HOURS = float(os.environ.get("TRENDING_HALF_LIFE_HOURS", 72))
+TRENDING_RENORMALIZE_INTERVAL = int(os.environ.get("TRENDING_RENORMALIZE_INTERVAL", 3600))
+
+# JWT user resolution (accounts.authentication): users are cached for
+# AUTH_USER_CACHE_TTL seconds in the default cache (0 disables) and for
+# AUTH_USER_LOCAL_CACHE_TTL seconds in each process, which bounds how long
+# another worker can serve a user after an update.
+AUTH_USER_CACHE_TTL = int(os.environ.get("AUTH_USER_CACHE_TTL", 300))
+AUTH_USER_LOCAL_CACHE_TTL = int(os.environ.get("AUTH_USER_LOCAL_CACHE_TTL", 5))
+AUTH_USER_LOCAL_CACHE_SIZE = int(os.environ.get("AUTH_USER_LOCAL_CACHE_SIZE", 1024))
+
+# Background jobs (jobs app, `manage.py run_jobs`)
+JOBS_POLL_INTERVAL = int(os.environ.get("JOBS_POLL_INTERVAL", 5))
+JOBS_MAX_ATTEMPTS = int(os.environ.get("JOBS_MAX_ATTEMPTS", 5))
+# Seconds after which a job still marked running is assumed orphaned
+JOBS_LOCK_TIMEOUT = int(os.environ.get("JOBS_LOCK_TIMEOUT", 300))
+
+# Per-request SQL profiling (drf_backend.instrumentation): the share of
+# requests profiled into a JSON log line, and the duration in ms above
+# which a request is logged as a warning together with its slowest SQL
+# statements. Profiled responses carry a Server-Timing header for staff
+# users only, unless SQL_PROFILE_EXPOSE_HEADER (query counts and timings
+# are backend internals).
+SQL_PROFILE_SAMPLE_RATE = float(os.environ.get("SQL_PROFILE_SAMPLE_RATE", 0.01))
+SQL_SLOW_REQUEST_MS = int(os.environ.get("SQL_SLOW_REQUEST_MS", 500))
+SQL_PROFILE_EXPOSE_HEADER = os.environ.get("SQL_PROFILE_EXPOSE_HEADER", "False") == "True"
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        # The instrumentation logger writes JSON; keep lines parseable.
+        "message": {"format": "%(message)s"},
+    },
+    "handlers": {
+        "profile": {"class": "logging.StreamHandler", "formatter": "message"},
+    },
+    "loggers": {
+        "drf_backend.instrumentation": {
+            "handlers": ["profile"],
+            # Tests only show slow requests.
+            "level": "WARNING" if TESTING else os.environ.get("SQL_PROFILE_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
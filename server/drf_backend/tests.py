@@ -0,0 +1,252 @@
+import json
+from contextlib import ExitStack
+
+from django.core.cache import cache
+from django.db import connection, connections, router
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import serializers, status
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.views import APIView
+
+from accounts.models import User
+from projects.models import Project
+
+from . import db_routing, instrumentation
+
+
+class ClosesReplicaPoolMixin:
+    @classmethod
+    def tearDownClass(cls):
+        # Django closes the pool of the test database it destroys, but not
+        # the pool of the mirror alias, which would keep the database busy.
+        connections[db_routing.REPLICA_DB_ALIAS].close_pool()
+        super().tearDownClass()
+
+
+class DatabasePoolStatsTests(ClosesReplicaPoolMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse("db_pool_stats")
+
+    def test_staff_only(self):
+        user = User.objects.create_user(nu_email="dev@nu.edu.pk", password="testpassword123")
+        self.client.force_authenticate(user=user)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_reports_default_pool(self):
+        admin = User.objects.create_superuser(nu_email="admin@nu.edu.pk", password="testpassword123")
+        self.client.force_authenticate(user=admin)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        stats = response.data["databases"]["default"]
+        if connection.pool is None:
+            self.assertIsNone(stats)
+            return
+        # This test's transaction holds a connection.
+        self.assertGreaterEqual(stats["in_use"], 1)
+        self.assertEqual(stats["in_use"] + stats["available"], stats["size"])
+        self.assertLessEqual(stats["size"], stats["max_size"])
+
+
+class ReplicaRoutingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.user = User.objects.create_user(nu_email="reader@nu.edu.pk", password="testpassword123")
+        self.other = User.objects.create_user(nu_email="other@nu.edu.pk", password="testpassword123")
+
+    def serve(self, method, user, write=False):
+        """Run a request through the middleware; returns the read aliases seen by the view."""
+        seen = []
+
+        def view(request):
+            db_routing.use_replica(request.user)
+            seen.append(router.db_for_read(Project))
+            if write:
+                router.db_for_write(Project)
+                seen.append(router.db_for_read(Project))
+            return HttpResponse()
+
+        request = getattr(self.factory, method)("/")
+        request.user = user
+        db_routing.ReplicaRoutingMiddleware(view)(request)
+        return seen
+
+    def test_primary_without_replica_reads(self):
+        self.assertEqual(self.serve("get", self.user), ["default"])
+
+    @override_settings(DB_REPLICA_READS=True)
+    def test_reads_follow_writes_to_primary(self):
+        self.assertEqual(self.serve("get", self.user), ["replica"])
+        # Outside a request everything stays on the primary.
+        self.assertEqual(router.db_for_read(Project), "default")
+
+        self.assertEqual(self.serve("get", self.user, write=True), ["replica", "default"])
+        # The write pins this user to the primary for the next requests...
+        self.assertEqual(self.serve("get", self.user), ["default"])
+        # ...but nobody else.
+        self.assertEqual(self.serve("get", self.other), ["replica"])
+
+    @override_settings(DB_REPLICA_READS=True)
+    def test_unsafe_request_pins_user(self):
+        self.serve("post", self.user)
+        self.assertEqual(self.serve("get", self.user), ["default"])
+        cache.delete(db_routing.sticky_key(self.user.pk))
+        self.assertEqual(self.serve("get", self.user), ["replica"])
+
+
+class RenameProjectView(db_routing.ReplicaReadMixin, APIView):
+    """A GET that reads, writes, then reads again."""
+    authentication_classes = []
+    permission_classes = []
+    throttle_classes = []
+
+    def get(self, request, pk):
+        before = Project.objects.get(pk=pk).title
+        Project.objects.filter(pk=pk).update(title="renamed")
+        return Response({"before": before, "after": Project.objects.get(pk=pk).title})
+
+
+@override_settings(DB_REPLICA_READS=True)
+class ReplicaQueryTests(ClosesReplicaPoolMixin, TransactionTestCase):
+    """Queries on the real ``replica`` alias (a mirror of the test database)."""
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        cache.clear()
+        owner = User.objects.create_user(nu_email="owner@nu.edu.pk", password="testpassword123")
+        self.project = Project.objects.create(
+            user=owner, title="Replicated", description="d", github_url="https://github.com/e/r"
+        )
+
+    def run_queries(self, request):
+        """
+        Call ``request()``; returns it and ``(alias, sql)`` of every query, in
+        order (including the type lookups of a freshly opened connection).
+        """
+        queries = []
+
+        def record(execute, sql, params, many, context):
+            queries.append((context["connection"].alias, sql))
+            return execute(sql, params, many, context)
+
+        with ExitStack() as stack:
+            for alias in self.databases:
+                stack.enter_context(connections[alias].execute_wrapper(record))
+            return request(), queries
+
+    def test_mixin_view_reads_from_replica(self):
+        client = APIClient()
+        client.force_authenticate(user=self.project.user)
+        response, queries = self.run_queries(lambda: client.get(reverse("project-list-all")))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [project["project_id"] for project in response.data["results"]], [self.project.pk]
+        )
+        aliases = {alias for alias, sql in queries if "projects_project" in sql}
+        self.assertEqual(aliases, {"replica"})
+
+    def test_write_flips_later_reads_to_primary(self):
+        request = APIRequestFactory().get("/")
+        view = db_routing.ReplicaRoutingMiddleware(
+            lambda request: RenameProjectView.as_view()(request, pk=self.project.pk)
+        )
+        response, queries = self.run_queries(lambda: view(request))
+        self.assertEqual(response.data, {"before": "Replicated", "after": "renamed"})
+        self.assertEqual(
+            [(alias, sql.split()[0]) for alias, sql in queries if "projects_project" in sql],
+            [("replica", "SELECT"), ("default", "UPDATE"), ("default", "SELECT")],
+        )
+
+
+class ProjectCountSerializer(serializers.Serializer):
+    title = serializers.CharField()
+    projects = serializers.SerializerMethodField()
+
+    def get_projects(self, obj):
+        return Project.objects.count()
+
+
+@override_settings(SQL_PROFILE_SAMPLE_RATE=1)
+class SQLInstrumentationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(nu_email="profiled@nu.edu.pk", password="testpassword123")
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("user-profile")
+
+    def test_server_timing_and_log_line(self):
+        self.user.is_staff = True
+        self.user.save()
+        with self.assertLogs("drf_backend.instrumentation", "INFO") as logs, \
+                CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["queries"], len(queries))
+        self.assertEqual(record["route"], "api/auth/me/")
+        self.assertEqual(record["user_id"], self.user.pk)
+        self.assertNotIn("slow_statements", record)
+
+        timing = response["Server-Timing"]
+        self.assertIn(f'db;dur={record["db_ms"]};desc="{len(queries)} queries"', timing)
+        self.assertIn(
+            f'serialize;dur={record["serialize_ms"]};desc="{record["serialize_queries"]} queries"', timing
+        )
+        self.assertIn(f'render;dur={record["render_ms"]}', timing)
+        self.assertIn(f'total;dur={record["total_ms"]}', timing)
+
+    def test_header_for_staff_only(self):
+        with self.assertLogs("drf_backend.instrumentation", "INFO"):
+            response = self.client.get(self.url)
+        self.assertNotIn("Server-Timing", response)
+
+        anonymous = APIClient()
+        with self.assertLogs("drf_backend.instrumentation", "INFO"):
+            response = anonymous.get(reverse("project-list-all"))
+        self.assertNotIn("Server-Timing", response)
+
+        with override_settings(SQL_PROFILE_EXPOSE_HEADER=True), \
+                self.assertLogs("drf_backend.instrumentation", "INFO"):
+            response = anonymous.get(reverse("project-list-all"))
+        self.assertIn("Server-Timing", response)
+
+    def test_serializer_time_and_queries(self):
+        rows = [{"title": "a"}, {"title": "b"}]
+        with instrumentation.profiling(instrumentation.RequestProfile()) as profile:
+            data = ProjectCountSerializer(rows, many=True).data
+        self.assertEqual(data, [{"title": "a", "projects": 0}, {"title": "b", "projects": 0}])
+        # Nested serializers count once, inside the outermost one.
+        self.assertEqual(profile.serialize_queries, 2)
+        self.assertEqual(profile.queries, 2)
+        self.assertGreater(profile.serialize_seconds, 0)
+
+        # Outside a profiled request nothing is recorded.
+        self.assertEqual(ProjectCountSerializer({"title": "c"}).data["projects"], 0)
+        self.assertEqual(profile.serialize_queries, 2)
+
+    @override_settings(SQL_SLOW_REQUEST_MS=0)
+    def test_slow_request_logs_statements_without_parameters(self):
+        with self.assertLogs("drf_backend.instrumentation", "WARNING") as logs:
+            response = self.client.patch(reverse("user-update"), {"bio": "secret bio"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(logs.records[0].levelname, "WARNING")
+        statements = record["slow_statements"]
+        self.assertTrue(statements)
+        self.assertEqual(statements[0]["ms"], record["slowest_ms"])
+        self.assertTrue(any("accounts_user" in statement["sql"] for statement in statements))
+        self.assertNotIn("secret bio", logs.output[0])
+
+    @override_settings(SQL_PROFILE_SAMPLE_RATE=0)
+    def test_unsampled_requests_are_not_profiled(self):
+        with self.assertNoLogs("drf_backend.instrumentation"):
+            response = self.client.get(self.url)
+        self.assertNotIn("Server-Timing", response)
@@ -0,0 +1,99 @@
+"""
+Sliding-window throttles backed by one Redis Lua script.
+
+DRF's SimpleRateThrottle keeps each client's request history as a list
+in the cache: every request reads the list, trims it in Python and
+writes it back, so concurrent workers race and the payload grows with the
+rate. With Redis configured these classes keep the history in a sorted
+set instead and decide in a single script call (ZREMRANGEBYSCORE, ZCARD,
+ZADD), timed by the Redis clock so every worker sees the same window.
+
+Without Redis (local development, tests) they fall back to DRF's cache
+implementation. If Redis errors, requests are allowed and a warning is
+logged rather than failing the API.
+
+``manage.py benchmark_throttle`` measures the per-request overhead.
+"""
+import logging
+import os
+
+from redis.exceptions import RedisError
+from rest_framework import throttling
+
+from .redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1] history key; ARGV: limit, window (ms), unique member.
+# Returns {allowed, milliseconds until the oldest request leaves the window}.
+SLIDING_WINDOW_SCRIPT = """
+local now = redis.call('TIME')
+local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now_ms - window)
+if redis.call('ZCARD', KEYS[1]) < limit then
+    redis.call('ZADD', KEYS[1], now_ms, ARGV[3])
+    redis.call('PEXPIRE', KEYS[1], window)
+    return {1, 0}
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+return {0, tonumber(oldest[2]) + window - now_ms}
+"""
+
+_scripts = {}
+
+
+def _sliding_window(client):
+    # register_script runs EVALSHA and reloads the script if Redis lost it.
+    script = _scripts.get(id(client))
+    if script is None:
+        script = _scripts[id(client)] = client.register_script(SLIDING_WINDOW_SCRIPT)
+    return script
+
+
+class SlidingWindowRateThrottle(throttling.SimpleRateThrottle):
+    """
+    Listed after DRF's concrete throttles in their subclasses below, so
+    their ``get_cache_key`` (and ScopedRateThrottle's per-view rate
+    lookup) run first and only the history check is replaced.
+    """
+
+    def allow_request(self, request, view):
+        client = get_redis()
+        if client is None:
+            return super().allow_request(request, view)
+
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        try:
+            allowed, wait_ms = _sliding_window(client)(
+                keys=[self.key],
+                args=[self.num_requests, self.duration * 1000, os.urandom(8).hex()],
+            )
+        except RedisError:
+            logger.warning("Throttle check failed; allowing request", exc_info=True)
+            return True
+        self.redis_wait = max(wait_ms, 0) / 1000
+        return bool(allowed)
+
+    def wait(self):
+        if hasattr(self, "redis_wait"):
+            return self.redis_wait
+        return super().wait()
+
+
+class AnonRateThrottle(throttling.AnonRateThrottle, SlidingWindowRateThrottle):
+    pass
+
+
+class UserRateThrottle(throttling.UserRateThrottle, SlidingWindowRateThrottle):
+    pass
+
+
+class ScopedRateThrottle(throttling.ScopedRateThrottle, SlidingWindowRateThrottle):
+    """Per-endpoint limits: views set ``throttle_scope`` (see DEFAULT_THROTTLE_RATES)."""
@@ -22,6 +22,8 @@ from rest_framework_simplejwt.views import (
     TokenRefreshView,
 )
 
+from .metrics import DatabasePoolStatsView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     # basic root route so visiting http://127.0.0.1:8000/ doesn't 404
@@ -47,4 +49,7 @@ urlpatterns = [
     
 	# interactions urls
 	path('api/interactions/', include('interactions.urls')),
+
+    # internal metrics (staff only)
+    path('api/internal/metrics/db-pool/', DatabasePoolStatsView.as_view(), name='db_pool_stats'),
 ]
\ No newline at end of file
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interactions', '0002_like'),
+        ('projects', '0008_project_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['project', '-created_at', '-comment_id'], name='comment_project_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:12
+
+import django.utils.timezone
+from django.db import migrations, models
+
+# Existing likes were never dated. Date them from the project's last
+# update, the reference point the old trending formula used for them.
+BACKFILL_SQL = """
+    UPDATE interactions_like l SET created_at = p.updated_at
+    FROM projects_project p
+    WHERE p.project_id = l.project_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interactions', '0003_comment_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='like',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunSQL(sql=BACKFILL_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interactions', '0004_like_created_at'),
+        ('projects', '0016_project_trending_score'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='like',
+            index=models.Index(fields=['project', 'like_id'], name='like_project_order_idx'),
+        ),
+    ]
@@ -21,6 +21,9 @@ class Comment(models.Model):
 
 	class Meta:
 		ordering = ["-created_at"]
+		indexes = [
+			models.Index(fields=["project", "-created_at", "-comment_id"], name="comment_project_keyset_idx"),
+		]
 
 	def __str__(self) -> str:
 		return f"Comment #{self.comment_id} by {self.user_id} on project {self.project_id}"
@@ -38,11 +41,15 @@ class Like(models.Model):
 		on_delete=models.CASCADE,
 		related_name="likes",
 	)
+	# Weighs the like in Project.trending_score (migration projects 0016).
+	created_at = models.DateTimeField(auto_now_add=True)
 
 	class Meta:
 		unique_together = ("user", "project")
 		indexes = [
 			models.Index(fields=["user", "project"], name="like_user_project_idx"),
+			# A project's earliest likers (affinity triggers, migration projects 0017)
+			models.Index(fields=["project", "like_id"], name="like_project_order_idx"),
 		]
 
 	def __str__(self) -> str:
@@ -1,3 +1,37 @@
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
 
-# Create your tests here.
+from accounts.models import User
+from projects.models import Project
+from .models import Comment
+
+
+class ProjectCommentsConditionalGetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            nu_email="test@nu.edu.pk", password="testpassword123", full_name="Test User"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.project = Project.objects.create(
+            user=self.user,
+            title="Discussed",
+            description="desc",
+            github_url="https://github.com/example/repo",
+        )
+        self.comment = Comment.objects.create(user=self.user, project=self.project, comment_body="first")
+        self.url = reverse("project-comments-list", args=[self.project.project_id])
+
+    def test_unchanged_page_is_not_modified(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_deleted_comment_changes_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.comment.delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"], [])
@@ -2,6 +2,9 @@ from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from django.db import transaction
 
+from drf_backend.conditional import ConditionalGetMixin
+from drf_backend.pagination import KeysetPagination
+
 from .models import Comment, Like
 from .serializers import CommentCreateSerializer, CommentSerializer
 
@@ -47,13 +50,23 @@ class CommentDeleteView(generics.DestroyAPIView):
 		)
 
 
-class ProjectCommentsListView(generics.ListAPIView):
+class ProjectCommentsListView(ConditionalGetMixin, generics.ListAPIView):
 	permission_classes = [permissions.IsAuthenticated]
 	serializer_class = CommentSerializer
+	pagination_class = KeysetPagination
+	keyset_ordering = ("-created_at", "-comment_id")
 
-	def get_queryset(self):
+	def get_comment_queryset(self):
 		project_id = self.kwargs.get("project_id")
-		return Comment.objects.filter(project__project_id=project_id).select_related("user")
+		return Comment.objects.filter(project__project_id=project_id)
+
+	def get_queryset(self):
+		return self.get_comment_queryset().select_related("user")
+
+	def get_version_rows(self):
+		# Comments are never edited: the page's ids plus the authors'
+		# updated_at (their names are rendered) identify its content.
+		return self.get_page_version_rows(self.get_comment_queryset(), "user__updated_at")
 
 
 class ToggleProjectLikeView(generics.GenericAPIView):
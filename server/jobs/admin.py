@@ -0,0 +1,10 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "name", "status", "attempts", "run_after", "created_at")
+    list_filter = ("status", "name")
+    readonly_fields = ("created_at", "locked_at", "last_error")
@@ -0,0 +1,30 @@
+"""
+One SMTP connection per worker process, shared by the jobs it runs.
+
+Opening a connection (TCP + STARTTLS + AUTH) costs more than sending a
+message; the worker keeps it open while there is work and closes it when
+the queue goes idle or a job fails.
+"""
+import smtplib
+
+from django.core.mail import get_connection
+
+_connection = None
+
+
+def get_mail_connection():
+    global _connection
+    if _connection is None:
+        _connection = get_connection()
+        _connection.open()
+    return _connection
+
+
+def close_mail_connection():
+    global _connection
+    if _connection is not None:
+        try:
+            _connection.close()
+        except (OSError, smtplib.SMTPException):
+            pass
+        _connection = None
@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from jobs.mail import close_mail_connection
+from jobs.queue import wait_for_work, work
+
+
+class Command(BaseCommand):
+    help = (
+        "Run background jobs from the jobs_job table. Several workers can run "
+        "side by side; each claims its own batch."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run the jobs that are due now, then exit.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10,
+            help="Jobs claimed per round trip.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=int,
+            default=settings.JOBS_POLL_INTERVAL,
+            help="Seconds to wait for new work when idle (default: JOBS_POLL_INTERVAL).",
+        )
+
+    def handle(self, *args, **options):
+        processed = 0
+        while True:
+            claimed = work(options["batch_size"])
+            processed += claimed
+            if claimed:
+                continue
+            # Idle: let the SMTP and database connections go.
+            close_mail_connection()
+            if options["once"]:
+                self.stdout.write(self.style.SUCCESS(f"Ran {processed} job(s)."))
+                return
+            close_old_connections()
+            wait_for_work(options["poll_interval"])
@@ -0,0 +1,161 @@
+"""
+PostgreSQL-backed job queue.
+
+* ``@job("name")`` registers a handler (apps define them in tasks.py).
+* ``enqueue("name", **payload)`` inserts the job in the caller's
+  transaction, so it exists only if that transaction commits, and wakes
+  the workers on commit (Redis list when configured, otherwise workers
+  poll every JOBS_POLL_INTERVAL seconds).
+* ``manage.py run_jobs`` claims due jobs with FOR UPDATE SKIP LOCKED and
+  runs them. Failures are retried with exponential backoff and jitter up
+  to ``max_attempts``; jobs stuck in ``running`` past JOBS_LOCK_TIMEOUT
+  (a worker died) are requeued.
+
+Payloads must be JSON: pass ids, not model instances.
+"""
+import logging
+import random
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import DurationField, Value
+from django.db.models.functions import Now
+from django.utils import timezone
+from redis.exceptions import RedisError
+
+from drf_backend.redis import get_redis
+
+from .mail import close_mail_connection
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+WAKEUP_KEY = "jobs:wakeup"
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 3600
+
+CLAIM_SQL = """
+    UPDATE jobs_job SET status = 'running', locked_at = NOW(), attempts = attempts + 1
+    WHERE id IN (
+        SELECT id FROM jobs_job
+        WHERE status = 'queued' AND run_after <= STATEMENT_TIMESTAMP()
+        ORDER BY run_after, id
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING *
+"""
+
+REQUEUE_STALE_SQL = """
+    UPDATE jobs_job SET status = 'queued', locked_at = NULL
+    WHERE status = 'running' AND locked_at < NOW() - %s * INTERVAL '1 second'
+"""
+
+_handlers = {}
+
+
+def job(name):
+    """Register ``func`` as the handler for jobs called ``name``."""
+    def decorator(func):
+        _handlers[name] = func
+        return func
+    return decorator
+
+
+def enqueue(name, delay=0, max_attempts=None, **payload):
+    if name not in _handlers:
+        raise LookupError(f"No handler registered for job {name!r}.")
+    queued = Job.objects.create(
+        name=name,
+        payload=payload,
+        # The database clock, as in CLAIM_SQL (Now() is STATEMENT_TIMESTAMP()).
+        run_after=Now() + Value(timedelta(seconds=delay), output_field=DurationField()),
+        max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS,
+    )
+    transaction.on_commit(wake_workers)
+    return queued
+
+
+def wake_workers():
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        # One pending token is enough to wake an idle worker.
+        pipe = client.pipeline()
+        pipe.lpush(WAKEUP_KEY, 1)
+        pipe.ltrim(WAKEUP_KEY, 0, 0)
+        pipe.execute()
+    except RedisError:
+        logger.warning("Could not wake job workers", exc_info=True)
+
+
+def wait_for_work(timeout):
+    """Block until woken by an enqueue or ``timeout`` seconds pass."""
+    client = get_redis()
+    if client is not None:
+        try:
+            client.blpop([WAKEUP_KEY], timeout=max(int(timeout), 1))
+            return
+        except RedisError:
+            logger.warning("Job wakeup wait failed; polling", exc_info=True)
+    time.sleep(timeout)
+
+
+def claim_jobs(limit):
+    with connection.cursor() as cursor:
+        cursor.execute(REQUEUE_STALE_SQL, [settings.JOBS_LOCK_TIMEOUT])
+        if cursor.rowcount:
+            logger.warning("Requeued %d stale job(s)", cursor.rowcount)
+    return list(Job.objects.raw(CLAIM_SQL, [limit]))
+
+
+def retry_delay(attempts):
+    delay = min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def run_job(claimed):
+    handler = _handlers.get(claimed.name)
+    try:
+        if handler is None:
+            raise LookupError(f"No handler registered for job {claimed.name!r}.")
+        handler(**claimed.payload)
+    except Exception as exc:
+        # The shared SMTP connection may be what broke; reconnect next time.
+        close_mail_connection()
+        fail_job(claimed, exc)
+        return False
+    Job.objects.filter(pk=claimed.pk).delete()
+    return True
+
+
+def fail_job(claimed, exc):
+    error = f"{type(exc).__name__}: {exc}"
+    if claimed.attempts >= claimed.max_attempts:
+        logger.error("Job %s #%s failed permanently: %s", claimed.name, claimed.pk, error)
+        Job.objects.filter(pk=claimed.pk).update(
+            status=Job.STATUS_FAILED, locked_at=None, last_error=error
+        )
+        return
+    delay = retry_delay(claimed.attempts)
+    logger.warning(
+        "Job %s #%s failed (attempt %d/%d), retrying in %.0fs: %s",
+        claimed.name, claimed.pk, claimed.attempts, claimed.max_attempts, delay, error,
+    )
+    Job.objects.filter(pk=claimed.pk).update(
+        status=Job.STATUS_QUEUED,
+        locked_at=None,
+        last_error=error,
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def work(batch_size=10):
+    """Claim and run one batch of due jobs. Returns how many were claimed."""
+    claimed = claim_jobs(batch_size)
+    for item in claimed:
+        run_job(item)
+    return len(claimed)
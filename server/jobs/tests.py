@@ -0,0 +1,117 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from . import mail as job_mail
+from .models import Job
+from .queue import enqueue, job, work
+
+calls = []
+
+
+@job("tests.record")
+def record(value):
+    calls.append(value)
+
+
+@job("tests.explode")
+def explode():
+    raise RuntimeError("boom")
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_jobs_run_and_are_deleted(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            enqueue("tests.record", value=1)
+            enqueue("tests.record", value=2)
+        enqueue("tests.record", delay=60, value=3)
+
+        self.assertEqual(work(), 2)
+        self.assertEqual(calls, [1, 2])
+        self.assertEqual(list(Job.objects.values_list("payload", flat=True)), [{"value": 3}])
+
+    def test_failures_back_off_then_stop(self):
+        queued = enqueue("tests.explode", max_attempts=2)
+
+        with self.assertLogs("jobs.queue", "WARNING"):
+            work()
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), (Job.STATUS_QUEUED, 1))
+        self.assertGreater(queued.run_after, timezone.now() + timedelta(seconds=20))
+        self.assertIn("boom", queued.last_error)
+
+        Job.objects.filter(pk=queued.pk).update(run_after=timezone.now() - timedelta(seconds=1))
+        with self.assertLogs("jobs.queue", "ERROR"):
+            work()
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), (Job.STATUS_FAILED, 2))
+        self.assertEqual(work(), 0)
+
+    def test_stale_running_jobs_are_requeued(self):
+        queued = enqueue("tests.record", value=1)
+        Job.objects.filter(pk=queued.pk).update(
+            status=Job.STATUS_RUNNING, locked_at=timezone.now() - timedelta(hours=1)
+        )
+        with self.assertLogs("jobs.queue", "WARNING"):
+            self.assertEqual(work(), 1)
+        self.assertEqual(calls, [1])
+
+
+class VerificationEmailJobTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def register(self, email):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("register"),
+                {"full_name": "New User", "nu_email": email, "password": "testpassword123"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_registration_enqueues_instead_of_sending(self):
+        self.register("new@nu.edu.pk")
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(Job.objects.filter(name="accounts.send_verification_email").count(), 1)
+
+        call_command("run_jobs", "--once", stdout=StringIO())
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["new@nu.edu.pk"])
+        self.assertFalse(Job.objects.exists())
+
+    def test_resend_supersedes_pending_email(self):
+        self.register("new@nu.edu.pk")
+        self.client.post(
+            reverse("resend-verification-email"), {"nu_email": "new@nu.edu.pk"}, format="json"
+        )
+
+        call_command("run_jobs", "--once", stdout=StringIO())
+
+        # The first token was deleted by the resend; only its replacement is mailed.
+        self.assertEqual(len(mail.outbox), 1)
+        token = User.objects.get(nu_email="new@nu.edu.pk").verification_tokens.get()
+        self.assertIn(token.token, mail.outbox[0].body)
+
+    def test_worker_reuses_one_mail_connection(self):
+        self.register("one@nu.edu.pk")
+        self.register("two@nu.edu.pk")
+
+        with mock.patch.object(job_mail, "get_connection", wraps=job_mail.get_connection) as opened:
+            call_command("run_jobs", "--once", stdout=StringIO())
+
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(opened.call_count, 1)
@@ -0,0 +1,111 @@
+"""
+User affinity graph: reads and repair.
+
+projects_useraffinity (see UserAffinity) is kept current by triggers; the
+network recommendation mode joins a user's edges to the projects their
+neighbours own, and ``get_collaborator_suggestions`` walks up to two hops
+from the same edges. Every read is bounded by ``SUGGESTION_FANOUT`` per
+hop, served by the (user_id, weight DESC) index.
+
+Like edges come from each project's first ``projects_like_affinity_limit()``
+likers (100, migration 0017) only: a like writes at most 2 x 99 edges and a
+project contributes at most 100 x 99 however many people like it.
+"""
+from django.db import connection, transaction
+
+from drf_backend.db_routing import read_connection
+
+SUGGESTION_FANOUT = 50
+
+# Recompute every edge from the source tables (rebuild_affinity_graph).
+REBUILD_SQL = [
+    "DELETE FROM projects_useraffinity",
+    """
+    WITH early_likes AS (
+        SELECT project_id, user_id FROM (
+            SELECT project_id, user_id,
+                ROW_NUMBER() OVER (PARTITION BY project_id ORDER BY like_id) AS n
+            FROM interactions_like
+        ) ranked
+        WHERE n <= projects_like_affinity_limit()
+    )
+    INSERT INTO projects_useraffinity (user_id, other_id, shared_issues, shared_likes)
+    SELECT user_id, other_id, SUM(shared_issues), SUM(shared_likes) FROM (
+        SELECT c1.user_id, c2.user_id AS other_id, 1 AS shared_issues, 0 AS shared_likes
+        FROM projects_collaborator c1
+        JOIN projects_collaborator c2 ON c2.issue_id = c1.issue_id AND c2.user_id <> c1.user_id
+        UNION ALL
+        SELECT l1.user_id, l2.user_id, 0, 1
+        FROM early_likes l1
+        JOIN early_likes l2 ON l2.project_id = l1.project_id AND l2.user_id <> l1.user_id
+    ) pairs
+    GROUP BY user_id, other_id
+    """,
+]
+
+# People the user has not collaborated with yet: their like-neighbours
+# (scored by edge weight) and neighbours of neighbours (scored by the
+# weaker edge of each path), summed per candidate.
+SUGGESTIONS_SQL = """
+    WITH mine AS (
+        SELECT other_id, weight, shared_issues, shared_likes
+        FROM projects_useraffinity
+        WHERE user_id = %(user_id)s
+        ORDER BY weight DESC, other_id DESC
+        LIMIT %(fanout)s
+    ), paths AS (
+        SELECT other_id AS candidate_id, weight AS score, shared_likes, 0 AS mutual
+        FROM mine
+        WHERE shared_issues = 0
+        UNION ALL
+        SELECT hop.other_id, LEAST(m.weight, hop.weight), 0, 1
+        FROM mine m
+        CROSS JOIN LATERAL (
+            SELECT a.other_id, a.weight
+            FROM projects_useraffinity a
+            WHERE a.user_id = m.other_id
+            ORDER BY a.weight DESC, a.other_id DESC
+            LIMIT %(fanout)s
+        ) hop
+    ), ranked AS (
+        SELECT candidate_id, SUM(score) AS score,
+            SUM(shared_likes) AS shared_likes, SUM(mutual) AS mutual_connections
+        FROM paths
+        WHERE candidate_id <> %(user_id)s
+        AND NOT EXISTS (
+            SELECT 1 FROM projects_useraffinity a
+            WHERE a.user_id = %(user_id)s AND a.other_id = paths.candidate_id
+            AND a.shared_issues > 0
+        )
+        GROUP BY candidate_id
+        ORDER BY score DESC, candidate_id DESC
+        LIMIT %(limit)s
+    )
+    SELECT u.user_id, u.full_name, u.avatar_url, u.github_username,
+        r.score::int AS score, r.shared_likes::int AS shared_likes,
+        r.mutual_connections::int AS mutual_connections
+    FROM ranked r
+    JOIN accounts_user u ON u.user_id = r.candidate_id
+    WHERE u.is_active
+    ORDER BY r.score DESC, r.candidate_id DESC
+"""
+
+
+def get_collaborator_suggestions(user_id, limit):
+    with read_connection().cursor() as cursor:
+        cursor.execute(
+            SUGGESTIONS_SQL,
+            {"user_id": user_id, "fanout": SUGGESTION_FANOUT, "limit": limit},
+        )
+        columns = [col[0] for col in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+@transaction.atomic
+def rebuild_graph():
+    """Recompute every edge from collaborators and likes (repairs drift)."""
+    with connection.cursor() as cursor:
+        cursor.execute("LOCK TABLE projects_useraffinity IN EXCLUSIVE MODE")
+        for statement in REBUILD_SQL:
+            cursor.execute(statement)
+        return cursor.rowcount
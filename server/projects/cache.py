@@ -0,0 +1,74 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+RECOMMENDATION_MODES = ("spotlight", "with-issues", "skill-match", "network")
+
+# Modes whose results do not depend on who is asking. They are cached once
+# for everybody and the caller's own projects are filtered out afterwards.
+GLOBAL_MODES = ("spotlight", "with-issues", "latest")
+
+# Rows kept in a shared entry, so there is slack left after removing the
+# caller's own projects.
+GLOBAL_POOL_SIZE = 100
+
+_STATS_KEYS = {True: "reco:stats:hits", False: "reco:stats:misses"}
+
+
+def normalize_mode(mode):
+    """Unknown modes fall back to the "latest projects" query."""
+    return mode if mode in RECOMMENDATION_MODES else "latest"
+
+
+def recommendation_key(mode, user_id):
+    mode = normalize_mode(mode)
+    if mode in GLOBAL_MODES:
+        return f"reco:global:{mode}"
+    return f"reco:user:{user_id}:{mode}"
+
+
+def get_recommendations(mode, user_id):
+    payload = cache.get(recommendation_key(mode, user_id))
+    _record_lookup(hit=payload is not None)
+    return payload
+
+
+def set_recommendations(mode, user_id, payload):
+    cache.set(
+        recommendation_key(mode, user_id),
+        payload,
+        settings.RECOMMENDATION_CACHE_TTL,
+    )
+
+
+def invalidate_user_recommendations(user_id, modes):
+    """Drop a user's per-user entries once the surrounding transaction commits."""
+    keys = [recommendation_key(mode, user_id) for mode in modes]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def invalidate_global_recommendations():
+    keys = [recommendation_key(mode, None) for mode in GLOBAL_MODES]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def get_cache_stats():
+    values = cache.get_many(list(_STATS_KEYS.values()))
+    hits = values.get(_STATS_KEYS[True], 0)
+    misses = values.get(_STATS_KEYS[False], 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / total, 4) if total else None,
+    }
+
+
+def _record_lookup(hit):
+    key = _STATS_KEYS[hit]
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted between add() and incr(); losing one sample is fine.
+        pass
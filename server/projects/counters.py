@@ -0,0 +1,80 @@
+from django.db import connection, transaction
+
+# Counter columns on projects_project and the recount each should equal.
+RECOUNTS = {
+    "likes_count": "(SELECT COUNT(*) FROM interactions_like l WHERE l.project_id = p.project_id)",
+    "comments_count": "(SELECT COUNT(*) FROM interactions_comment c WHERE c.project_id = p.project_id)",
+    "open_issues_count": """(SELECT COUNT(*) FROM projects_issue i
+         WHERE i.project_id = p.project_id AND i.status = 'open')""",
+    "closed_issues_count": """(SELECT COUNT(*) FROM projects_issue i
+         WHERE i.project_id = p.project_id AND i.status = 'closed')""",
+}
+
+COUNTER_COLUMNS = tuple(RECOUNTS)
+
+EXPECTED_COUNTS_SQL = """
+    SELECT
+        p.project_id,
+        {columns}
+    FROM projects_project p
+    {{where}}
+    ORDER BY p.project_id
+""".format(columns=",\n        ".join(f"p.{column}, {recount}" for column, recount in RECOUNTS.items()))
+
+LOCK_SQL = """
+    SELECT project_id FROM projects_project
+    WHERE project_id = ANY(%s)
+    ORDER BY project_id
+    FOR UPDATE
+"""
+
+REPAIR_SQL = """
+    UPDATE projects_project p SET
+        {assignments}
+    WHERE p.project_id = ANY(%s)
+""".format(assignments=",\n        ".join(f"{column} = {recount}" for column, recount in RECOUNTS.items()))
+
+
+def find_counter_drift(project_ids=None):
+    """
+    Compare the trigger-maintained counters with a recount.
+
+    Returns a list of ``{"project_id": ..., "<column>": (stored, actual)}``
+    dicts, one per project whose counters disagree (only drifting columns
+    are included).
+    """
+    where, params = "", []
+    if project_ids:
+        where, params = "WHERE p.project_id = ANY(%s)", [list(project_ids)]
+
+    drift = []
+    with connection.cursor() as cursor:
+        cursor.execute(EXPECTED_COUNTS_SQL.format(where=where), params)
+        for row in cursor.fetchall():
+            project_id, values = row[0], row[1:]
+            mismatches = {
+                column: (values[i * 2], values[i * 2 + 1])
+                for i, column in enumerate(COUNTER_COLUMNS)
+                if values[i * 2] != values[i * 2 + 1]
+            }
+            if mismatches:
+                drift.append({"project_id": project_id, **mismatches})
+    return drift
+
+
+@transaction.atomic
+def repair_counters(drift):
+    """
+    Recount the drifting projects' counters and write the result.
+
+    The counts in ``drift`` may be stale by now, so they are not written.
+    The rows are locked first and recounted by the next statement, which
+    sees every like, comment and issue whose trigger already updated the
+    row. Triggers that fire later wait for the lock and apply on top.
+    """
+    project_ids = [entry["project_id"] for entry in drift]
+    if not project_ids:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(LOCK_SQL, [project_ids])
+        cursor.execute(REPAIR_SQL, [project_ids])
@@ -0,0 +1,277 @@
+"""
+Contributor leaderboard: Redis mirror and reads.
+
+ContributorScore (kept exact by triggers) is the source of truth. When
+Redis is configured, activity_score is mirrored into a sorted set so
+top-N pages and rank lookups are O(log n) instead of counting rows:
+
+* rank follows SQL RANK() semantics: 1 + number of users with a strictly
+  higher score (ZCOUNT), so ties share a rank;
+* members are zero-padded user ids, so ties are ordered by user id
+  descending in Redis and in the SQL fallback alike.
+
+Writers call ``schedule_sync(user_ids)``; the mirror is updated after the
+transaction commits. ``manage.py sync_leaderboard`` rebuilds it, and a
+missing key is rebuilt on the next read. A rebuild fills its own staging
+key from a table snapshot and renames it over the live key; users synced
+meanwhile are recorded for it and re-copied after the rename, so no
+update is lost. Any Redis failure falls back to the table.
+"""
+import logging
+import time
+import uuid
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from redis.exceptions import RedisError
+
+from drf_backend.redis import get_redis
+
+from .models import ContributorScore
+
+logger = logging.getLogger(__name__)
+
+LEADERBOARD_KEY = "leaderboard:activity"
+REBUILD_LOCK_KEY = "leaderboard:rebuilding"
+# Sorted set of the running rebuilds' pending keys, scored by deadline.
+REBUILDS_KEY = "leaderboard:rebuilds"
+REBUILD_CHUNK_SIZE = 5000
+# Seconds before a crashed rebuild's staging and pending keys expire.
+REBUILD_TIMEOUT = 600
+# Passes re-copying users synced during a rebuild before giving up.
+REBUILD_CATCH_UP_PASSES = 10
+
+# Recount every component from the source tables (sync_leaderboard --recount).
+RECOUNT_SQL = """
+    UPDATE projects_contributorscore s SET
+        projects_created = (SELECT COUNT(*) FROM projects_project p WHERE p.user_id = s.user_id),
+        issues_collaborated = (SELECT COUNT(*) FROM projects_collaborator col WHERE col.user_id = s.user_id),
+        comments_made = (SELECT COUNT(*) FROM interactions_comment c WHERE c.user_id = s.user_id)
+"""
+
+MISSING_ROWS_SQL = """
+    INSERT INTO projects_contributorscore (user_id, projects_created, issues_collaborated, comments_made)
+    SELECT user_id, 0, 0, 0 FROM accounts_user
+    ON CONFLICT (user_id) DO NOTHING
+"""
+
+
+# Record the users in every running rebuild's pending set (ARGV[1] is the
+# current time, so expired rebuilds are dropped; ARGV[2] is a pending set
+# to leave out), then apply the ZADD/ZREM pairs only while the mirror
+# exists: writing into a missing key would create a partial set that
+# reads then trust. A missing key is rebuilt from the table instead.
+SYNC_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+local rebuilds = redis.call('ZRANGE', KEYS[2], 0, -1, 'WITHSCORES')
+for r = 1, #rebuilds, 2 do
+    local pending = rebuilds[r]
+    if pending ~= ARGV[2] then
+        for i = 3, #ARGV, 2 do
+            redis.call('SADD', pending, ARGV[i])
+        end
+        redis.call('EXPIREAT', pending, math.ceil(tonumber(rebuilds[r + 1])))
+    end
+end
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+for i = 3, #ARGV, 2 do
+    if ARGV[i + 1] == '' then
+        redis.call('ZREM', KEYS[1], ARGV[i])
+    else
+        redis.call('ZADD', KEYS[1], ARGV[i + 1], ARGV[i])
+    end
+end
+return 1
+"""
+
+
+def member(user_id):
+    return f"{user_id:010d}"
+
+
+# ── Writes ─────────────────────────────────────────────────────────────────
+
+
+def schedule_sync(user_ids):
+    """Copy these users' scores into the mirror once the transaction commits."""
+    user_ids = set(user_ids)
+    if user_ids and get_redis() is not None:
+        transaction.on_commit(lambda: sync_scores(user_ids))
+
+
+def sync_scores(user_ids, skip_pending=""):
+    client = get_redis()
+    if client is None:
+        return
+    scores = dict(
+        ContributorScore.objects.filter(user_id__in=user_ids).values_list("user_id", "activity_score")
+    )
+    args = [time.time(), skip_pending]
+    for user_id in user_ids:
+        args += [member(user_id), scores.get(user_id, "")]
+    try:
+        client.eval(SYNC_SCRIPT, 2, LEADERBOARD_KEY, REBUILDS_KEY, *args)
+    except RedisError:
+        logger.warning("Leaderboard mirror update failed", exc_info=True)
+
+
+def rebuild_mirror():
+    """
+    Rebuild the sorted set from the table and swap it in atomically.
+
+    The rebuild registers a pending set before reading the table, so every
+    sync that commits after the snapshot is recorded there, including those
+    skipped while the key is missing or overwritten by the rename. Those
+    users are re-copied from the table after the rename, until a pass finds
+    none left.
+    """
+    client = get_redis()
+    if client is None:
+        return 0
+    rebuild_id = uuid.uuid4().hex
+    staging = f"{LEADERBOARD_KEY}:staging:{rebuild_id}"
+    pending = f"{LEADERBOARD_KEY}:pending:{rebuild_id}"
+    client.zadd(REBUILDS_KEY, {pending: time.time() + REBUILD_TIMEOUT})
+    try:
+        total = 0
+        rows = ContributorScore.objects.values_list("user_id", "activity_score").order_by()
+        batch = {}
+        for user_id, score in rows.iterator(chunk_size=REBUILD_CHUNK_SIZE):
+            batch[member(user_id)] = score
+            if len(batch) >= REBUILD_CHUNK_SIZE:
+                _stage(client, staging, batch)
+                total += len(batch)
+                batch = {}
+        if batch:
+            _stage(client, staging, batch)
+            total += len(batch)
+        if total:
+            client.rename(staging, LEADERBOARD_KEY)
+        else:
+            client.delete(LEADERBOARD_KEY)
+        _catch_up(client, pending)
+    finally:
+        client.zrem(REBUILDS_KEY, pending)
+        client.delete(staging, pending)
+    return total
+
+
+def _stage(client, staging, batch):
+    pipe = client.pipeline()
+    pipe.zadd(staging, batch)
+    pipe.expire(staging, REBUILD_TIMEOUT)
+    pipe.execute()
+
+
+def _catch_up(client, pending):
+    # A sync racing a pass records its users again, so repeat until a
+    # pass starts with nothing pending.
+    for _ in range(REBUILD_CATCH_UP_PASSES):
+        pipe = client.pipeline()
+        pipe.smembers(pending)
+        pipe.delete(pending)
+        user_ids, _ = pipe.execute()
+        if not user_ids:
+            return
+        sync_scores({int(user_id) for user_id in user_ids}, skip_pending=pending)
+    logger.warning("Leaderboard rebuild still had pending users after %d passes", REBUILD_CATCH_UP_PASSES)
+
+
+@transaction.atomic
+def recount_scores():
+    """Recompute every component from the source tables (repairs drift)."""
+    with connection.cursor() as cursor:
+        cursor.execute(MISSING_ROWS_SQL)
+        cursor.execute(RECOUNT_SQL)
+        return cursor.rowcount
+
+
+# ── Reads ──────────────────────────────────────────────────────────────────
+
+
+def _mirror():
+    """The Redis client when the mirror can serve reads, else None."""
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        if client.exists(LEADERBOARD_KEY):
+            return client
+        # Lost (flush, eviction, first boot): one caller rebuilds it, the
+        # rest read from the table meanwhile.
+        if cache.add(REBUILD_LOCK_KEY, 1, timeout=60):
+            try:
+                rebuild_mirror()
+            finally:
+                cache.delete(REBUILD_LOCK_KEY)
+    except RedisError:
+        logger.warning("Leaderboard mirror unavailable", exc_info=True)
+    return None
+
+
+def get_page(offset, limit):
+    """
+    ``(entries, has_more)`` for positions ``offset``..``offset+limit-1``
+    where entries are ``(user_id, activity_score, rank)``.
+    """
+    client = _mirror()
+    if client is not None:
+        try:
+            return _get_page_redis(client, offset, limit)
+        except RedisError:
+            logger.warning("Leaderboard mirror read failed", exc_info=True)
+    return _get_page_sql(offset, limit)
+
+
+def get_position(user_id):
+    """0-based position of ``user_id`` in leaderboard order, or None."""
+    client = _mirror()
+    if client is not None:
+        try:
+            return client.zrevrank(LEADERBOARD_KEY, member(user_id))
+        except RedisError:
+            logger.warning("Leaderboard mirror read failed", exc_info=True)
+    try:
+        mine = ContributorScore.objects.get(user_id=user_id).activity_score
+    except ContributorScore.DoesNotExist:
+        return None
+    return ContributorScore.objects.filter(
+        activity_score__gt=mine
+    ).count() + ContributorScore.objects.filter(activity_score=mine, user_id__gt=user_id).count()
+
+
+def _get_page_redis(client, offset, limit):
+    rows = client.zrevrange(LEADERBOARD_KEY, offset, offset + limit, withscores=True)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if not rows:
+        return [], False
+    first_rank = client.zcount(LEADERBOARD_KEY, f"({rows[0][1]}", "+inf") + 1
+    entries = [(int(m), int(score)) for m, score in rows]
+    return _with_ranks(entries, offset, first_rank), has_more
+
+
+def _get_page_sql(offset, limit):
+    rows = list(
+        ContributorScore.objects.order_by("-activity_score", "-user_id")
+        .values_list("user_id", "activity_score")[offset : offset + limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if not rows:
+        return [], False
+    first_rank = ContributorScore.objects.filter(activity_score__gt=rows[0][1]).count() + 1
+    return _with_ranks(rows, offset, first_rank), has_more
+
+
+def _with_ranks(rows, offset, first_rank):
+    # RANK(): a row's rank is the position of the first row with its score.
+    entries = []
+    rank = first_rank
+    for i, (user_id, score) in enumerate(rows):
+        if i and score != rows[i - 1][1]:
+            rank = offset + i + 1
+        entries.append((user_id, score, rank))
+    return entries
@@ -0,0 +1,158 @@
+import http.client
+import os
+import random
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Start gunicorn in WSGI (sync workers) and ASGI (uvicorn workers) mode "
+        "with the same worker count and drive both with concurrent clients "
+        "mixing a slow aggregate endpoint (user-stats/) and a fast one "
+        "(top-contributors/). Reports throughput and latency per endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=2, help="Gunicorn workers per mode.")
+        parser.add_argument("--clients", type=int, default=32, help="Concurrent client threads.")
+        parser.add_argument("--duration", type=float, default=15.0, help="Seconds of load per mode.")
+        parser.add_argument("--slow-ratio", type=float, default=0.25, help="Share of requests to user-stats/.")
+        parser.add_argument("--user", type=int, help="user_id to authenticate as and fetch stats for (default: the user with the most projects).")
+        parser.add_argument("--modes", nargs="+", default=["wsgi", "asgi"], choices=["wsgi", "asgi"])
+
+    def handle(self, *args, **options):
+        user = self.get_user(options["user"])
+        token = str(AccessToken.for_user(user))
+        paths = {
+            "slow": f"/api/projects/user-stats/{user.pk}/",
+            "fast": "/api/projects/top-contributors/?limit=10",
+        }
+        self.stdout.write(
+            f"{options['workers']} worker(s), {options['clients']} clients, "
+            f"{options['duration']:.0f}s per mode, {options['slow_ratio']:.0%} slow requests"
+        )
+        for mode in options["modes"]:
+            port = self.free_port()
+            server = self.start_server(mode, port, options["workers"])
+            try:
+                results, elapsed = self.load(port, token, paths, options)
+            finally:
+                server.send_signal(signal.SIGTERM)
+                server.wait(timeout=30)
+            self.report(mode, results, elapsed)
+
+    def get_user(self, user_id):
+        users = User.objects.filter(is_active=True)
+        if user_id:
+            user = users.filter(pk=user_id).first()
+        else:
+            from django.db.models import Count
+
+            user = users.annotate(n=Count("projects")).order_by("-n", "user_id").first()
+        if user is None:
+            raise CommandError("No active user to benchmark with.")
+        return user
+
+    @staticmethod
+    def free_port():
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
+
+    def start_server(self, mode, port, workers):
+        env = {
+            **os.environ,
+            "SERVER_MODE": mode,
+            "WEB_CONCURRENCY": str(workers),
+            "GUNICORN_BIND": f"127.0.0.1:{port}",
+            # Measure the server, not the rate limiter.
+            "THROTTLE_USER_RATE": "1000000/minute",
+        }
+        server = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--log-level", "warning"],
+            cwd=settings.BASE_DIR,
+            env=env,
+        )
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            try:
+                with socket.create_connection(("127.0.0.1", port), timeout=1):
+                    return server
+            except OSError:
+                if server.poll() is not None:
+                    raise CommandError(f"gunicorn ({mode}) exited with {server.returncode}.")
+                time.sleep(0.2)
+        server.kill()
+        raise CommandError(f"gunicorn ({mode}) did not start listening.")
+
+    def load(self, port, token, paths, options):
+        headers = {"Authorization": f"Bearer {token}"}
+        results = {"slow": [], "fast": [], "errors": []}
+        lock = threading.Lock()
+        # Warm up every worker (imports, skill-match index, connections).
+        for _ in range(options["workers"] * 2):
+            for path in paths.values():
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+                conn.request("GET", path, headers=headers)
+                conn.getresponse().read()
+                conn.close()
+
+        stop_at = time.monotonic() + options["duration"]
+
+        def client(seed):
+            rng = random.Random(seed)
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+            mine = {"slow": [], "fast": [], "errors": []}
+            while time.monotonic() < stop_at:
+                kind = "slow" if rng.random() < options["slow_ratio"] else "fast"
+                started = time.perf_counter()
+                try:
+                    conn.request("GET", paths[kind], headers=headers)
+                    response = conn.getresponse()
+                    response.read()
+                    ok = response.status == 200
+                except (OSError, http.client.HTTPException):
+                    conn.close()
+                    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+                    ok = False
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                mine[kind if ok else "errors"].append(elapsed_ms)
+            conn.close()
+            with lock:
+                for key, values in mine.items():
+                    results[key].extend(values)
+
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(options["clients"])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results, time.perf_counter() - started
+
+    def report(self, mode, results, elapsed):
+        total = len(results["slow"]) + len(results["fast"])
+        self.stdout.write(
+            self.style.SUCCESS(f"{mode}: {total / elapsed:.0f} req/s, {len(results['errors'])} errors")
+        )
+        for kind in ("slow", "fast"):
+            timings = sorted(results[kind])
+            if not timings:
+                continue
+            p95 = timings[max(int(len(timings) * 0.95) - 1, 0)]
+            self.stdout.write(
+                f"  {kind}: {len(timings):6d} req, p50 {statistics.median(timings):7.1f} ms, "
+                f"p95 {p95:7.1f} ms"
+            )
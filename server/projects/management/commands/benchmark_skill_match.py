@@ -0,0 +1,103 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from projects import matching
+from projects.recommendations import get_recommended_projects
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare skill-match recommendations from the SQL tag-overlap query "
+        "and the in-process TF-IDF engine (latency and top-k overlap). "
+        "Synthetic users and skills are created in a transaction that is "
+        "rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=200, help="Synthetic users to query for.")
+        parser.add_argument("--skills", type=int, default=4, help="Skills per synthetic user.")
+        parser.add_argument("--limit", type=int, default=20, help="Recommendations per query (k).")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        with transaction.atomic():
+            user_ids = self.create_users(rng, options["users"], options["skills"])
+
+            started = time.perf_counter()
+            matching.reset_index()
+            index = matching.get_index()
+            build_ms = (time.perf_counter() - started) * 1000
+            self.stdout.write(
+                f"Index: {len(index.project_ids)} projects x {len(index.vocabulary)} tags, "
+                f"{index.matrix.nnz} entries, built in {build_ms:.0f} ms"
+            )
+
+            results = {}
+            for engine in ("sql", "vector"):
+                timings, picked = [], []
+                for user_id in user_ids:
+                    started = time.perf_counter()
+                    projects, _ = get_recommended_projects(
+                        "skill-match", user_id, options["limit"], engine=engine
+                    )
+                    timings.append((time.perf_counter() - started) * 1000)
+                    picked.append({p["project_id"] for p in projects})
+                results[engine] = picked
+                self.report(engine, timings)
+
+            overlaps = [
+                len(a & b) / len(a | b)
+                for a, b in zip(results["sql"], results["vector"])
+                if a or b
+            ]
+            if overlaps:
+                self.stdout.write(f"Top-k overlap (Jaccard): mean {statistics.mean(overlaps):.2f}")
+
+            transaction.set_rollback(True)
+        matching.reset_index()
+
+    def create_users(self, rng, count, skills_per_user):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT LOWER(tag), COUNT(*) FROM projects_tag GROUP BY 1")
+            vocabulary = cursor.fetchall()
+            if not vocabulary:
+                raise CommandError("projects_tag is empty; nothing to match against.")
+            tags = [tag for tag, _ in vocabulary]
+            # Popular tags are picked more often, like real skill lists.
+            weights = [df for _, df in vocabulary]
+
+            cursor.execute(
+                """
+                INSERT INTO accounts_user (
+                    password, nu_email, full_name, bio, avatar_url,
+                    is_github_connected, is_email_verified, is_active, is_staff, is_superuser,
+                    created_at, updated_at
+                )
+                SELECT '!', 'bench-' || g || '-' || md5(random()::text) || '@nu.edu.pk', 'Bench ' || g,
+                    '', '', FALSE, TRUE, TRUE, FALSE, FALSE, now(), now()
+                FROM generate_series(1, %s) g
+                RETURNING user_id
+                """,
+                [count],
+            )
+            user_ids = [row[0] for row in cursor.fetchall()]
+
+            rows = []
+            for user_id in user_ids:
+                for skill in set(rng.choices(tags, weights=weights, k=skills_per_user)):
+                    rows.append((user_id, skill))
+            cursor.executemany("INSERT INTO accounts_skill (user_id, skill) VALUES (%s, %s)", rows)
+        return user_ids
+
+    def report(self, engine, timings):
+        timings = sorted(timings)
+        p95 = timings[int(len(timings) * 0.95) - 1] if len(timings) >= 20 else timings[-1]
+        self.stdout.write(
+            f"{engine:>6}: mean {statistics.mean(timings):.2f} ms, "
+            f"p50 {statistics.median(timings):.2f} ms, p95 {p95:.2f} ms"
+        )
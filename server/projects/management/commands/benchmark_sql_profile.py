@@ -0,0 +1,85 @@
+import logging
+import os
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import resolve, reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+
+ENDPOINTS = [
+    ("user-profile", {}),
+    ("project-list-all", {"page_size": 20}),
+    ("top-contributors", {"limit": 10}),
+    ("recent-activity", {}),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Latency of a few endpoints through the full middleware stack with "
+        "SQL profiling off (SQL_PROFILE_SAMPLE_RATE=0) and on for every "
+        "request (1), including the serializer timing, the Server-Timing "
+        "header and the log line."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, help="user_id to authenticate as (default: first active user).")
+        parser.add_argument("--requests", type=int, default=300, help="Requests per endpoint and mode.")
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(is_active=True).order_by("user_id")
+        if options["user"]:
+            users = users.filter(user_id=options["user"])
+        user = users.first()
+        if user is None:
+            raise CommandError("No active user to authenticate as.")
+
+        client = Client(HTTP_HOST="localhost", HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        # Keep formatting and writing the log lines in the measurement, but
+        # not on the terminal.
+        profile_logger = logging.getLogger("drf_backend.instrumentation")
+        handlers, level = profile_logger.handlers, profile_logger.level
+        devnull = open(os.devnull, "w")
+        profile_logger.handlers = [logging.StreamHandler(devnull)]
+        profile_logger.setLevel(logging.INFO)
+
+        self.stdout.write(f"{'endpoint':<20} {'off ms':>8} {'on ms':>8} {'overhead':>9}")
+        try:
+            for name, params in ENDPOINTS:
+                path = reverse(name)
+                view = resolve(path).func
+                throttles = view.cls.throttle_classes
+                # The user rate limit would cut the run short.
+                view.cls.throttle_classes = []
+                try:
+                    off, on = self.measure(client, path, params, options["requests"])
+                finally:
+                    view.cls.throttle_classes = throttles
+                self.stdout.write(
+                    f"{name:<20} {off:>8.3f} {on:>8.3f} {(on - off) / off:>+9.1%}"
+                )
+        finally:
+            profile_logger.handlers = handlers
+            profile_logger.setLevel(level)
+            devnull.close()
+
+    @staticmethod
+    def measure(client, path, params, count, round_size=20):
+        """Median ms with profiling off and on, alternating short rounds so drift hits both."""
+        timings = {0: [], 1: []}
+        client.get(path, params)  # warm-up (caches, connection)
+        for _ in range(max(count // round_size, 1)):
+            for rate in timings:
+                with override_settings(SQL_PROFILE_SAMPLE_RATE=rate, SQL_PROFILE_EXPOSE_HEADER=True):
+                    for _ in range(round_size):
+                        started = time.perf_counter()
+                        response = client.get(path, params)
+                        timings[rate].append((time.perf_counter() - started) * 1000)
+                        if response.status_code != 200:
+                            raise CommandError(f"{path} returned {response.status_code}.")
+        return statistics.median(timings[0]), statistics.median(timings[1])
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+
+from projects.counters import COUNTER_COLUMNS, find_counter_drift, repair_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the denormalized engagement counters on projects_project "
+        "with a recount, and optionally repair any drift."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--repair",
+            action="store_true",
+            help="Overwrite drifting counters with the recounted values.",
+        )
+        parser.add_argument(
+            "--project",
+            type=int,
+            action="append",
+            dest="project_ids",
+            help="Only check this project id (repeatable).",
+        )
+
+    def handle(self, *args, **options):
+        drift = find_counter_drift(options["project_ids"])
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("All project counters are consistent."))
+            return
+
+        for entry in drift:
+            details = ", ".join(
+                f"{column} stored={entry[column][0]} actual={entry[column][1]}"
+                for column in COUNTER_COLUMNS
+                if column in entry
+            )
+            self.stdout.write(f"project {entry['project_id']}: {details}")
+
+        if options["repair"]:
+            repair_counters(drift)
+            self.stdout.write(self.style.SUCCESS(f"Repaired {len(drift)} project(s)."))
+        else:
+            self.stdout.write(
+                self.style.WARNING(f"{len(drift)} project(s) drifted; rerun with --repair to fix.")
+            )
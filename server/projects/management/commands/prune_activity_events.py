@@ -0,0 +1,48 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+# Each batch walks the (created_at DESC, id DESC) index from the cutoff
+# down, so a prune never holds locks on the whole table.
+PRUNE_SQL = """
+    DELETE FROM projects_activityevent
+    WHERE id IN (
+        SELECT id FROM projects_activityevent
+        WHERE created_at < %s
+        ORDER BY created_at DESC, id DESC
+        LIMIT %s
+    )
+"""
+
+
+class Command(BaseCommand):
+    help = "Delete activity feed events older than the retention window, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.ACTIVITY_RETENTION_DAYS,
+            help="Keep events from the last N days (default: ACTIVITY_RETENTION_DAYS).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Rows deleted per statement.",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        total = 0
+        while True:
+            with connection.cursor() as cursor:
+                cursor.execute(PRUNE_SQL, [cutoff, options["batch_size"]])
+                deleted = cursor.rowcount
+            total += deleted
+            if deleted < options["batch_size"]:
+                break
+        self.stdout.write(self.style.SUCCESS(f"Pruned {total} activity event(s) older than {cutoff:%Y-%m-%d}."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from projects.affinity import rebuild_graph
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute projects_useraffinity from collaborators and likes "
+        "(repairs edges missed by concurrent writes)."
+    )
+
+    def handle(self, *args, **options):
+        edges = rebuild_graph()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {edges} affinity edge(s)."))
@@ -0,0 +1,99 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from accounts.tokens import flush_outstanding
+from projects import trending
+from projects.matviews import MATERIALIZED_VIEWS, refresh_materialized_views
+
+
+class Command(BaseCommand):
+    help = (
+        "Refresh the project materialized views (REFRESH MATERIALIZED VIEW "
+        "CONCURRENTLY). Runs once, or forever with --loop, which also "
+        "renormalizes the trending scores every TRENDING_RENORMALIZE_INTERVAL "
+        "and inserts the OutstandingToken rows queued in Redis every "
+        "JWT_OUTSTANDING_FLUSH_INTERVAL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running and refresh every --interval seconds.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=settings.MATERIALIZED_VIEW_REFRESH_INTERVAL,
+            help="Seconds between refreshes in --loop mode "
+            "(default: MATERIALIZED_VIEW_REFRESH_INTERVAL).",
+        )
+        parser.add_argument(
+            "--blocking",
+            action="store_true",
+            help="Use a plain (locking) refresh instead of CONCURRENTLY.",
+        )
+        parser.add_argument(
+            "--view",
+            action="append",
+            choices=MATERIALIZED_VIEWS,
+            help="Refresh only this view (repeatable).",
+        )
+
+    def handle(self, *args, **options):
+        self.refresh_once(options)
+        if not options["loop"]:
+            return
+        interval = max(options["interval"], 1)
+        # Wake often enough to flush queued tokens on time; the views are
+        # still refreshed every `interval` seconds.
+        tick = min(interval, max(settings.JWT_OUTSTANDING_FLUSH_INTERVAL, 1))
+        next_refresh = time.monotonic() + interval
+        self.renormalize_trending()
+        while True:
+            time.sleep(tick)
+            # Long-running process: drop the connection if it went stale
+            # while sleeping instead of failing the next refresh.
+            close_old_connections()
+            self.flush_outstanding_tokens()
+            if time.monotonic() >= next_refresh:
+                next_refresh = time.monotonic() + interval
+                self.refresh_once(options)
+                self.renormalize_trending()
+
+    def refresh_once(self, options):
+        try:
+            durations = refresh_materialized_views(
+                concurrently=not options["blocking"],
+                views=options["view"],
+            )
+        except Exception as exc:
+            if not options["loop"]:
+                raise
+            # Keep the scheduler alive; the next tick retries.
+            self.stderr.write(self.style.ERROR(f"Refresh failed: {exc}"))
+            return
+
+        summary = ", ".join(f"{name} {ms}ms" for name, ms in durations.items())
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {summary}"))
+
+    def flush_outstanding_tokens(self):
+        # Issuance flushes only when another token is issued; without this
+        # a quiet period would leave rows in Redis indefinitely.
+        flushed = flush_outstanding()
+        if flushed:
+            self.stdout.write(f"Inserted {flushed} queued outstanding token(s).")
+
+    def renormalize_trending(self):
+        try:
+            if not trending.is_due():
+                return
+            rows, recounted = trending.renormalize()
+        except Exception as exc:
+            self.stderr.write(self.style.ERROR(f"Trending renormalize failed: {exc}"))
+            return
+        action = "Recounted" if recounted else "Renormalized"
+        self.stdout.write(self.style.SUCCESS(f"{action} trending scores ({rows} projects)"))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from projects.trending import renormalize
+
+
+class Command(BaseCommand):
+    help = (
+        "Move the trending-score epoch to now, rescaling every stored "
+        "Project.trending_score (the scheduler does this periodically)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--recount",
+            action="store_true",
+            help="Recompute the scores from likes and comments instead of rescaling.",
+        )
+
+    def handle(self, *args, **options):
+        rows, recounted = renormalize(recount=options["recount"])
+        action = "Recounted" if recounted else "Renormalized"
+        self.stdout.write(self.style.SUCCESS(f"{action} trending scores ({rows} projects)."))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from drf_backend.redis import get_redis
+from projects.leaderboard import rebuild_mirror, recount_scores
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the Redis mirror of the contributor leaderboard from "
+        "projects_contributorscore, optionally recounting the table first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--recount",
+            action="store_true",
+            help="Recompute every user's components from the source tables before mirroring.",
+        )
+
+    def handle(self, *args, **options):
+        if options["recount"]:
+            rows = recount_scores()
+            self.stdout.write(f"Recounted {rows} contributor score(s).")
+
+        if get_redis() is None:
+            self.stdout.write(self.style.WARNING("REDIS_URL is not set; nothing to mirror."))
+            return
+
+        total = rebuild_mirror()
+        self.stdout.write(self.style.SUCCESS(f"Mirrored {total} contributor score(s) to Redis."))
@@ -0,0 +1,221 @@
+"""
+In-process skill-to-tag matching for the skill-match recommendation mode.
+
+Each process keeps a sparse project x tag matrix (CSR) of TF-IDF weights:
+
+* a tag's weight is its smoothed inverse document frequency,
+  ``idf = ln((1 + N) / (1 + df)) + 1``, so rare tags count for more than
+  ubiquitous ones;
+* rows are L2-normalised, so a project does not win just by listing many
+  tags.
+
+A user's skills become a binary query vector over the same vocabulary and
+``matrix @ query`` scores every project in one sparse product; top-k is an
+``argpartition`` over the non-zero scores.
+
+Once the matrix is older than SKILL_MATCH_REFRESH_INTERVAL, a background
+thread checks whether projects_tag changed since the last build (row
+count + MAX(id): deletes lower one, inserts raise the other) and, if so,
+builds a new matrix and swaps it in. Requests keep using the old one in
+the meantime and never wait on a rebuild; only the first request of a
+process (no matrix yet) builds inline. The matrix lives in each worker's
+memory, so each worker refreshes its own; the scheduler cannot do it for
+them.
+``manage.py benchmark_skill_match`` compares this with the SQL path.
+"""
+import logging
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+from django.db import connection
+from scipy import sparse
+
+from drf_backend.db_routing import read_connection
+
+logger = logging.getLogger(__name__)
+
+TAGS_SQL = """
+    SELECT t.project_id, p.user_id, LOWER(t.tag)
+    FROM projects_tag t
+    JOIN projects_project p ON p.project_id = t.project_id
+"""
+
+SIGNATURE_SQL = "SELECT COUNT(*), MAX(id) FROM projects_tag"
+
+
+class SkillMatchIndex:
+    def __init__(self, project_ids, owner_ids, vocabulary, matrix, idf, signature):
+        self.project_ids = project_ids
+        self.owner_ids = owner_ids
+        self.vocabulary = vocabulary
+        self.matrix = matrix
+        self.idf = idf
+        self.signature = signature
+        self.checked_at = time.monotonic()
+
+    @classmethod
+    def build(cls):
+        with connection.cursor() as cursor:
+            cursor.execute(SIGNATURE_SQL)
+            signature = cursor.fetchone()
+            cursor.execute(TAGS_SQL)
+            rows = cursor.fetchall()
+
+        if not rows:
+            return cls(
+                np.empty(0, dtype=np.int64),
+                np.empty(0, dtype=np.int64),
+                {},
+                sparse.csr_matrix((0, 0), dtype=np.float32),
+                np.empty(0, dtype=np.float32),
+                signature,
+            )
+
+        project_col, owner_col, tag_col = zip(*rows)
+        project_ids, row_index = np.unique(np.array(project_col, dtype=np.int64), return_inverse=True)
+        tags, col_index = np.unique(np.array(tag_col, dtype=object), return_inverse=True)
+
+        owner_ids = np.empty(len(project_ids), dtype=np.int64)
+        owner_ids[row_index] = owner_col
+
+        # Binary occurrence matrix; duplicates (tags differing only in
+        # case) collapse to 1.
+        occurrence = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (row_index, col_index)),
+            shape=(len(project_ids), len(tags)),
+        )
+        occurrence.data[:] = 1.0
+
+        df = np.diff(occurrence.tocsc().indptr)
+        idf = (np.log((1.0 + len(project_ids)) / (1.0 + df)) + 1.0).astype(np.float32)
+
+        matrix = occurrence.multiply(idf).tocsr()
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        matrix = sparse.diags(1.0 / norms).dot(matrix).tocsr().astype(np.float32)
+
+        vocabulary = {tag: i for i, tag in enumerate(tags)}
+        return cls(project_ids, owner_ids, vocabulary, matrix, idf, signature)
+
+    def top_k(self, skills, k, exclude_owner=None):
+        """
+        ``[(project_id, score, matched_tags)]`` for the ``k`` best projects,
+        best first (ties broken by project id descending).
+        """
+        columns = sorted({self.vocabulary[s] for s in skills if s in self.vocabulary})
+        if not columns or k <= 0:
+            return []
+
+        query = np.zeros(len(self.vocabulary), dtype=np.float32)
+        query[columns] = self.idf[columns]
+        query /= np.linalg.norm(query)
+
+        scores = self.matrix @ query
+        if exclude_owner is not None:
+            scores[self.owner_ids == exclude_owner] = 0.0
+
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > k:
+            cutoff = -np.partition(-scores[candidates], k - 1)[k - 1]
+            candidates = candidates[scores[candidates] >= cutoff]
+        order = np.lexsort((-self.project_ids[candidates], -scores[candidates]))[:k]
+        picked = candidates[order]
+
+        matched = self.matrix[picked][:, columns].getnnz(axis=1)
+        return [
+            (int(self.project_ids[i]), round(float(scores[i]), 4), int(n))
+            for i, n in zip(picked, matched)
+        ]
+
+
+_index = None
+# Held while building, so a cold start and a refresh never build twice.
+_build_lock = threading.Lock()
+# Guards _refreshing: at most one background refresh per process.
+_lock = threading.Lock()
+_refreshing = False
+
+
+def _build():
+    global _index
+    started = time.perf_counter()
+    _index = SkillMatchIndex.build()
+    logger.info(
+        "Built skill-match index: %d projects x %d tags in %.0f ms",
+        len(_index.project_ids),
+        len(_index.vocabulary),
+        (time.perf_counter() - started) * 1000,
+    )
+    return _index
+
+
+def get_index():
+    """
+    The process's index. Built inline only when there is none yet; a stale
+    one is returned as is while a background refresh runs.
+    """
+    global _refreshing
+    index = _index
+    if index is None:
+        with _build_lock:
+            return _index or _build()
+
+    if time.monotonic() - index.checked_at >= settings.SKILL_MATCH_REFRESH_INTERVAL:
+        with _lock:
+            start, _refreshing = not _refreshing, True
+        if start:
+            threading.Thread(target=_refresh_in_background, name="skill-match-refresh", daemon=True).start()
+    return index
+
+
+def refresh_index():
+    """Rebuild the index if the tags changed since it was built; returns the current index."""
+    with _build_lock:
+        index = _index
+        if index is not None:
+            with connection.cursor() as cursor:
+                cursor.execute(SIGNATURE_SQL)
+                if cursor.fetchone() == index.signature:
+                    index.checked_at = time.monotonic()
+                    return index
+        return _build()
+
+
+def _refresh_in_background():
+    global _refreshing
+    index = _index
+    try:
+        refresh_index()
+    except Exception:
+        logger.exception("Skill-match index refresh failed")
+        # Keep serving the old index; retry after another interval.
+        if index is not None:
+            index.checked_at = time.monotonic()
+    finally:
+        with _lock:
+            _refreshing = False
+        # This thread's own connection (returned to the pool, if any).
+        connection.close()
+
+
+def reset_index():
+    global _index, _refreshing
+    _index = None
+    with _lock:
+        _refreshing = False
+
+
+def get_user_skills(user_id):
+    with read_connection().cursor() as cursor:
+        cursor.execute("SELECT DISTINCT LOWER(skill) FROM accounts_skill WHERE user_id = %s", [user_id])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def match_projects(user_id, k, exclude_own=True):
+    """Top-k ``(project_id, score, matched_tags)`` for the user's skills."""
+    skills = get_user_skills(user_id)
+    if not skills:
+        return None
+    return get_index().top_k(skills, k, exclude_owner=user_id if exclude_own else None)
@@ -0,0 +1,53 @@
+import time
+
+from django.db import connection
+from django.utils import timezone
+
+from .cache import invalidate_global_recommendations
+from .models import MaterializedViewRefresh
+
+# Refresh order matters: needing-help is built from project_summary_view.
+# (trending_projects_view is a plain view over the stored trending_score.)
+MATERIALIZED_VIEWS = [
+    "project_summary_view",
+    "projects_needing_help_view",
+]
+
+
+def refresh_materialized_views(concurrently=True, views=None):
+    """
+    Refresh the project materialized views in dependency order.
+
+    CONCURRENTLY keeps the views readable while they are rebuilt (it relies
+    on the unique project_id index each view has). Returns a dict of
+    ``view_name -> duration in ms``.
+    """
+    keyword = "CONCURRENTLY " if concurrently else ""
+    durations = {}
+    for view_name in views or MATERIALIZED_VIEWS:
+        started = time.monotonic()
+        with connection.cursor() as cursor:
+            cursor.execute(f"REFRESH MATERIALIZED VIEW {keyword}{view_name}")
+        duration_ms = int((time.monotonic() - started) * 1000)
+
+        MaterializedViewRefresh.objects.update_or_create(
+            view_name=view_name,
+            defaults={"refreshed_at": timezone.now(), "duration_ms": duration_ms},
+        )
+        durations[view_name] = duration_ms
+
+    # Shared recommendation entries are snapshots of these views.
+    invalidate_global_recommendations()
+    return durations
+
+
+def get_staleness(view_name="project_summary_view"):
+    """Return ``(refreshed_at, stale_seconds)`` for a materialized view."""
+    refreshed_at = (
+        MaterializedViewRefresh.objects.filter(view_name=view_name)
+        .values_list("refreshed_at", flat=True)
+        .first()
+    )
+    if refreshed_at is None:
+        return None, None
+    return refreshed_at, int((timezone.now() - refreshed_at).total_seconds())
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0007_db_views'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['-created_at', '-project_id'], name='project_created_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['user', '-created_at', '-project_id'], name='project_user_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,208 @@
+from django.db import migrations, models
+
+# ============================================================
+# Replace the project summary views with materialized views.
+#
+# project_summary_view used to LEFT JOIN likes × comments × issues and
+# collapse the fan-out with COUNT(DISTINCT ...) on every read. It is now
+# materialized (and pre-aggregates each child table on its own, so a
+# refresh no longer builds the cross product). trending_projects_view and
+# projects_needing_help_view are materialized on top of it.
+#
+# Every materialized view has a UNIQUE index on project_id so it can be
+# refreshed with REFRESH MATERIALIZED VIEW CONCURRENTLY (see
+# projects.matviews and the refresh_project_views command).
+#
+# Note: days_since_update / trending_score are evaluated at refresh time.
+# ============================================================
+FORWARD_SQL = [
+    "DROP VIEW IF EXISTS projects_needing_help_view",
+    "DROP VIEW IF EXISTS trending_projects_view",
+    "DROP VIEW IF EXISTS project_summary_view",
+
+    # 1. project_summary_view — base materialized view
+    """
+    CREATE MATERIALIZED VIEW project_summary_view AS
+    SELECT
+        p.project_id,
+        p.title,
+        p.description,
+        p.github_url,
+        p.user_id AS owner_id,
+        u.full_name AS owner_full_name,
+        u.nu_email AS owner_nu_email,
+        u.avatar_url AS owner_avatar_url,
+        COALESCE(l.likes_count, 0) AS likes_count,
+        COALESCE(c.comments_count, 0) AS comments_count,
+        COALESCE(i.open_issues, 0) AS open_issues,
+        COALESCE(i.closed_issues, 0) AS closed_issues,
+        (COALESCE(l.likes_count, 0) + COALESCE(c.comments_count, 0)) AS engagement_score,
+        EXTRACT(EPOCH FROM (NOW() - p.updated_at)) / 86400.0 AS days_since_update,
+        p.created_at,
+        p.updated_at
+    FROM projects_project p
+    JOIN accounts_user u ON p.user_id = u.user_id
+    LEFT JOIN (
+        SELECT project_id, COUNT(*) AS likes_count
+        FROM interactions_like
+        GROUP BY project_id
+    ) l ON l.project_id = p.project_id
+    LEFT JOIN (
+        SELECT project_id, COUNT(*) AS comments_count
+        FROM interactions_comment
+        GROUP BY project_id
+    ) c ON c.project_id = p.project_id
+    LEFT JOIN (
+        SELECT
+            project_id,
+            COUNT(*) FILTER (WHERE status = 'open') AS open_issues,
+            COUNT(*) FILTER (WHERE status = 'closed') AS closed_issues
+        FROM projects_issue
+        GROUP BY project_id
+    ) i ON i.project_id = p.project_id
+    """,
+    "CREATE UNIQUE INDEX project_summary_view_pk ON project_summary_view (project_id)",
+    "CREATE INDEX project_summary_view_engagement_idx ON project_summary_view (engagement_score DESC)",
+    "CREATE INDEX project_summary_view_created_idx ON project_summary_view (created_at DESC)",
+
+    # 2. trending_projects_view — adds trending_score on top of project_summary_view
+    """
+    CREATE MATERIALIZED VIEW trending_projects_view AS
+    SELECT
+        project_id,
+        title,
+        description,
+        github_url,
+        owner_id,
+        owner_full_name,
+        owner_nu_email,
+        owner_avatar_url,
+        likes_count,
+        comments_count,
+        open_issues,
+        closed_issues,
+        engagement_score,
+        days_since_update,
+        created_at,
+        updated_at,
+        (engagement_score / GREATEST(days_since_update, 1.0)) AS trending_score
+    FROM project_summary_view
+    """,
+    "CREATE UNIQUE INDEX trending_projects_view_pk ON trending_projects_view (project_id)",
+    "CREATE INDEX trending_projects_view_score_idx ON trending_projects_view (trending_score DESC)",
+
+    # 3. projects_needing_help_view — projects with open issues
+    """
+    CREATE MATERIALIZED VIEW projects_needing_help_view AS
+    SELECT
+        project_id,
+        title,
+        description,
+        github_url,
+        owner_id,
+        owner_full_name,
+        owner_nu_email,
+        owner_avatar_url,
+        likes_count,
+        comments_count,
+        open_issues,
+        closed_issues,
+        engagement_score,
+        days_since_update,
+        created_at,
+        updated_at
+    FROM project_summary_view
+    WHERE open_issues > 0
+    """,
+    "CREATE UNIQUE INDEX projects_needing_help_view_pk ON projects_needing_help_view (project_id)",
+    "CREATE INDEX projects_needing_help_view_open_idx ON projects_needing_help_view (open_issues DESC)",
+]
+
+# Reverse SQL — restore the plain views from 0007_db_views
+REVERSE_SQL = [
+    "DROP MATERIALIZED VIEW IF EXISTS projects_needing_help_view",
+    "DROP MATERIALIZED VIEW IF EXISTS trending_projects_view",
+    "DROP MATERIALIZED VIEW IF EXISTS project_summary_view",
+    """
+    CREATE OR REPLACE VIEW project_summary_view AS
+    SELECT
+        p.project_id,
+        p.title,
+        p.description,
+        p.github_url,
+        p.user_id AS owner_id,
+        u.full_name AS owner_full_name,
+        u.nu_email AS owner_nu_email,
+        u.avatar_url AS owner_avatar_url,
+        COUNT(DISTINCT l.like_id) AS likes_count,
+        COUNT(DISTINCT c.comment_id) AS comments_count,
+        COUNT(DISTINCT CASE WHEN i.status = 'open' THEN i.issue_id END) AS open_issues,
+        COUNT(DISTINCT CASE WHEN i.status = 'closed' THEN i.issue_id END) AS closed_issues,
+        (COUNT(DISTINCT l.like_id) + COUNT(DISTINCT c.comment_id)) AS engagement_score,
+        EXTRACT(EPOCH FROM (NOW() - p.updated_at)) / 86400.0 AS days_since_update,
+        p.created_at,
+        p.updated_at
+    FROM projects_project p
+    JOIN accounts_user u ON p.user_id = u.user_id
+    LEFT JOIN interactions_like l ON l.project_id = p.project_id
+    LEFT JOIN interactions_comment c ON c.project_id = p.project_id
+    LEFT JOIN projects_issue i ON i.project_id = p.project_id
+    GROUP BY p.project_id, u.user_id, u.full_name, u.nu_email, u.avatar_url
+    """,
+    """
+    CREATE OR REPLACE VIEW trending_projects_view AS
+    SELECT
+        project_id, title, description, github_url,
+        owner_id, owner_full_name, owner_nu_email, owner_avatar_url,
+        likes_count, comments_count, open_issues, closed_issues,
+        engagement_score, days_since_update, created_at, updated_at,
+        (engagement_score / GREATEST(days_since_update, 1.0)) AS trending_score
+    FROM project_summary_view
+    """,
+    """
+    CREATE OR REPLACE VIEW projects_needing_help_view AS
+    SELECT
+        project_id, title, description, github_url,
+        owner_id, owner_full_name, owner_nu_email, owner_avatar_url,
+        likes_count, comments_count, open_issues, closed_issues,
+        engagement_score, days_since_update, created_at, updated_at
+    FROM project_summary_view
+    WHERE open_issues > 0
+    """,
+]
+
+# The views above are created WITH DATA, so record that as their first refresh.
+RECORD_INITIAL_REFRESH_SQL = """
+    INSERT INTO projects_materializedviewrefresh (view_name, refreshed_at, duration_ms)
+    VALUES
+        ('project_summary_view', NOW(), 0),
+        ('trending_projects_view', NOW(), 0),
+        ('projects_needing_help_view', NOW(), 0)
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0008_project_keyset_indexes"),
+        ("interactions", "0003_comment_keyset_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MaterializedViewRefresh",
+            fields=[
+                ("view_name", models.CharField(max_length=63, primary_key=True, serialize=False)),
+                ("refreshed_at", models.DateTimeField()),
+                ("duration_ms", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunSQL(
+            sql=FORWARD_SQL,
+            reverse_sql=REVERSE_SQL,
+        ),
+        migrations.RunSQL(
+            sql=RECORD_INITIAL_REFRESH_SQL,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
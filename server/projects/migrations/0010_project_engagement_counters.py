@@ -0,0 +1,274 @@
+from django.db import migrations, models
+
+# ============================================================
+# Denormalized engagement counters on projects_project.
+#
+# likes_count / comments_count / open_issues_count / closed_issues_count
+# are kept exact by row-level triggers on interactions_like,
+# interactions_comment and projects_issue (including issue status and
+# project changes). `manage.py check_project_counters` reports and repairs
+# any drift.
+# ============================================================
+TRIGGER_SQL = [
+    # 1. Likes
+    """
+    CREATE OR REPLACE FUNCTION projects_like_counter() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('DELETE', 'UPDATE') THEN
+            UPDATE projects_project SET likes_count = likes_count - 1
+            WHERE project_id = OLD.project_id;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            UPDATE projects_project SET likes_count = likes_count + 1
+            WHERE project_id = NEW.project_id;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER trg_like_counter
+    AFTER INSERT OR DELETE OR UPDATE OF project_id ON interactions_like
+    FOR EACH ROW EXECUTE FUNCTION projects_like_counter()
+    """,
+
+    # 2. Comments
+    """
+    CREATE OR REPLACE FUNCTION projects_comment_counter() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('DELETE', 'UPDATE') THEN
+            UPDATE projects_project SET comments_count = comments_count - 1
+            WHERE project_id = OLD.project_id;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            UPDATE projects_project SET comments_count = comments_count + 1
+            WHERE project_id = NEW.project_id;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER trg_comment_counter
+    AFTER INSERT OR DELETE OR UPDATE OF project_id ON interactions_comment
+    FOR EACH ROW EXECUTE FUNCTION projects_comment_counter()
+    """,
+
+    # 3. Issues — open/closed split, so status changes move one count across
+    """
+    CREATE OR REPLACE FUNCTION projects_issue_counter() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE'
+           AND OLD.status IS NOT DISTINCT FROM NEW.status
+           AND OLD.project_id = NEW.project_id THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP IN ('DELETE', 'UPDATE') THEN
+            UPDATE projects_project SET
+                open_issues_count = open_issues_count - (OLD.status = 'open')::int,
+                closed_issues_count = closed_issues_count - (OLD.status = 'closed')::int
+            WHERE project_id = OLD.project_id;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            UPDATE projects_project SET
+                open_issues_count = open_issues_count + (NEW.status = 'open')::int,
+                closed_issues_count = closed_issues_count + (NEW.status = 'closed')::int
+            WHERE project_id = NEW.project_id;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER trg_issue_counter
+    AFTER INSERT OR DELETE OR UPDATE OF status, project_id ON projects_issue
+    FOR EACH ROW EXECUTE FUNCTION projects_issue_counter()
+    """,
+]
+
+REVERSE_TRIGGER_SQL = [
+    "DROP TRIGGER IF EXISTS trg_issue_counter ON projects_issue",
+    "DROP FUNCTION IF EXISTS projects_issue_counter()",
+    "DROP TRIGGER IF EXISTS trg_comment_counter ON interactions_comment",
+    "DROP FUNCTION IF EXISTS projects_comment_counter()",
+    "DROP TRIGGER IF EXISTS trg_like_counter ON interactions_like",
+    "DROP FUNCTION IF EXISTS projects_like_counter()",
+]
+
+BACKFILL_SQL = """
+    UPDATE projects_project p SET
+        likes_count = (SELECT COUNT(*) FROM interactions_like l WHERE l.project_id = p.project_id),
+        comments_count = (SELECT COUNT(*) FROM interactions_comment c WHERE c.project_id = p.project_id),
+        open_issues_count = (
+            SELECT COUNT(*) FROM projects_issue i
+            WHERE i.project_id = p.project_id AND i.status = 'open'
+        ),
+        closed_issues_count = (
+            SELECT COUNT(*) FROM projects_issue i
+            WHERE i.project_id = p.project_id AND i.status = 'closed'
+        )
+"""
+
+# The summary views read the counter columns instead of joining and counting.
+SUMMARY_VIEWS_SQL = [
+    "DROP MATERIALIZED VIEW IF EXISTS projects_needing_help_view",
+    "DROP MATERIALIZED VIEW IF EXISTS trending_projects_view",
+    "DROP MATERIALIZED VIEW IF EXISTS project_summary_view",
+    """
+    CREATE MATERIALIZED VIEW project_summary_view AS
+    SELECT
+        p.project_id,
+        p.title,
+        p.description,
+        p.github_url,
+        p.user_id AS owner_id,
+        u.full_name AS owner_full_name,
+        u.nu_email AS owner_nu_email,
+        u.avatar_url AS owner_avatar_url,
+        p.likes_count,
+        p.comments_count,
+        p.open_issues_count AS open_issues,
+        p.closed_issues_count AS closed_issues,
+        (p.likes_count + p.comments_count) AS engagement_score,
+        EXTRACT(EPOCH FROM (NOW() - p.updated_at)) / 86400.0 AS days_since_update,
+        p.created_at,
+        p.updated_at
+    FROM projects_project p
+    JOIN accounts_user u ON p.user_id = u.user_id
+    """,
+    "CREATE UNIQUE INDEX project_summary_view_pk ON project_summary_view (project_id)",
+    "CREATE INDEX project_summary_view_engagement_idx ON project_summary_view (engagement_score DESC)",
+    "CREATE INDEX project_summary_view_created_idx ON project_summary_view (created_at DESC)",
+    """
+    CREATE MATERIALIZED VIEW trending_projects_view AS
+    SELECT
+        project_id, title, description, github_url,
+        owner_id, owner_full_name, owner_nu_email, owner_avatar_url,
+        likes_count, comments_count, open_issues, closed_issues,
+        engagement_score, days_since_update, created_at, updated_at,
+        (engagement_score / GREATEST(days_since_update, 1.0)) AS trending_score
+    FROM project_summary_view
+    """,
+    "CREATE UNIQUE INDEX trending_projects_view_pk ON trending_projects_view (project_id)",
+    "CREATE INDEX trending_projects_view_score_idx ON trending_projects_view (trending_score DESC)",
+    """
+    CREATE MATERIALIZED VIEW projects_needing_help_view AS
+    SELECT
+        project_id, title, description, github_url,
+        owner_id, owner_full_name, owner_nu_email, owner_avatar_url,
+        likes_count, comments_count, open_issues, closed_issues,
+        engagement_score, days_since_update, created_at, updated_at
+    FROM project_summary_view
+    WHERE open_issues > 0
+    """,
+    "CREATE UNIQUE INDEX projects_needing_help_view_pk ON projects_needing_help_view (project_id)",
+    "CREATE INDEX projects_needing_help_view_open_idx ON projects_needing_help_view (open_issues DESC)",
+    "UPDATE projects_materializedviewrefresh SET refreshed_at = NOW(), duration_ms = 0",
+]
+
+# Reverse — back to the join-based definitions from 0009
+REVERSE_SUMMARY_VIEWS_SQL = [
+    "DROP MATERIALIZED VIEW IF EXISTS projects_needing_help_view",
+    "DROP MATERIALIZED VIEW IF EXISTS trending_projects_view",
+    "DROP MATERIALIZED VIEW IF EXISTS project_summary_view",
+    """
+    CREATE MATERIALIZED VIEW project_summary_view AS
+    SELECT
+        p.project_id,
+        p.title,
+        p.description,
+        p.github_url,
+        p.user_id AS owner_id,
+        u.full_name AS owner_full_name,
+        u.nu_email AS owner_nu_email,
+        u.avatar_url AS owner_avatar_url,
+        COALESCE(l.likes_count, 0) AS likes_count,
+        COALESCE(c.comments_count, 0) AS comments_count,
+        COALESCE(i.open_issues, 0) AS open_issues,
+        COALESCE(i.closed_issues, 0) AS closed_issues,
+        (COALESCE(l.likes_count, 0) + COALESCE(c.comments_count, 0)) AS engagement_score,
+        EXTRACT(EPOCH FROM (NOW() - p.updated_at)) / 86400.0 AS days_since_update,
+        p.created_at,
+        p.updated_at
+    FROM projects_project p
+    JOIN accounts_user u ON p.user_id = u.user_id
+    LEFT JOIN (
+        SELECT project_id, COUNT(*) AS likes_count
+        FROM interactions_like
+        GROUP BY project_id
+    ) l ON l.project_id = p.project_id
+    LEFT JOIN (
+        SELECT project_id, COUNT(*) AS comments_count
+        FROM interactions_comment
+        GROUP BY project_id
+    ) c ON c.project_id = p.project_id
+    LEFT JOIN (
+        SELECT
+            project_id,
+            COUNT(*) FILTER (WHERE status = 'open') AS open_issues,
+            COUNT(*) FILTER (WHERE status = 'closed') AS closed_issues
+        FROM projects_issue
+        GROUP BY project_id
+    ) i ON i.project_id = p.project_id
+    """,
+    "CREATE UNIQUE INDEX project_summary_view_pk ON project_summary_view (project_id)",
+    "CREATE INDEX project_summary_view_engagement_idx ON project_summary_view (engagement_score DESC)",
+    "CREATE INDEX project_summary_view_created_idx ON project_summary_view (created_at DESC)",
+    """
+    CREATE MATERIALIZED VIEW trending_projects_view AS
+    SELECT
+        project_id, title, description, github_url,
+        owner_id, owner_full_name, owner_nu_email, owner_avatar_url,
+        likes_count, comments_count, open_issues, closed_issues,
+        engagement_score, days_since_update, created_at, updated_at,
+        (engagement_score / GREATEST(days_since_update, 1.0)) AS trending_score
+    FROM project_summary_view
+    """,
+    "CREATE UNIQUE INDEX trending_projects_view_pk ON trending_projects_view (project_id)",
+    "CREATE INDEX trending_projects_view_score_idx ON trending_projects_view (trending_score DESC)",
+    """
+    CREATE MATERIALIZED VIEW projects_needing_help_view AS
+    SELECT
+        project_id, title, description, github_url,
+        owner_id, owner_full_name, owner_nu_email, owner_avatar_url,
+        likes_count, comments_count, open_issues, closed_issues,
+        engagement_score, days_since_update, created_at, updated_at
+    FROM project_summary_view
+    WHERE open_issues > 0
+    """,
+    "CREATE UNIQUE INDEX projects_needing_help_view_pk ON projects_needing_help_view (project_id)",
+    "CREATE INDEX projects_needing_help_view_open_idx ON projects_needing_help_view (open_issues DESC)",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0009_materialized_project_views"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="project",
+            name="likes_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="comments_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="open_issues_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="closed_issues_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunSQL(sql=TRIGGER_SQL, reverse_sql=REVERSE_TRIGGER_SQL),
+        migrations.RunSQL(sql=BACKFILL_SQL, reverse_sql=migrations.RunSQL.noop),
+        migrations.RunSQL(sql=SUMMARY_VIEWS_SQL, reverse_sql=REVERSE_SUMMARY_VIEWS_SQL),
+    ]
@@ -0,0 +1,102 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:14
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+# ============================================================
+# Full-text search document for projects.
+#
+# search_vector = title (weight A, english)
+#               || tags  (weight B, simple — keep tech names unstemmed)
+#               || description (weight C, english)
+#
+# A BEFORE trigger on projects_project rebuilds it when the title or
+# description changes; an AFTER trigger on projects_tag rebuilds it for
+# the tag's project.
+# ============================================================
+FORWARD_SQL = [
+    """
+    CREATE OR REPLACE FUNCTION projects_build_search_vector(
+        p_project_id INTEGER, p_title TEXT, p_description TEXT
+    ) RETURNS tsvector AS $$
+        SELECT
+            setweight(to_tsvector('english', COALESCE(p_title, '')), 'A')
+            || setweight(to_tsvector('simple', COALESCE(
+                (SELECT string_agg(t.tag, ' ') FROM projects_tag t WHERE t.project_id = p_project_id),
+                ''
+            )), 'B')
+            || setweight(to_tsvector('english', COALESCE(p_description, '')), 'C')
+    $$ LANGUAGE sql STABLE
+    """,
+    """
+    CREATE OR REPLACE FUNCTION projects_project_search_vector() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := projects_build_search_vector(NEW.project_id, NEW.title, NEW.description);
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER trg_project_search_vector
+    BEFORE INSERT OR UPDATE OF title, description ON projects_project
+    FOR EACH ROW EXECUTE FUNCTION projects_project_search_vector()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION projects_tag_search_vector() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('DELETE', 'UPDATE') THEN
+            UPDATE projects_project
+            SET search_vector = projects_build_search_vector(project_id, title, description)
+            WHERE project_id = OLD.project_id;
+        END IF;
+        IF TG_OP = 'INSERT' OR (TG_OP = 'UPDATE' AND NEW.project_id <> OLD.project_id) THEN
+            UPDATE projects_project
+            SET search_vector = projects_build_search_vector(project_id, title, description)
+            WHERE project_id = NEW.project_id;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER trg_tag_search_vector
+    AFTER INSERT OR DELETE OR UPDATE ON projects_tag
+    FOR EACH ROW EXECUTE FUNCTION projects_tag_search_vector()
+    """,
+    # Backfill existing projects
+    """
+    UPDATE projects_project
+    SET search_vector = projects_build_search_vector(project_id, title, description)
+    """,
+]
+
+REVERSE_SQL = [
+    "DROP TRIGGER IF EXISTS trg_tag_search_vector ON projects_tag",
+    "DROP FUNCTION IF EXISTS projects_tag_search_vector()",
+    "DROP TRIGGER IF EXISTS trg_project_search_vector ON projects_project",
+    "DROP FUNCTION IF EXISTS projects_project_search_vector()",
+    "DROP FUNCTION IF EXISTS projects_build_search_vector(INTEGER, TEXT, TEXT)",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0010_project_engagement_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='project_search_gin_idx'),
+        ),
+        migrations.RunSQL(sql=FORWARD_SQL, reverse_sql=REVERSE_SQL),
+    ]
@@ -0,0 +1,83 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+# ============================================================
+# projects_project.changed_at — a version stamp for conditional GETs.
+#
+# A BEFORE trigger stamps it on every INSERT/UPDATE of the row. Likes,
+# comments, issue status and tags already update the row (counter and
+# search-vector triggers), so only issue edits and collaborator changes
+# need an extra "touch" trigger.
+# ============================================================
+FORWARD_SQL = [
+    "UPDATE projects_project SET changed_at = updated_at",
+    """
+    CREATE OR REPLACE FUNCTION projects_project_changed_at() RETURNS trigger AS $$
+    BEGIN
+        NEW.changed_at := clock_timestamp();
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER trg_project_changed_at
+    BEFORE INSERT OR UPDATE ON projects_project
+    FOR EACH ROW EXECUTE FUNCTION projects_project_changed_at()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION projects_issue_touch_project() RETURNS trigger AS $$
+    BEGIN
+        UPDATE projects_project SET changed_at = clock_timestamp()
+        WHERE project_id = NEW.project_id;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER trg_issue_touch_project
+    AFTER UPDATE OF title, description ON projects_issue
+    FOR EACH ROW EXECUTE FUNCTION projects_issue_touch_project()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION projects_collaborator_touch_project() RETURNS trigger AS $$
+    BEGIN
+        UPDATE projects_project SET changed_at = clock_timestamp()
+        WHERE project_id = (
+            SELECT project_id FROM projects_issue
+            WHERE issue_id = COALESCE(NEW.issue_id, OLD.issue_id)
+        );
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER trg_collaborator_touch_project
+    AFTER INSERT OR DELETE ON projects_collaborator
+    FOR EACH ROW EXECUTE FUNCTION projects_collaborator_touch_project()
+    """,
+]
+
+REVERSE_SQL = [
+    "DROP TRIGGER IF EXISTS trg_collaborator_touch_project ON projects_collaborator",
+    "DROP FUNCTION IF EXISTS projects_collaborator_touch_project()",
+    "DROP TRIGGER IF EXISTS trg_issue_touch_project ON projects_issue",
+    "DROP FUNCTION IF EXISTS projects_issue_touch_project()",
+    "DROP TRIGGER IF EXISTS trg_project_changed_at ON projects_project",
+    "DROP FUNCTION IF EXISTS projects_project_changed_at()",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0011_project_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="project",
+            name="changed_at",
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+        migrations.RunSQL(sql=FORWARD_SQL, reverse_sql=REVERSE_SQL),
+    ]
@@ -0,0 +1,182 @@
+import django.db.models.deletion
+import django.db.models.expressions
+from django.conf import settings
+from django.db import migrations, models
+
+# ============================================================
+# Incrementally maintained contributor leaderboard.
+#
+# projects_contributorscore holds one row per user with the activity
+# components; activity_score is a stored generated column
+# (projects*3 + collaborations*2 + comments). Row triggers adjust the
+# components as users, projects, collaborations and comments come and go,
+# replacing the full user x project x collaborator x comment join that
+# top_contributors_view ran on every read.
+#
+# Increments upsert the user's row; decrements only UPDATE, so cascading
+# deletes of a user never re-create a row for them.
+# ============================================================
+TRIGGER_SQL = [
+    """
+    CREATE OR REPLACE FUNCTION projects_bump_contributor_score(
+        p_user_id INTEGER, p_component TEXT, p_delta INTEGER
+    ) RETURNS void AS $$
+    BEGIN
+        IF p_delta > 0 THEN
+            INSERT INTO projects_contributorscore
+                (user_id, projects_created, issues_collaborated, comments_made)
+            VALUES (p_user_id, 0, 0, 0)
+            ON CONFLICT (user_id) DO NOTHING;
+        END IF;
+        EXECUTE format(
+            'UPDATE projects_contributorscore SET %1$I = %1$I + $2 WHERE user_id = $1',
+            p_component
+        ) USING p_user_id, p_delta;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    # TG_ARGV[0] names the component the table feeds.
+    """
+    CREATE OR REPLACE FUNCTION projects_contributor_score_trigger() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' AND OLD.user_id = NEW.user_id THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP IN ('DELETE', 'UPDATE') THEN
+            PERFORM projects_bump_contributor_score(OLD.user_id, TG_ARGV[0], -1);
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            PERFORM projects_bump_contributor_score(NEW.user_id, TG_ARGV[0], 1);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER trg_project_contributor_score
+    AFTER INSERT OR DELETE OR UPDATE OF user_id ON projects_project
+    FOR EACH ROW EXECUTE FUNCTION projects_contributor_score_trigger('projects_created')
+    """,
+    """
+    CREATE TRIGGER trg_collaborator_contributor_score
+    AFTER INSERT OR DELETE OR UPDATE OF user_id ON projects_collaborator
+    FOR EACH ROW EXECUTE FUNCTION projects_contributor_score_trigger('issues_collaborated')
+    """,
+    """
+    CREATE TRIGGER trg_comment_contributor_score
+    AFTER INSERT OR DELETE OR UPDATE OF user_id ON interactions_comment
+    FOR EACH ROW EXECUTE FUNCTION projects_contributor_score_trigger('comments_made')
+    """,
+    # Every user gets a row, so zero-activity users still rank (as before).
+    """
+    CREATE OR REPLACE FUNCTION projects_user_contributor_score() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO projects_contributorscore
+            (user_id, projects_created, issues_collaborated, comments_made)
+        VALUES (NEW.user_id, 0, 0, 0)
+        ON CONFLICT (user_id) DO NOTHING;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER trg_user_contributor_score
+    AFTER INSERT ON accounts_user
+    FOR EACH ROW EXECUTE FUNCTION projects_user_contributor_score()
+    """,
+]
+
+REVERSE_TRIGGER_SQL = [
+    "DROP TRIGGER IF EXISTS trg_user_contributor_score ON accounts_user",
+    "DROP FUNCTION IF EXISTS projects_user_contributor_score()",
+    "DROP TRIGGER IF EXISTS trg_comment_contributor_score ON interactions_comment",
+    "DROP TRIGGER IF EXISTS trg_collaborator_contributor_score ON projects_collaborator",
+    "DROP TRIGGER IF EXISTS trg_project_contributor_score ON projects_project",
+    "DROP FUNCTION IF EXISTS projects_contributor_score_trigger()",
+    "DROP FUNCTION IF EXISTS projects_bump_contributor_score(INTEGER, TEXT, INTEGER)",
+]
+
+BACKFILL_SQL = """
+    INSERT INTO projects_contributorscore
+        (user_id, projects_created, issues_collaborated, comments_made)
+    SELECT
+        u.user_id,
+        (SELECT COUNT(*) FROM projects_project p WHERE p.user_id = u.user_id),
+        (SELECT COUNT(*) FROM projects_collaborator col WHERE col.user_id = u.user_id),
+        (SELECT COUNT(*) FROM interactions_comment c WHERE c.user_id = u.user_id)
+    FROM accounts_user u
+"""
+
+# top_contributors_view stays for ad-hoc SQL, now reading the store.
+VIEW_SQL = """
+    CREATE OR REPLACE VIEW top_contributors_view AS
+    SELECT
+        u.user_id,
+        u.full_name,
+        u.nu_email,
+        u.avatar_url,
+        s.projects_created::bigint AS projects_created,
+        s.issues_collaborated::bigint AS issues_collaborated,
+        s.comments_made::bigint AS comments_made,
+        s.activity_score::bigint AS activity_score,
+        RANK() OVER (ORDER BY s.activity_score DESC) AS rank
+    FROM projects_contributorscore s
+    JOIN accounts_user u ON u.user_id = s.user_id
+"""
+
+REVERSE_VIEW_SQL = """
+    CREATE OR REPLACE VIEW top_contributors_view AS
+    SELECT
+        u.user_id,
+        u.full_name,
+        u.nu_email,
+        u.avatar_url,
+        COUNT(DISTINCT p.project_id) AS projects_created,
+        COUNT(DISTINCT col.issue_id) AS issues_collaborated,
+        COUNT(DISTINCT c.comment_id) AS comments_made,
+        (
+            COUNT(DISTINCT p.project_id) * 3
+            + COUNT(DISTINCT col.issue_id) * 2
+            + COUNT(DISTINCT c.comment_id)
+        ) AS activity_score,
+        RANK() OVER (
+            ORDER BY (
+                COUNT(DISTINCT p.project_id) * 3
+                + COUNT(DISTINCT col.issue_id) * 2
+                + COUNT(DISTINCT c.comment_id)
+            ) DESC
+        ) AS rank
+    FROM accounts_user u
+    LEFT JOIN projects_project p ON p.user_id = u.user_id
+    LEFT JOIN projects_collaborator col ON col.user_id = u.user_id
+    LEFT JOIN interactions_comment c ON c.user_id = u.user_id
+    GROUP BY u.user_id, u.full_name, u.nu_email, u.avatar_url
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_user_trigram_indexes'),
+        ('projects', '0012_project_changed_at'),
+        ('interactions', '0003_comment_keyset_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContributorScore',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='contributor_score', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('projects_created', models.IntegerField(default=0)),
+                ('issues_collaborated', models.IntegerField(default=0)),
+                ('comments_made', models.IntegerField(default=0)),
+                ('activity_score', models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('projects_created'), '*', models.Value(3)), '+', django.db.models.expressions.CombinedExpression(models.F('issues_collaborated'), '*', models.Value(2))), '+', models.F('comments_made')), output_field=models.IntegerField())),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-activity_score', '-user'], name='contributor_score_rank_idx')],
+            },
+        ),
+        migrations.RunSQL(sql=TRIGGER_SQL, reverse_sql=REVERSE_TRIGGER_SQL),
+        migrations.RunSQL(sql=BACKFILL_SQL, reverse_sql=migrations.RunSQL.noop),
+        migrations.RunSQL(sql=VIEW_SQL, reverse_sql=REVERSE_VIEW_SQL),
+    ]
@@ -0,0 +1,133 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:33
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+# ============================================================
+# Append-only activity feed (replaces the UNION ALL behind
+# recent_activity_view).
+#
+# AFTER INSERT triggers on projects_project and interactions_comment
+# write one row per project/comment in the creating transaction; a
+# deleted comment takes its row with it (deleted projects cascade through
+# the foreign key). Reads seek on (created_at DESC, id DESC).
+# ============================================================
+FORWARD_SQL = [
+    """
+    CREATE OR REPLACE FUNCTION projects_activity_event_trigger() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            DELETE FROM projects_activityevent
+            WHERE activity_type = TG_ARGV[0] AND entity_id = OLD.comment_id;
+            RETURN NULL;
+        END IF;
+        IF TG_ARGV[0] = 'project' THEN
+            INSERT INTO projects_activityevent (activity_type, entity_id, actor_id, project_id, created_at)
+            VALUES ('project', NEW.project_id, NEW.user_id, NEW.project_id, NEW.created_at);
+        ELSE
+            INSERT INTO projects_activityevent (activity_type, entity_id, actor_id, project_id, created_at)
+            VALUES ('comment', NEW.comment_id, NEW.user_id, NEW.project_id, NEW.created_at);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER trg_project_activity_event
+    AFTER INSERT ON projects_project
+    FOR EACH ROW EXECUTE FUNCTION projects_activity_event_trigger('project')
+    """,
+    """
+    CREATE TRIGGER trg_comment_activity_event
+    AFTER INSERT OR DELETE ON interactions_comment
+    FOR EACH ROW EXECUTE FUNCTION projects_activity_event_trigger('comment')
+    """,
+    # Backfill in chronological order so ids follow created_at
+    """
+    INSERT INTO projects_activityevent (activity_type, entity_id, actor_id, project_id, created_at)
+    SELECT activity_type, entity_id, actor_id, project_id, created_at FROM (
+        SELECT 'project' AS activity_type, project_id AS entity_id, user_id AS actor_id,
+            project_id, created_at
+        FROM projects_project
+        UNION ALL
+        SELECT 'comment', comment_id, user_id, project_id, created_at
+        FROM interactions_comment
+    ) events
+    ORDER BY created_at, activity_type DESC, entity_id
+    """,
+    # Keep the view for ad-hoc queries, now reading the table
+    """
+    CREATE OR REPLACE VIEW recent_activity_view AS
+    SELECT
+        e.activity_type::text AS activity_type,
+        e.entity_id,
+        p.title AS entity_title,
+        u.user_id,
+        u.full_name,
+        u.avatar_url,
+        e.created_at AS activity_date
+    FROM projects_activityevent e
+    JOIN accounts_user u ON e.actor_id = u.user_id
+    JOIN projects_project p ON e.project_id = p.project_id
+    """,
+]
+
+REVERSE_SQL = [
+    """
+    CREATE OR REPLACE VIEW recent_activity_view AS
+    SELECT
+        'project' AS activity_type,
+        p.project_id AS entity_id,
+        p.title AS entity_title,
+        u.user_id,
+        u.full_name,
+        u.avatar_url,
+        p.created_at AS activity_date
+    FROM projects_project p
+    JOIN accounts_user u ON p.user_id = u.user_id
+    UNION ALL
+    SELECT
+        'comment' AS activity_type,
+        c.comment_id AS entity_id,
+        proj.title AS entity_title,
+        u.user_id,
+        u.full_name,
+        u.avatar_url,
+        c.created_at AS activity_date
+    FROM interactions_comment c
+    JOIN accounts_user u ON c.user_id = u.user_id
+    JOIN projects_project proj ON c.project_id = proj.project_id
+    """,
+    "DROP TRIGGER IF EXISTS trg_comment_activity_event ON interactions_comment",
+    "DROP TRIGGER IF EXISTS trg_project_activity_event ON projects_project",
+    "DROP FUNCTION IF EXISTS projects_activity_event_trigger()",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0013_contributor_score'),
+        ('interactions', '0003_comment_keyset_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityEvent',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('activity_type', models.CharField(choices=[('project', 'Project created'), ('comment', 'Comment posted')], max_length=16)),
+                ('entity_id', models.IntegerField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('actor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity_events', to=settings.AUTH_USER_MODEL)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity_events', to='projects.project')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-created_at', '-id'], name='activity_created_keyset_idx'), models.Index(fields=['activity_type', 'entity_id'], name='activity_entity_idx')],
+            },
+        ),
+        migrations.RunSQL(sql=FORWARD_SQL, reverse_sql=REVERSE_SQL),
+    ]
@@ -0,0 +1,207 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:38
+
+import django.db.models.deletion
+import django.db.models.expressions
+from django.conf import settings
+from django.db import migrations, models
+
+# ============================================================
+# User affinity graph (replaces the self-joins in
+# get_user_network_projects).
+#
+# projects_useraffinity holds one row per ordered pair of users that share
+# an issue (projects_collaborator) or a liked project (interactions_like).
+# Statement-level AFTER INSERT / AFTER DELETE triggers read the transition
+# tables, so a bulk insert of several collaborators on one issue counts
+# each new pair once:
+#
+#   inserted row n, every current row c on the same key (c <> n):
+#       n -> c  +1                       (c may be new or old)
+#       c -> n  +1  only if c is old     (new c adds its own n -> c side)
+#   deleted row d, every current or deleted row o on the same key:
+#       d -> o  -1
+#       o -> d  -1  only if o is still present
+#
+# TG_ARGV: [0] key column (issue_id / project_id), [1] counter column.
+# Pairs are written in (user_id, other_id) order to keep row locks ordered
+# between concurrent writers.
+# ============================================================
+FORWARD_SQL = [
+    """
+    CREATE OR REPLACE FUNCTION projects_affinity_insert_trigger() RETURNS trigger AS $$
+    BEGIN
+        EXECUTE format(
+            'INSERT INTO projects_useraffinity AS a (user_id, other_id, %2$I)
+             SELECT user_id, other_id, COUNT(*) FROM (
+                 SELECT n.user_id, c.user_id AS other_id
+                 FROM new_rows n
+                 JOIN %3$I c ON c.%1$I = n.%1$I AND c.user_id <> n.user_id
+                 UNION ALL
+                 SELECT c.user_id, n.user_id
+                 FROM new_rows n
+                 JOIN %3$I c ON c.%1$I = n.%1$I AND c.user_id <> n.user_id
+                 WHERE NOT EXISTS (
+                     SELECT 1 FROM new_rows n2 WHERE n2.%1$I = c.%1$I AND n2.user_id = c.user_id
+                 )
+             ) pairs
+             GROUP BY user_id, other_id
+             ORDER BY user_id, other_id
+             ON CONFLICT (user_id, other_id) DO UPDATE SET %2$I = a.%2$I + EXCLUDED.%2$I',
+            TG_ARGV[0], TG_ARGV[1], TG_TABLE_NAME
+        );
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION projects_affinity_delete_trigger() RETURNS trigger AS $$
+    DECLARE
+        emptied BIGINT[];
+    BEGIN
+        EXECUTE format(
+            'WITH pairs AS (
+                 SELECT d.user_id, o.user_id AS other_id
+                 FROM old_rows d
+                 JOIN (SELECT %1$I, user_id FROM %3$I UNION ALL SELECT %1$I, user_id FROM old_rows) o
+                     ON o.%1$I = d.%1$I AND o.user_id <> d.user_id
+                 UNION ALL
+                 SELECT c.user_id, d.user_id
+                 FROM old_rows d
+                 JOIN %3$I c ON c.%1$I = d.%1$I AND c.user_id <> d.user_id
+             ), deltas AS (
+                 SELECT user_id, other_id, COUNT(*) AS n
+                 FROM pairs
+                 GROUP BY user_id, other_id
+                 ORDER BY user_id, other_id
+             ), updated AS (
+                 UPDATE projects_useraffinity a SET %2$I = a.%2$I - deltas.n
+                 FROM deltas
+                 WHERE a.user_id = deltas.user_id AND a.other_id = deltas.other_id
+                 RETURNING a.id, a.shared_issues, a.shared_likes
+             )
+             SELECT array_agg(id) FROM updated WHERE shared_issues <= 0 AND shared_likes <= 0',
+            TG_ARGV[0], TG_ARGV[1], TG_TABLE_NAME
+        ) INTO emptied;
+        IF emptied IS NOT NULL THEN
+            DELETE FROM projects_useraffinity WHERE id = ANY(emptied);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER trg_collaborator_affinity_insert
+    AFTER INSERT ON projects_collaborator
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION projects_affinity_insert_trigger('issue_id', 'shared_issues')
+    """,
+    """
+    CREATE TRIGGER trg_collaborator_affinity_delete
+    AFTER DELETE ON projects_collaborator
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION projects_affinity_delete_trigger('issue_id', 'shared_issues')
+    """,
+    """
+    CREATE TRIGGER trg_like_affinity_insert
+    AFTER INSERT ON interactions_like
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION projects_affinity_insert_trigger('project_id', 'shared_likes')
+    """,
+    """
+    CREATE TRIGGER trg_like_affinity_delete
+    AFTER DELETE ON interactions_like
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION projects_affinity_delete_trigger('project_id', 'shared_likes')
+    """,
+    # Backfill
+    """
+    INSERT INTO projects_useraffinity (user_id, other_id, shared_issues, shared_likes)
+    SELECT user_id, other_id, SUM(shared_issues), SUM(shared_likes) FROM (
+        SELECT c1.user_id, c2.user_id AS other_id, 1 AS shared_issues, 0 AS shared_likes
+        FROM projects_collaborator c1
+        JOIN projects_collaborator c2 ON c2.issue_id = c1.issue_id AND c2.user_id <> c1.user_id
+        UNION ALL
+        SELECT l1.user_id, l2.user_id, 0, 1
+        FROM interactions_like l1
+        JOIN interactions_like l2 ON l2.project_id = l1.project_id AND l2.user_id <> l1.user_id
+    ) pairs
+    GROUP BY user_id, other_id
+    """,
+    # Network recommendations join neighbours to the projects they own
+    "CREATE INDEX project_summary_view_owner_idx ON project_summary_view (owner_id)",
+    # Same signature, now a lookup of the user's neighbours
+    """
+    CREATE OR REPLACE FUNCTION get_user_network_projects(p_user_id INTEGER)
+    RETURNS TABLE(project_id INTEGER) AS $$
+    BEGIN
+        RETURN QUERY
+        SELECT p.project_id
+        FROM projects_useraffinity a
+        JOIN projects_project p ON p.user_id = a.other_id
+        WHERE a.user_id = p_user_id;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+]
+
+REVERSE_SQL = [
+    """
+    CREATE OR REPLACE FUNCTION get_user_network_projects(p_user_id INTEGER)
+    RETURNS TABLE(project_id INTEGER) AS $$
+    BEGIN
+        RETURN QUERY
+        SELECT DISTINCT p.project_id
+        FROM projects_project p
+        WHERE p.user_id IN (
+            -- Users who collaborated on the same issues as p_user_id
+            SELECT DISTINCT col2.user_id
+            FROM projects_collaborator col1
+            JOIN projects_collaborator col2 ON col1.issue_id = col2.issue_id
+            WHERE col1.user_id = p_user_id AND col2.user_id != p_user_id
+            UNION
+            -- Users who liked the same projects as p_user_id
+            SELECT DISTINCT l2.user_id
+            FROM interactions_like l1
+            JOIN interactions_like l2 ON l1.project_id = l2.project_id
+            WHERE l1.user_id = p_user_id AND l2.user_id != p_user_id
+        )
+        AND p.user_id != p_user_id;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP INDEX IF EXISTS project_summary_view_owner_idx",
+    "DROP TRIGGER IF EXISTS trg_like_affinity_delete ON interactions_like",
+    "DROP TRIGGER IF EXISTS trg_like_affinity_insert ON interactions_like",
+    "DROP TRIGGER IF EXISTS trg_collaborator_affinity_delete ON projects_collaborator",
+    "DROP TRIGGER IF EXISTS trg_collaborator_affinity_insert ON projects_collaborator",
+    "DROP FUNCTION IF EXISTS projects_affinity_delete_trigger()",
+    "DROP FUNCTION IF EXISTS projects_affinity_insert_trigger()",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0014_activity_event'),
+        ('interactions', '0003_comment_keyset_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserAffinity',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('shared_issues', models.IntegerField(db_default=0)),
+                ('shared_likes', models.IntegerField(db_default=0)),
+                ('weight', models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('shared_issues'), '*', models.Value(3)), '+', models.F('shared_likes')), output_field=models.IntegerField())),
+                ('other', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='affinities', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', '-weight', '-other'], name='user_affinity_weight_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'other'), name='user_affinity_pair_uniq')],
+            },
+        ),
+        migrations.RunSQL(sql=FORWARD_SQL, reverse_sql=REVERSE_SQL),
+    ]
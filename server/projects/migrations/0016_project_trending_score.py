@@ -0,0 +1,232 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+# ============================================================
+# Stored, time-decayed trending score.
+#
+# trending_score = sum over likes and comments of
+#     2 ^ ((event_time - epoch) / half_life)
+# with epoch / half_life from the single projects_trendingepoch row.
+# Every score is measured against the same epoch, so decaying them all
+# "to now" would multiply each by the same factor: ordering never needs
+# a rewrite and an index on the column serves spotlight directly. The
+# renormalize step (projects.trending) divides every score by the
+# current weight and moves the epoch to now, keeping values small.
+#
+# The like/comment counter triggers from 0010 add or remove the event's
+# weight in the same UPDATE as the counter. They read the epoch row
+# FOR SHARE so a concurrent renormalize cannot mix units. Removing an
+# event subtracts the weight of its own created_at, i.e. exactly what it
+# added (clamped at zero against rounding).
+#
+# trending_projects_view becomes a plain view over projects_project:
+# ORDER BY trending_score LIMIT n is an index scan on
+# project_trending_idx instead of a refreshed snapshot.
+# ============================================================
+FORWARD_SQL = [
+    "INSERT INTO projects_trendingepoch (id, epoch, half_life_hours) VALUES (1, NOW(), 72)",
+    """
+    CREATE OR REPLACE FUNCTION projects_trending_weight(
+        p_at TIMESTAMPTZ, p_epoch TIMESTAMPTZ, p_half_life_hours DOUBLE PRECISION
+    ) RETURNS DOUBLE PRECISION AS $$
+        SELECT power(2.0, EXTRACT(EPOCH FROM (p_at - p_epoch)) / (p_half_life_hours * 3600.0))
+    $$ LANGUAGE sql IMMUTABLE
+    """,
+    """
+    CREATE OR REPLACE FUNCTION projects_like_counter() RETURNS trigger AS $$
+    DECLARE
+        e projects_trendingepoch%ROWTYPE;
+    BEGIN
+        SELECT * INTO e FROM projects_trendingepoch WHERE id = 1 FOR SHARE;
+        IF TG_OP IN ('DELETE', 'UPDATE') THEN
+            UPDATE projects_project SET
+                likes_count = likes_count - 1,
+                trending_score = GREATEST(
+                    trending_score - COALESCE(projects_trending_weight(OLD.created_at, e.epoch, e.half_life_hours), 0),
+                    0
+                )
+            WHERE project_id = OLD.project_id;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            UPDATE projects_project SET
+                likes_count = likes_count + 1,
+                trending_score = trending_score
+                    + COALESCE(projects_trending_weight(NEW.created_at, e.epoch, e.half_life_hours), 0)
+            WHERE project_id = NEW.project_id;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION projects_comment_counter() RETURNS trigger AS $$
+    DECLARE
+        e projects_trendingepoch%ROWTYPE;
+    BEGIN
+        SELECT * INTO e FROM projects_trendingepoch WHERE id = 1 FOR SHARE;
+        IF TG_OP IN ('DELETE', 'UPDATE') THEN
+            UPDATE projects_project SET
+                comments_count = comments_count - 1,
+                trending_score = GREATEST(
+                    trending_score - COALESCE(projects_trending_weight(OLD.created_at, e.epoch, e.half_life_hours), 0),
+                    0
+                )
+            WHERE project_id = OLD.project_id;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            UPDATE projects_project SET
+                comments_count = comments_count + 1,
+                trending_score = trending_score
+                    + COALESCE(projects_trending_weight(NEW.created_at, e.epoch, e.half_life_hours), 0)
+            WHERE project_id = NEW.project_id;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    # Renormalizing rewrites every score; it is not a change to the project.
+    """
+    CREATE OR REPLACE FUNCTION projects_project_changed_at() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' AND current_setting('projects.renormalizing_trending', TRUE) = 'on' THEN
+            RETURN NEW;
+        END IF;
+        NEW.changed_at := clock_timestamp();
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    # Backfill from every like and comment.
+    """
+    UPDATE projects_project p SET trending_score =
+        COALESCE((
+            SELECT SUM(projects_trending_weight(l.created_at, e.epoch, e.half_life_hours))
+            FROM interactions_like l
+            WHERE l.project_id = p.project_id
+        ), 0)
+        + COALESCE((
+            SELECT SUM(projects_trending_weight(c.created_at, e.epoch, e.half_life_hours))
+            FROM interactions_comment c
+            WHERE c.project_id = p.project_id
+        ), 0)
+    FROM projects_trendingepoch e
+    WHERE e.id = 1 AND (p.likes_count > 0 OR p.comments_count > 0)
+    """,
+    "DROP MATERIALIZED VIEW IF EXISTS trending_projects_view",
+    """
+    CREATE VIEW trending_projects_view AS
+    SELECT
+        p.project_id,
+        p.title,
+        p.description,
+        p.github_url,
+        p.user_id AS owner_id,
+        u.full_name AS owner_full_name,
+        u.nu_email AS owner_nu_email,
+        u.avatar_url AS owner_avatar_url,
+        p.likes_count,
+        p.comments_count,
+        p.open_issues_count AS open_issues,
+        p.closed_issues_count AS closed_issues,
+        (p.likes_count + p.comments_count) AS engagement_score,
+        EXTRACT(EPOCH FROM (NOW() - p.updated_at)) / 86400.0 AS days_since_update,
+        p.created_at,
+        p.updated_at,
+        p.trending_score
+    FROM projects_project p
+    JOIN accounts_user u ON p.user_id = u.user_id
+    """,
+    "DELETE FROM projects_materializedviewrefresh WHERE view_name = 'trending_projects_view'",
+]
+
+REVERSE_SQL = [
+    "DROP VIEW IF EXISTS trending_projects_view",
+    """
+    CREATE MATERIALIZED VIEW trending_projects_view AS
+    SELECT
+        project_id, title, description, github_url,
+        owner_id, owner_full_name, owner_nu_email, owner_avatar_url,
+        likes_count, comments_count, open_issues, closed_issues,
+        engagement_score, days_since_update, created_at, updated_at,
+        (engagement_score / GREATEST(days_since_update, 1.0)) AS trending_score
+    FROM project_summary_view
+    """,
+    "CREATE UNIQUE INDEX trending_projects_view_pk ON trending_projects_view (project_id)",
+    "CREATE INDEX trending_projects_view_score_idx ON trending_projects_view (trending_score DESC)",
+    """
+    INSERT INTO projects_materializedviewrefresh (view_name, refreshed_at, duration_ms)
+    VALUES ('trending_projects_view', NOW(), 0)
+    ON CONFLICT (view_name) DO NOTHING
+    """,
+    """
+    CREATE OR REPLACE FUNCTION projects_project_changed_at() RETURNS trigger AS $$
+    BEGIN
+        NEW.changed_at := clock_timestamp();
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION projects_comment_counter() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('DELETE', 'UPDATE') THEN
+            UPDATE projects_project SET comments_count = comments_count - 1
+            WHERE project_id = OLD.project_id;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            UPDATE projects_project SET comments_count = comments_count + 1
+            WHERE project_id = NEW.project_id;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION projects_like_counter() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('DELETE', 'UPDATE') THEN
+            UPDATE projects_project SET likes_count = likes_count - 1
+            WHERE project_id = OLD.project_id;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            UPDATE projects_project SET likes_count = likes_count + 1
+            WHERE project_id = NEW.project_id;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP FUNCTION IF EXISTS projects_trending_weight(TIMESTAMPTZ, TIMESTAMPTZ, DOUBLE PRECISION)",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0015_user_affinity'),
+        ('interactions', '0004_like_created_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingEpoch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('epoch', models.DateTimeField()),
+                ('half_life_hours', models.FloatField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='trending_score',
+            field=models.FloatField(default=0.0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['-trending_score', '-project_id'], name='project_trending_idx'),
+        ),
+        migrations.RunSQL(sql=FORWARD_SQL, reverse_sql=REVERSE_SQL),
+    ]
@@ -0,0 +1,197 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:10
+
+from django.db import migrations
+
+# ============================================================
+# Bounded like edges in the user affinity graph.
+#
+# Every liker of a project used to be linked to every other one: a like
+# on a project with N likers upserted 2N projects_useraffinity rows inside
+# the toggle-like request, and the project stored N^2 edges. Liking a
+# project everybody likes also says little about two users.
+#
+# Like edges now come from each project's first
+# projects_like_affinity_limit() likers (by like_id) only. A like or
+# unlike writes at most 2 * (limit - 1) edges per side, and a project
+# contributes at most limit * (limit - 1) edges however popular it gets.
+# When an early liker unlikes, the next liker moves up and gains the
+# freed edges, so the graph always equals the rebuild from scratch
+# (projects.affinity.REBUILD_SQL).
+#
+# The trigger compares the project's early likers before and after the
+# statement: users who joined them gain edges to the others, users who
+# dropped out lose theirs. Shared issues keep the generic trigger from 0015.
+# ============================================================
+EARLY_LIKES_SQL = """
+    SELECT project_id, user_id FROM (
+        SELECT project_id, user_id,
+            ROW_NUMBER() OVER (PARTITION BY project_id ORDER BY like_id) AS n
+        FROM interactions_like
+    ) ranked
+    WHERE n <= projects_like_affinity_limit()
+"""
+
+
+def rebuild_sql(like_source):
+    return [
+        "DELETE FROM projects_useraffinity",
+        f"""
+        INSERT INTO projects_useraffinity (user_id, other_id, shared_issues, shared_likes)
+        SELECT user_id, other_id, SUM(shared_issues), SUM(shared_likes) FROM (
+            SELECT c1.user_id, c2.user_id AS other_id, 1 AS shared_issues, 0 AS shared_likes
+            FROM projects_collaborator c1
+            JOIN projects_collaborator c2 ON c2.issue_id = c1.issue_id AND c2.user_id <> c1.user_id
+            UNION ALL
+            SELECT l1.user_id, l2.user_id, 0, 1
+            FROM ({like_source}) l1
+            JOIN ({like_source}) l2 ON l2.project_id = l1.project_id AND l2.user_id <> l1.user_id
+        ) pairs
+        GROUP BY user_id, other_id
+        """,
+    ]
+
+
+FORWARD_SQL = [
+    """
+    CREATE OR REPLACE FUNCTION projects_like_affinity_limit() RETURNS INTEGER AS $$
+        SELECT 100
+    $$ LANGUAGE sql IMMUTABLE
+    """,
+    """
+    CREATE OR REPLACE FUNCTION projects_like_affinity_trigger() RETURNS trigger AS $$
+    DECLARE
+        changed TEXT;
+        before_sql TEXT;
+        emptied BIGINT[];
+    BEGIN
+        -- The project's early likers before this statement, for LATERAL t.
+        IF TG_OP = 'INSERT' THEN
+            changed := 'new_rows';
+            before_sql := '
+                SELECT l.user_id FROM interactions_like l
+                WHERE l.project_id = t.project_id
+                AND NOT EXISTS (SELECT 1 FROM new_rows n WHERE n.like_id = l.like_id)
+                ORDER BY l.like_id LIMIT projects_like_affinity_limit()';
+        ELSE
+            changed := 'old_rows';
+            before_sql := '
+                SELECT b.user_id FROM (
+                    (SELECT l.user_id, l.like_id FROM interactions_like l
+                     WHERE l.project_id = t.project_id
+                     ORDER BY l.like_id LIMIT projects_like_affinity_limit())
+                    UNION ALL
+                    SELECT o.user_id, o.like_id FROM old_rows o WHERE o.project_id = t.project_id
+                ) b
+                ORDER BY b.like_id LIMIT projects_like_affinity_limit()';
+        END IF;
+
+        EXECUTE format(
+            'WITH touched AS (
+                 SELECT DISTINCT project_id FROM %1$I
+             ), early_after AS (
+                 SELECT t.project_id, e.user_id FROM touched t CROSS JOIN LATERAL (
+                     SELECT l.user_id FROM interactions_like l
+                     WHERE l.project_id = t.project_id
+                     ORDER BY l.like_id LIMIT projects_like_affinity_limit()
+                 ) e
+             ), early_before AS (
+                 SELECT t.project_id, e.user_id FROM touched t CROSS JOIN LATERAL (%2$s) e
+             ), joined AS (
+                 SELECT project_id, user_id FROM early_after
+                 EXCEPT SELECT project_id, user_id FROM early_before
+             ), dropped AS (
+                 SELECT project_id, user_id FROM early_before
+                 EXCEPT SELECT project_id, user_id FROM early_after
+             ), pairs AS (
+                 SELECT j.user_id, e.user_id AS other_id, 1 AS n
+                 FROM joined j JOIN early_after e ON e.project_id = j.project_id AND e.user_id <> j.user_id
+                 UNION ALL
+                 SELECT e.user_id, j.user_id, 1
+                 FROM joined j JOIN early_after e ON e.project_id = j.project_id AND e.user_id <> j.user_id
+                 WHERE NOT EXISTS (
+                     SELECT 1 FROM joined j2 WHERE j2.project_id = e.project_id AND j2.user_id = e.user_id
+                 )
+                 UNION ALL
+                 SELECT d.user_id, e.user_id, -1
+                 FROM dropped d JOIN early_before e ON e.project_id = d.project_id AND e.user_id <> d.user_id
+                 UNION ALL
+                 SELECT e.user_id, d.user_id, -1
+                 FROM dropped d JOIN early_before e ON e.project_id = d.project_id AND e.user_id <> d.user_id
+                 WHERE NOT EXISTS (
+                     SELECT 1 FROM dropped d2 WHERE d2.project_id = e.project_id AND d2.user_id = e.user_id
+                 )
+             ), deltas AS (
+                 SELECT user_id, other_id, SUM(n) AS n
+                 FROM pairs
+                 GROUP BY user_id, other_id
+                 HAVING SUM(n) <> 0
+                 ORDER BY user_id, other_id
+             ), gained AS (
+                 INSERT INTO projects_useraffinity AS a (user_id, other_id, shared_likes)
+                 SELECT user_id, other_id, n FROM deltas WHERE n > 0
+                 ON CONFLICT (user_id, other_id) DO UPDATE SET shared_likes = a.shared_likes + EXCLUDED.shared_likes
+             ), lost AS (
+                 -- UPDATE only: the edges of a deleted user may already be gone
+                 UPDATE projects_useraffinity a SET shared_likes = a.shared_likes + deltas.n
+                 FROM deltas
+                 WHERE deltas.n < 0 AND a.user_id = deltas.user_id AND a.other_id = deltas.other_id
+                 RETURNING a.id, a.shared_issues, a.shared_likes
+             )
+             SELECT array_agg(id) FROM lost WHERE shared_issues <= 0 AND shared_likes <= 0',
+            changed, before_sql
+        ) INTO emptied;
+        IF emptied IS NOT NULL THEN
+            DELETE FROM projects_useraffinity WHERE id = ANY(emptied);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS trg_like_affinity_insert ON interactions_like",
+    "DROP TRIGGER IF EXISTS trg_like_affinity_delete ON interactions_like",
+    """
+    CREATE TRIGGER trg_like_affinity_insert
+    AFTER INSERT ON interactions_like
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION projects_like_affinity_trigger()
+    """,
+    """
+    CREATE TRIGGER trg_like_affinity_delete
+    AFTER DELETE ON interactions_like
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION projects_like_affinity_trigger()
+    """,
+    *rebuild_sql(EARLY_LIKES_SQL),
+]
+
+REVERSE_SQL = [
+    "DROP TRIGGER IF EXISTS trg_like_affinity_insert ON interactions_like",
+    "DROP TRIGGER IF EXISTS trg_like_affinity_delete ON interactions_like",
+    """
+    CREATE TRIGGER trg_like_affinity_insert
+    AFTER INSERT ON interactions_like
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION projects_affinity_insert_trigger('project_id', 'shared_likes')
+    """,
+    """
+    CREATE TRIGGER trg_like_affinity_delete
+    AFTER DELETE ON interactions_like
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION projects_affinity_delete_trigger('project_id', 'shared_likes')
+    """,
+    "DROP FUNCTION IF EXISTS projects_like_affinity_trigger()",
+    *rebuild_sql("SELECT project_id, user_id FROM interactions_like"),
+    "DROP FUNCTION IF EXISTS projects_like_affinity_limit()",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0016_project_trending_score'),
+        ('interactions', '0005_like_project_order_idx'),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=FORWARD_SQL, reverse_sql=REVERSE_SQL),
+    ]
@@ -1,5 +1,87 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import Exists, F, OuterRef, Value
+from django.db.models.functions import Left
 from django.conf import settings
+from django.utils import timezone
+
+
+# Characters of description kept by the card representation.
+DESCRIPTION_EXCERPT_LENGTH = 200
+
+# Serializer fields read from the owner, and the User column behind each.
+OWNER_FIELDS = {
+	"owner_user_id": "user_id",
+	"owner_full_name": "full_name",
+	"owner_nu_email": "nu_email",
+	"owner_avatar_url": "avatar_url",
+}
+
+USER_FLAGS = ("user_has_liked", "user_has_collaborated", "user_has_commented")
+
+
+class ProjectQuerySet(models.QuerySet):
+	def for_serialization(self, user=None, fields=None):
+		"""
+		Load everything ProjectSerializer reads in a fixed number of queries:
+		one for the projects (owner joined, per-user flags computed with
+		Exists subqueries; likes_count is a trigger-maintained column) plus
+		one prefetch each for tags and issues, regardless of how many
+		projects are on the page.
+
+		``fields`` (the serializer field names that will be rendered, see
+		SparseFieldsetsMixin) narrows the load to what they read: only
+		their columns are selected, and the owner join, prefetches and flag
+		subqueries are skipped when unused. ``description_excerpt`` is
+		computed in SQL so the full description is never fetched for cards.
+		"""
+		# Imported lazily: interactions.models imports this module.
+		from interactions.models import Comment, Like
+
+		if user is None or not user.is_authenticated:
+			flags = {name: Value(False) for name in USER_FLAGS}
+		else:
+			flags = {
+				"user_has_liked": Exists(Like.objects.filter(project=OuterRef("pk"), user=user)),
+				"user_has_collaborated": Exists(
+					Collaborator.objects.filter(issue__project=OuterRef("pk"), user=user)
+				),
+				"user_has_commented": Exists(Comment.objects.filter(project=OuterRef("pk"), user=user)),
+			}
+
+		if fields is None:
+			return (
+				self.select_related("user")
+				.prefetch_related("tags", "issues")
+				.defer("search_vector")
+				.annotate(**flags)
+			)
+
+		fields = set(fields)
+		concrete = {field.name for field in self.model._meta.concrete_fields}
+		# project_id and created_at are always loaded for keyset pagination.
+		columns = {"project_id", "created_at"} | (fields & concrete)
+		qs = self
+
+		owner_columns = [column for name, column in OWNER_FIELDS.items() if name in fields]
+		if owner_columns:
+			qs = qs.select_related("user")
+			columns.add("user")
+			columns.update(f"user__{column}" for column in owner_columns)
+
+		qs = qs.only(*columns)
+
+		related = [name for name in ("tags", "issues") if name in fields]
+		if related:
+			qs = qs.prefetch_related(*related)
+		if "description_excerpt" in fields:
+			# One extra character tells the serializer the text was cut.
+			qs = qs.annotate(
+				description_excerpt=Left("description", DESCRIPTION_EXCERPT_LENGTH + 1)
+			)
+
+		return qs.annotate(**{name: expr for name, expr in flags.items() if name in fields})
 
 
 class Project(models.Model):
@@ -15,12 +97,68 @@ class Project(models.Model):
 	created_at = models.DateTimeField(auto_now_add=True)
 	updated_at = models.DateTimeField(auto_now=True)
 
+	# Engagement counters, maintained by PostgreSQL triggers on
+	# interactions_like, interactions_comment and projects_issue
+	# (migration 0010). Never written from Python; see save().
+	likes_count = models.IntegerField(default=0, editable=False)
+	comments_count = models.IntegerField(default=0, editable=False)
+	open_issues_count = models.IntegerField(default=0, editable=False)
+	closed_issues_count = models.IntegerField(default=0, editable=False)
+
+	# Weighted title (A) / tags (B) / description (C) document, maintained by
+	# triggers on projects_project and projects_tag (migration 0011).
+	search_vector = SearchVectorField(null=True, editable=False)
+
+	# Bumped by a trigger on every write to the row, which includes the
+	# counter and search-vector updates above, plus issue edits and
+	# collaborator changes (migration 0012). Conditional GET validators
+	# are built from it; see drf_backend.conditional.
+	changed_at = models.DateTimeField(default=timezone.now, editable=False)
+
+	# Exponentially decayed engagement, in units of the current
+	# TrendingEpoch: each like/comment adds 2 ** ((t - epoch) / half_life),
+	# so newer events weigh more and scores never need rewriting to stay
+	# comparable. Maintained by the like/comment counter triggers (migration
+	# 0016); projects.trending moves the epoch forward periodically.
+	trending_score = models.FloatField(default=0.0, editable=False)
+
+	TRIGGER_MANAGED_FIELDS = (
+		"likes_count",
+		"comments_count",
+		"open_issues_count",
+		"closed_issues_count",
+		"search_vector",
+		"changed_at",
+		"trending_score",
+	)
+
+	objects = ProjectQuerySet.as_manager()
+
 	class Meta:
 		ordering = ["-created_at"]
+		indexes = [
+			# Keyset pagination: (created_at, project_id) seek for all / per-user lists
+			models.Index(fields=["-created_at", "-project_id"], name="project_created_keyset_idx"),
+			models.Index(fields=["user", "-created_at", "-project_id"], name="project_user_keyset_idx"),
+			GinIndex(fields=["search_vector"], name="project_search_gin_idx"),
+			# Spotlight: top-N by trending_score as an index scan
+			models.Index(fields=["-trending_score", "-project_id"], name="project_trending_idx"),
+		]
 
 	def __str__(self) -> str:
 		return self.title
 
+	def save(self, *args, **kwargs):
+		# A full save would write back the counter values loaded with this
+		# instance, clobbering increments the triggers made in the meantime.
+		if not self._state.adding and kwargs.get("update_fields") is None:
+			kwargs["update_fields"] = [
+				f.name
+				for f in self._meta.concrete_fields
+				if not f.primary_key and f.name not in self.TRIGGER_MANAGED_FIELDS
+			]
+		super().save(*args, **kwargs)
+
 
 class Tag(models.Model):
 	project = models.ForeignKey(
@@ -91,3 +229,188 @@ class Collaborator(models.Model):
 
 	def __str__(self) -> str:
 		return f"User {self.user_id} on Issue {self.issue_id}"
+
+
+class MaterializedViewRefresh(models.Model):
+	"""Last successful refresh of each materialized view (see projects.matviews)."""
+
+	view_name = models.CharField(max_length=63, primary_key=True)
+	refreshed_at = models.DateTimeField()
+	duration_ms = models.PositiveIntegerField(default=0)
+
+	def __str__(self) -> str:
+		return f"{self.view_name} @ {self.refreshed_at:%Y-%m-%d %H:%M:%S}"
+
+
+class TrendingEpoch(models.Model):
+	"""
+	Single row (pk=1): the reference time and half-life of
+	Project.trending_score. See projects.trending.
+	"""
+
+	epoch = models.DateTimeField()
+	half_life_hours = models.FloatField()
+
+	def __str__(self) -> str:
+		return f"{self.epoch:%Y-%m-%d %H:%M:%S} (half-life {self.half_life_hours:g}h)"
+
+
+class ContributorScore(models.Model):
+	"""
+	One leaderboard row per user, kept current by PostgreSQL triggers on
+	accounts_user, projects_project, projects_collaborator and
+	interactions_comment (migration 0013). Never written from Python
+	except by ``sync_leaderboard --recount``. projects.leaderboard mirrors
+	activity_score into a Redis sorted set.
+	"""
+
+	user = models.OneToOneField(
+		settings.AUTH_USER_MODEL,
+		on_delete=models.CASCADE,
+		primary_key=True,
+		related_name="contributor_score",
+	)
+	projects_created = models.IntegerField(default=0)
+	issues_collaborated = models.IntegerField(default=0)
+	comments_made = models.IntegerField(default=0)
+	activity_score = models.GeneratedField(
+		expression=F("projects_created") * 3 + F("issues_collaborated") * 2 + F("comments_made"),
+		output_field=models.IntegerField(),
+		db_persist=True,
+	)
+
+	class Meta:
+		indexes = [
+			# Leaderboard order and "how many score above me" counts
+			models.Index(fields=["-activity_score", "-user"], name="contributor_score_rank_idx"),
+		]
+
+	def __str__(self) -> str:
+		return f"User {self.user_id}: {self.activity_score}"
+
+
+class UserAffinity(models.Model):
+	"""
+	Weighted, directed edge of the user affinity graph: ``user`` and
+	``other`` collaborate on ``shared_issues`` issues and liked
+	``shared_likes`` of the same projects. Both directions are stored so a
+	user's neighbours are one index range. Maintained by statement-level
+	triggers on projects_collaborator and interactions_like (migrations
+	0015, 0017; likes only count among a project's first 100 likers);
+	``rebuild_affinity_graph`` recomputes it. Rows drop out when both
+	counts reach zero.
+	"""
+
+	id = models.BigAutoField(primary_key=True)
+	user = models.ForeignKey(
+		settings.AUTH_USER_MODEL,
+		on_delete=models.CASCADE,
+		related_name="affinities",
+	)
+	other = models.ForeignKey(
+		settings.AUTH_USER_MODEL,
+		on_delete=models.CASCADE,
+		related_name="+",
+	)
+	shared_issues = models.IntegerField(db_default=0)
+	shared_likes = models.IntegerField(db_default=0)
+	weight = models.GeneratedField(
+		expression=F("shared_issues") * 3 + F("shared_likes"),
+		output_field=models.IntegerField(),
+		db_persist=True,
+	)
+
+	class Meta:
+		constraints = [
+			models.UniqueConstraint(fields=["user", "other"], name="user_affinity_pair_uniq"),
+		]
+		indexes = [
+			# A user's strongest neighbours first
+			models.Index(fields=["user", "-weight", "-other"], name="user_affinity_weight_idx"),
+		]
+
+	def __str__(self) -> str:
+		return f"User {self.user_id} -> {self.other_id}: {self.weight}"
+
+
+class ActivityEventQuerySet(models.QuerySet):
+	def for_feed(self):
+		"""Columns the feed renders: the event, its actor and project title."""
+		return self.select_related("actor", "project").only(
+			"id",
+			"activity_type",
+			"entity_id",
+			"created_at",
+			"actor__user_id",
+			"actor__full_name",
+			"actor__avatar_url",
+			"project__project_id",
+			"project__title",
+		)
+
+	def for_network(self, user):
+		"""
+		Events by other people on projects ``user`` owns, liked, commented
+		on or collaborates on, or by the owners of those projects and the
+		user's neighbours in the affinity graph. ``user`` may be a User or
+		a user id.
+		"""
+		from interactions.models import Comment, Like
+
+		project_ids = (
+			Project.objects.filter(user=user).values("pk").order_by()
+			.union(Like.objects.filter(user=user).values("project_id"))
+			.union(Comment.objects.filter(user=user).values("project_id").order_by())
+			.union(Issue.objects.filter(collaborators__user=user).values("project_id").order_by())
+		)
+		people = (
+			Project.objects.filter(pk__in=project_ids).values("user_id").order_by()
+			.union(UserAffinity.objects.filter(user=user).values("other_id"))
+		)
+		return self.filter(
+			models.Q(project_id__in=project_ids) | models.Q(actor_id__in=people)
+		).exclude(actor=user)
+
+
+class ActivityEvent(models.Model):
+	"""
+	Append-only activity feed. Rows are inserted by triggers in the same
+	transaction as the project or comment they describe (migration 0014)
+	and removed with it; ``prune_activity_events`` drops old ones.
+	Titles and names are read through the foreign keys so they stay current.
+	"""
+
+	TYPE_PROJECT = "project"
+	TYPE_COMMENT = "comment"
+	TYPE_CHOICES = [
+		(TYPE_PROJECT, "Project created"),
+		(TYPE_COMMENT, "Comment posted"),
+	]
+
+	id = models.BigAutoField(primary_key=True)
+	activity_type = models.CharField(max_length=16, choices=TYPE_CHOICES)
+	# project_id or comment_id, depending on activity_type
+	entity_id = models.IntegerField()
+	actor = models.ForeignKey(
+		settings.AUTH_USER_MODEL,
+		on_delete=models.CASCADE,
+		related_name="activity_events",
+	)
+	project = models.ForeignKey(
+		Project,
+		on_delete=models.CASCADE,
+		related_name="activity_events",
+	)
+	created_at = models.DateTimeField(default=timezone.now)
+
+	objects = ActivityEventQuerySet.as_manager()
+
+	class Meta:
+		indexes = [
+			# Keyset pagination and retention pruning
+			models.Index(fields=["-created_at", "-id"], name="activity_created_keyset_idx"),
+			models.Index(fields=["activity_type", "entity_id"], name="activity_entity_idx"),
+		]
+
+	def __str__(self) -> str:
+		return f"{self.activity_type} #{self.entity_id} by {self.actor_id}"
@@ -0,0 +1,187 @@
+"""
+SQL for RecommendedProjectsView, one query per mode.
+
+Every mode runs as a single statement: the mode query picks and orders the
+projects (LIMIT applied), and the wrapper attaches each project's tags
+with an array_agg over projects_tag, so no mode needs per-row follow-up
+queries.
+"""
+from django.conf import settings
+
+from drf_backend.db_routing import read_connection
+
+from . import matching
+
+SKILLS_MISSING_MESSAGE = "Add skills to your profile to get personalised recommendations."
+
+# Columns every mode returns (besides tags), qualified with the "p" alias.
+SUMMARY_COLUMNS = """
+    p.project_id, p.title, p.description, p.github_url,
+    p.owner_id, p.owner_full_name, p.owner_nu_email, p.owner_avatar_url,
+    p.likes_count, p.comments_count, p.open_issues, p.closed_issues,
+    p.engagement_score, {trending_score} AS trending_score, p.days_since_update,
+    p.created_at, p.updated_at
+"""
+
+WITH_TAGS_SQL = """
+    SELECT picked.*, COALESCE(tags.tags, ARRAY[]::varchar[]) AS tags
+    FROM ({inner}) picked
+    LEFT JOIN LATERAL (
+        SELECT array_agg(t.tag ORDER BY t.id) AS tags
+        FROM projects_tag t
+        WHERE t.project_id = picked.project_id
+    ) tags ON TRUE
+    ORDER BY {order_by}
+"""
+
+# mode -> (inner query, ORDER BY). The inner query receives the owner
+# filter as {owner_filter} and must end with ORDER BY/LIMIT %s.
+MODE_QUERIES = {
+    "spotlight": (
+        """
+        SELECT {columns}
+        FROM trending_projects_view p
+        WHERE {owner_filter}
+        ORDER BY {order_by}
+        LIMIT %s
+        """,
+        "trending_score DESC, project_id DESC",
+    ),
+    "with-issues": (
+        """
+        SELECT {columns}
+        FROM projects_needing_help_view p
+        WHERE {owner_filter}
+        ORDER BY {order_by}
+        LIMIT %s
+        """,
+        "open_issues DESC, project_id DESC",
+    ),
+    "skill-match": (
+        """
+        SELECT {columns}, COUNT(ptf.tag) AS skill_matches
+        FROM project_summary_view p
+        JOIN project_tags_flat_view ptf ON p.project_id = ptf.project_id
+        WHERE ptf.tag IN (
+            SELECT LOWER(skill) FROM accounts_skill WHERE user_id = %s
+        )
+        AND {owner_filter}
+        GROUP BY
+            p.project_id, p.title, p.description, p.github_url,
+            p.owner_id, p.owner_full_name, p.owner_nu_email, p.owner_avatar_url,
+            p.likes_count, p.comments_count, p.open_issues, p.closed_issues,
+            p.engagement_score, p.days_since_update, p.created_at, p.updated_at
+        ORDER BY {order_by}
+        LIMIT %s
+        """,
+        "skill_matches DESC, engagement_score DESC, project_id DESC",
+    ),
+    "network": (
+        # Projects owned by the user's neighbours in the affinity graph
+        # (projects_useraffinity), strongest connection first.
+        """
+        SELECT {columns}, a.weight AS affinity
+        FROM projects_useraffinity a
+        JOIN project_summary_view p ON p.owner_id = a.other_id
+        WHERE a.user_id = %s
+        AND {owner_filter}
+        ORDER BY {order_by}
+        LIMIT %s
+        """,
+        "affinity DESC, engagement_score DESC, project_id DESC",
+    ),
+    "latest": (
+        """
+        SELECT {columns}
+        FROM project_summary_view p
+        WHERE {owner_filter}
+        ORDER BY {order_by}
+        LIMIT %s
+        """,
+        "created_at DESC, project_id DESC",
+    ),
+}
+
+# Modes whose inner query takes the requesting user's id as first parameter.
+PERSONAL_MODES = ("skill-match", "network")
+
+
+def build_query(mode, exclude_owner):
+    inner, order_by = MODE_QUERIES[mode]
+    inner = inner.format(
+        columns=SUMMARY_COLUMNS.format(
+            trending_score="p.trending_score" if mode == "spotlight" else "0"
+        ),
+        owner_filter="p.owner_id != %s" if exclude_owner else "TRUE",
+        order_by=order_by,
+    )
+    return WITH_TAGS_SQL.format(inner=inner, order_by=order_by)
+
+
+# Summary rows for projects picked in Python (skill-match on the vector
+# engine), in any order.
+PROJECTS_BY_ID_SQL = WITH_TAGS_SQL.format(
+    inner="""
+        SELECT {columns}
+        FROM project_summary_view p
+        WHERE p.project_id = ANY(%s)
+    """.format(columns=SUMMARY_COLUMNS.format(trending_score="0")),
+    order_by="project_id",
+)
+
+
+def get_skill_matched_projects(user_id, limit, exclude_own=True):
+    """
+    skill-match through projects.matching: TF-IDF scores from the
+    in-process matrix, then one query for the picked projects' rows.
+    Extra candidates cover projects not yet in the materialized view.
+    """
+    matches = matching.match_projects(user_id, limit * 2, exclude_own=exclude_own)
+    if matches is None:
+        return [], SKILLS_MISSING_MESSAGE
+    if not matches:
+        return [], None
+
+    with read_connection().cursor() as cursor:
+        cursor.execute(PROJECTS_BY_ID_SQL, [[project_id for project_id, _, _ in matches]])
+        columns = [col[0] for col in cursor.description]
+        rows = {row[0]: dict(zip(columns, row)) for row in cursor.fetchall()}
+
+    projects = []
+    for project_id, score, matched in matches:
+        if project_id in rows:
+            projects.append({**rows[project_id], "skill_matches": matched, "match_score": score})
+    return projects[:limit], None
+
+
+def get_recommended_projects(mode, user_id, limit, exclude_own=True, engine=None):
+    """
+    Run the recommendation query for ``mode`` (unknown modes should be
+    normalised to "latest" first).
+
+    ``exclude_own`` drops projects owned by ``user_id``; the global modes
+    pass False to build one shared result for everybody. Returns
+    ``(projects, message)`` where ``message`` explains an empty
+    skill-match result. ``engine`` overrides SKILL_MATCH_ENGINE.
+    """
+    if mode == "skill-match" and (engine or settings.SKILL_MATCH_ENGINE) == "vector":
+        return get_skill_matched_projects(user_id, limit, exclude_own)
+
+    params = []
+    if mode in PERSONAL_MODES:
+        params.append(user_id)
+    if exclude_own:
+        params.append(user_id)
+    params.append(limit)
+
+    with read_connection().cursor() as cursor:
+        cursor.execute(build_query(mode, exclude_own), params)
+        columns = [col[0] for col in cursor.description]
+        projects = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+        if mode == "skill-match" and not projects:
+            cursor.execute("SELECT 1 FROM accounts_skill WHERE user_id = %s LIMIT 1", [user_id])
+            if cursor.fetchone() is None:
+                return [], SKILLS_MISSING_MESSAGE
+
+    return projects, None
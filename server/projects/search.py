@@ -0,0 +1,48 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import Cast
+
+# Must match the configuration used for title/description in
+# projects_build_search_vector (migration 0011).
+SEARCH_CONFIG = "english"
+
+MAX_TERMS = 8
+
+_TERM_RE = re.compile(r"\w+")
+
+
+def build_search_query(text):
+    """
+    Turn free text into a prefix tsquery: every word must match the start
+    of a lexeme ("djan rest" -> ``djan:* & rest:*``). Only word characters
+    are kept, so user input can never inject tsquery operators. Returns
+    None when there is nothing to search for.
+    """
+    terms = _TERM_RE.findall(text.lower())[:MAX_TERMS]
+    if not terms:
+        return None
+    raw = " & ".join(f"{term}:*" for term in terms)
+    return SearchQuery(raw, config=SEARCH_CONFIG, search_type="raw")
+
+
+def search_projects(queryset, text, match_empty=False):
+    """
+    Filter ``queryset`` to projects matching ``text`` (GIN index on
+    search_vector) and annotate ``rank``. ts_rank returns a real; it is
+    cast to double precision so the value round-trips exactly through the
+    keyset pagination cursor.
+
+    Without search terms nothing matches, or with ``match_empty`` every
+    project does, all ranked 0.
+    """
+    query = build_search_query(text)
+    if query is None:
+        # Keep the rank annotation so callers can order by it uniformly.
+        if not match_empty:
+            queryset = queryset.none()
+        return queryset.annotate(rank=Value(0.0, output_field=FloatField()))
+    return queryset.filter(search_vector=query).annotate(
+        rank=Cast(SearchRank(F("search_vector"), query), FloatField()),
+    )
@@ -1,9 +1,9 @@
 from rest_framework import serializers
 from django.db import transaction
 
-from .models import Project, Tag, Issue, Collaborator
+from .models import DESCRIPTION_EXCERPT_LENGTH, ActivityEvent, Project, Tag, Issue
 from accounts.models import User
-from interactions.models import Comment
+from drf_backend.serializers import SparseFieldsetsMixin
 
 
 class TagSerializer(serializers.ModelSerializer):
@@ -26,16 +26,27 @@ class IssueSerializer(serializers.ModelSerializer):
 		read_only_fields = ["issue_id", "created_at", "updated_at"]
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
+	"""
+	Full project representation. Supports ?fields= to trim it and
+	?expand= for the remaining counters; see SparseFieldsetsMixin.
+	"""
+	expandable_fields = ("comments_count", "open_issues_count", "closed_issues_count")
+
 	tags = TagSerializer(many=True, read_only=True)
 	issues = IssueSerializer(many=True, read_only=True)
 	owner_user_id = serializers.IntegerField(source="user.user_id", read_only=True)
 	owner_full_name = serializers.CharField(source="user.full_name", read_only=True)
 	owner_nu_email = serializers.EmailField(source="user.nu_email", read_only=True)
-	likes_count = serializers.IntegerField(source="likes.count", read_only=True)
-	user_has_liked = serializers.SerializerMethodField()
-	user_has_collaborated = serializers.SerializerMethodField()
-	user_has_commented = serializers.SerializerMethodField()
+	likes_count = serializers.IntegerField(read_only=True)
+	comments_count = serializers.IntegerField(read_only=True)
+	open_issues_count = serializers.IntegerField(read_only=True)
+	closed_issues_count = serializers.IntegerField(read_only=True)
+	# Annotated by Project.objects.for_serialization(user); every view that
+	# renders this serializer must build its queryset through it.
+	user_has_liked = serializers.BooleanField(read_only=True)
+	user_has_collaborated = serializers.BooleanField(read_only=True)
+	user_has_commented = serializers.BooleanField(read_only=True)
 
 	class Meta:
 		model = Project
@@ -52,6 +63,9 @@ class ProjectSerializer(serializers.ModelSerializer):
 			"owner_full_name",
 			"owner_nu_email",
 			"likes_count",
+			"comments_count",
+			"open_issues_count",
+			"closed_issues_count",
 			"user_has_liked",
 			"user_has_collaborated",
 			"user_has_commented",
@@ -66,33 +80,76 @@ class ProjectSerializer(serializers.ModelSerializer):
 			"owner_full_name",
 			"owner_nu_email",
 			"likes_count",
+			"comments_count",
+			"open_issues_count",
+			"closed_issues_count",
+			"user_has_liked",
+			"user_has_collaborated",
+			"user_has_commented",
+		]
+
+
+class ProjectCardSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
+	"""
+	Compact representation for project cards (?view=card): a description
+	excerpt, flat tag names, counters and the owner. Anything else in
+	ProjectSerializer can be pulled in with ?expand=.
+	"""
+	expandable_fields = (
+		"description",
+		"github_url",
+		"updated_at",
+		"issues",
+		"closed_issues_count",
+		"owner_nu_email",
+		"user_has_liked",
+		"user_has_collaborated",
+		"user_has_commented",
+	)
+
+	description_excerpt = serializers.SerializerMethodField()
+	tags = serializers.SlugRelatedField(many=True, read_only=True, slug_field="tag")
+	issues = IssueSerializer(many=True, read_only=True)
+	owner_user_id = serializers.IntegerField(source="user.user_id", read_only=True)
+	owner_full_name = serializers.CharField(source="user.full_name", read_only=True)
+	owner_nu_email = serializers.EmailField(source="user.nu_email", read_only=True)
+	owner_avatar_url = serializers.URLField(source="user.avatar_url", read_only=True)
+	user_has_liked = serializers.BooleanField(read_only=True)
+	user_has_collaborated = serializers.BooleanField(read_only=True)
+	user_has_commented = serializers.BooleanField(read_only=True)
+
+	class Meta:
+		model = Project
+		fields = [
+			"project_id",
+			"title",
+			"description_excerpt",
+			"tags",
+			"likes_count",
+			"comments_count",
+			"open_issues_count",
+			"owner_user_id",
+			"owner_full_name",
+			"owner_avatar_url",
+			"created_at",
+			"description",
+			"github_url",
+			"updated_at",
+			"issues",
+			"closed_issues_count",
+			"owner_nu_email",
 			"user_has_liked",
 			"user_has_collaborated",
 			"user_has_commented",
 		]
+		read_only_fields = fields
 
-	def get_user_has_liked(self, obj):
-		request = self.context.get("request")
-		user = getattr(request, "user", None)
-		if not user or not user.is_authenticated:
-			return False
-		return obj.likes.filter(user=user).exists()
-
-	def get_user_has_collaborated(self, obj):
-		request = self.context.get("request")
-		user = getattr(request, "user", None)
-		if not user or not user.is_authenticated:
-			return False
-		# Check if user is a collaborator on any issue in this project
-		return Collaborator.objects.filter(issue__project=obj, user=user).exists()
-
-	def get_user_has_commented(self, obj):
-		request = self.context.get("request")
-		user = getattr(request, "user", None)
-		if not user or not user.is_authenticated:
-			return False
-		# Check if user has commented on this project
-		return Comment.objects.filter(project=obj, user=user).exists()
+	def get_description_excerpt(self, obj):
+		# Annotated by for_serialization with one character to spare.
+		text = obj.description_excerpt
+		if len(text) > DESCRIPTION_EXCERPT_LENGTH:
+			return text[:DESCRIPTION_EXCERPT_LENGTH].rstrip() + "…"
+		return text
 
 
 class ProjectCreateSerializer(serializers.ModelSerializer):
@@ -180,7 +237,7 @@ class IssueUpdateSerializer(serializers.ModelSerializer):
 		fields = ["title", "description"]
 
 
-class CloseIssueInputSerializer(serializers.Serializer):
+class CloseIssueItemSerializer(serializers.Serializer):
 	issue_id = serializers.IntegerField()
 	user_id = serializers.IntegerField(required=False)
 	user_ids = serializers.ListField(
@@ -189,16 +246,44 @@ class CloseIssueInputSerializer(serializers.Serializer):
 
 	def validate(self, attrs):
 		user_ids = attrs.get("user_ids")
-		user_id = attrs.get("user_id")
+		user_id = attrs.pop("user_id", None)
 		if user_ids is None:
-			if user_id is not None:
-				attrs["user_ids"] = [user_id]
-			else:
-				attrs["user_ids"] = []
+			attrs["user_ids"] = [user_id] if user_id is not None else []
+		# Keep first-seen order, drop repeats.
+		attrs["user_ids"] = list(dict.fromkeys(attrs["user_ids"]))
+		return attrs
+
+
+class CloseIssueInputSerializer(CloseIssueItemSerializer):
+	"""
+	Either one issue ({"issue_id", "user_id" | "user_ids"}) or a batch
+	({"issues": [{"issue_id", "user_ids"}, ...]}). validated_data always
+	carries the normalised "issues" list.
+	"""
+	issue_id = serializers.IntegerField(required=False)
+	issues = CloseIssueItemSerializer(many=True, required=False, allow_empty=False)
+
+	def validate(self, attrs):
+		if "issues" in attrs:
+			if "issue_id" in attrs:
+				raise serializers.ValidationError("Send either issue_id or issues, not both.")
+			issue_ids = [item["issue_id"] for item in attrs["issues"]]
+			if len(set(issue_ids)) != len(issue_ids):
+				raise serializers.ValidationError({"issues": "Each issue may only appear once."})
+			return attrs
+		if "issue_id" not in attrs:
+			raise serializers.ValidationError({"issue_id": "This field is required."})
+		attrs = super().validate(attrs)
+		attrs["issues"] = [{"issue_id": attrs["issue_id"], "user_ids": attrs["user_ids"]}]
 		return attrs
 
 
 class CollaboratorUserIssueSerializer(serializers.ModelSerializer):
+	"""
+	Expects ``scoped_collaborations`` prefetched (Collaborator rows with
+	issue and project joined, filtered to the view's scope); see
+	projects.views.collaborations_prefetch.
+	"""
 	issues = serializers.SerializerMethodField()
 
 	class Meta:
@@ -206,25 +291,20 @@ class CollaboratorUserIssueSerializer(serializers.ModelSerializer):
 		fields = ["user_id", "full_name", "nu_email", "avatar_url", "issues"]
 
 	def get_issues(self, obj):
-		# All issues this user has collaborated on
-		issues = (
-			Issue.objects.filter(collaborators__user=obj)
-			.select_related("project")
-			.distinct()
-		)
 		return [
 			{
-				"issue_id": issue.issue_id,
-				"title": issue.title,
-				"status": issue.status,
-				"project_id": issue.project.project_id,
-				"project_title": issue.project.title,
+				"issue_id": collaboration.issue.issue_id,
+				"title": collaboration.issue.title,
+				"status": collaboration.issue.status,
+				"project_id": collaboration.issue.project.project_id,
+				"project_title": collaboration.issue.project.title,
 			}
-			for issue in issues
+			for collaboration in obj.scoped_collaborations
 		]
 
 
 class IssueWithCollaboratorsSerializer(serializers.ModelSerializer):
+	"""Expects ``prefetched_collaborators`` (Collaborator rows with user joined)."""
 	collaborators = serializers.SerializerMethodField()
 
 	class Meta:
@@ -240,18 +320,37 @@ class IssueWithCollaboratorsSerializer(serializers.ModelSerializer):
 		]
 
 	def get_collaborators(self, obj):
-		users = (
-			User.objects.filter(issue_collaborations__issue=obj)
-			.distinct()
-		)
 		return [
 			{
-				"user_id": user.user_id,
-				"full_name": user.full_name,
-				"nu_email": user.nu_email,
-				"avatar_url": user.avatar_url,
+				"user_id": collaboration.user.user_id,
+				"full_name": collaboration.user.full_name,
+				"nu_email": collaboration.user.nu_email,
+				"avatar_url": collaboration.user.avatar_url,
 			}
-			for user in users
+			for collaboration in obj.prefetched_collaborators
 		]
 
 
+class ActivityEventSerializer(serializers.ModelSerializer):
+	"""Feed entry; keeps the keys of the old recent_activity_view rows."""
+
+	entity_title = serializers.CharField(source="project.title", read_only=True)
+	project_id = serializers.IntegerField(read_only=True)
+	user_id = serializers.IntegerField(source="actor.user_id", read_only=True)
+	full_name = serializers.CharField(source="actor.full_name", read_only=True)
+	avatar_url = serializers.CharField(source="actor.avatar_url", read_only=True)
+	activity_date = serializers.DateTimeField(source="created_at", read_only=True)
+
+	class Meta:
+		model = ActivityEvent
+		fields = [
+			"id",
+			"activity_type",
+			"entity_id",
+			"entity_title",
+			"project_id",
+			"user_id",
+			"full_name",
+			"avatar_url",
+			"activity_date",
+		]
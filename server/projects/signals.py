@@ -0,0 +1,39 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.models import Skill, User
+from interactions.models import Comment, Like
+
+from .cache import invalidate_user_recommendations
+from .leaderboard import schedule_sync
+from .models import Collaborator, Project
+
+
+# Bulk writes (bulk_create / queryset.delete) do not send these signals;
+# those code paths call invalidate_user_recommendations() / schedule_sync()
+# themselves.
+
+@receiver([post_save, post_delete], sender=Skill)
+def invalidate_skill_match(sender, instance, **kwargs):
+    invalidate_user_recommendations(instance.user_id, ["skill-match"])
+
+
+@receiver([post_save, post_delete], sender=Like)
+@receiver([post_save, post_delete], sender=Collaborator)
+def invalidate_network(sender, instance, **kwargs):
+    invalidate_user_recommendations(instance.user_id, ["network"])
+
+
+@receiver([post_save, post_delete], sender=Project)
+@receiver([post_save, post_delete], sender=Collaborator)
+@receiver([post_save, post_delete], sender=Comment)
+def sync_leaderboard(sender, instance, created=True, **kwargs):
+    # The triggers already updated ContributorScore; copy it to the mirror.
+    if created:
+        schedule_sync([instance.user_id])
+
+
+@receiver([post_save, post_delete], sender=User)
+def sync_leaderboard_membership(sender, instance, created=True, **kwargs):
+    if created:
+        schedule_sync([instance.user_id])
@@ -1,3 +1,1082 @@
-from django.test import TestCase
+import os
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from accounts.models import Skill, User
+from interactions.models import Comment, Like
+from . import leaderboard, matching
+from .counters import find_counter_drift, repair_counters
+from .models import (
+    ActivityEvent,
+    Collaborator,
+    ContributorScore,
+    Issue,
+    MaterializedViewRefresh,
+    Project,
+    Tag,
+    TrendingEpoch,
+    UserAffinity,
+)
+
+
+class ProjectKeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            nu_email="owner@nu.edu.pk", password="testpassword123", full_name="Owner"
+        )
+        self.client.force_authenticate(user=self.user)
+        for i in range(5):
+            Project.objects.create(
+                user=self.user,
+                title=f"Project {i}",
+                description="desc",
+                github_url="https://github.com/example/repo",
+            )
+        # Force timestamp ties so the project_id tiebreaker is exercised.
+        Project.objects.update(created_at=timezone.now())
+        self.url = reverse("project-list-all")
+
+    def test_pages_cover_every_project_once_in_order(self):
+        seen = []
+        url = f"{self.url}?page_size=2"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data["results"]), 2)
+            seen.extend(p["project_id"] for p in response.data["results"])
+            url = response.data["next"]
+
+        expected = list(
+            Project.objects.order_by("-created_at", "-project_id").values_list("project_id", flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(f"{self.url}?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ProjectSerializerQueryCountTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = User.objects.create_user(
+            nu_email="owner@nu.edu.pk", password="testpassword123", full_name="Owner"
+        )
+        self.viewer = User.objects.create_user(
+            nu_email="viewer@nu.edu.pk", password="testpassword123", full_name="Viewer"
+        )
+        self.client.force_authenticate(user=self.viewer)
+        self.projects = [
+            Project.objects.create(
+                user=self.owner,
+                title=f"Project {i}",
+                description="desc",
+                github_url="https://github.com/example/repo",
+            )
+            for i in range(6)
+        ]
+        Like.objects.create(user=self.viewer, project=self.projects[0])
+        Like.objects.create(user=self.owner, project=self.projects[0])
+
+    def test_list_runs_constant_queries(self):
+        # ETag page lookup + projects (with counts and flags) + tags and
+        # issues prefetches
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse("project-list-all"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        liked = next(p for p in response.data["results"] if p["project_id"] == self.projects[0].project_id)
+        self.assertEqual(liked["likes_count"], 2)
+        self.assertTrue(liked["user_has_liked"])
+        self.assertFalse(liked["user_has_commented"])
+
+
+class MaterializedViewRefreshTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = User.objects.create_user(
+            nu_email="owner@nu.edu.pk", password="testpassword123", full_name="Owner"
+        )
+        self.viewer = User.objects.create_user(
+            nu_email="viewer@nu.edu.pk", password="testpassword123", full_name="Viewer"
+        )
+        self.project = Project.objects.create(
+            user=self.owner,
+            title="Fresh project",
+            description="desc",
+            github_url="https://github.com/example/repo",
+        )
+
+    def summary_project_ids(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT project_id FROM project_summary_view")
+            return {row[0] for row in cursor.fetchall()}
+
+    def test_refresh_command_picks_up_new_rows_and_records_timestamp(self):
+        self.assertNotIn(self.project.project_id, self.summary_project_ids())
+        before = MaterializedViewRefresh.objects.get(view_name="project_summary_view").refreshed_at
+
+        out = StringIO()
+        call_command("refresh_project_views", stdout=out)
+        self.assertIn("Refreshed", out.getvalue())
+
+        self.assertIn(self.project.project_id, self.summary_project_ids())
+        after = MaterializedViewRefresh.objects.get(view_name="project_summary_view").refreshed_at
+        self.assertGreater(after, before)
+
+    @override_settings(JWT_OUTSTANDING_FLUSH_INTERVAL=10)
+    def test_loop_flushes_outstanding_tokens_between_refreshes(self):
+        command = "projects.management.commands.refresh_project_views"
+        clock = [0.0]
+
+        class Stop(Exception):
+            pass
+
+        def sleep(seconds):
+            if clock[0] >= 60:
+                raise Stop
+            clock[0] += seconds
+
+        with mock.patch(f"{command}.time.sleep", side_effect=sleep), \
+                mock.patch(f"{command}.time.monotonic", side_effect=lambda: clock[0]), \
+                mock.patch(f"{command}.refresh_materialized_views", return_value={}) as refresh, \
+                mock.patch(f"{command}.close_old_connections"), \
+                mock.patch(f"{command}.flush_outstanding", return_value=2) as flush:
+            out = StringIO()
+            with self.assertRaises(Stop):
+                call_command("refresh_project_views", "--loop", "--interval", "30", stdout=out)
+
+        # Ticks at 10..60s: a flush on each, a refresh at start, 30s and 60s.
+        self.assertEqual(flush.call_count, 6)
+        self.assertEqual(refresh.call_count, 3)
+        self.assertIn("Inserted 2 queued outstanding token(s).", out.getvalue())
+
+    def test_recommendations_report_staleness(self):
+        self.client.force_authenticate(user=self.viewer)
+        response = self.client.get(reverse("recommended-projects"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("refreshed_at", response.data)
+        self.assertIsNotNone(response.data["stale_seconds"])
+
+
+class ProjectCounterTriggerTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            nu_email="owner@nu.edu.pk", password="testpassword123", full_name="Owner"
+        )
+        self.fan = User.objects.create_user(
+            nu_email="fan@nu.edu.pk", password="testpassword123", full_name="Fan"
+        )
+        self.project = Project.objects.create(
+            user=self.owner,
+            title="Counted",
+            description="desc",
+            github_url="https://github.com/example/repo",
+        )
+
+    def test_triggers_track_likes_comments_and_issue_status(self):
+        like = Like.objects.create(user=self.fan, project=self.project)
+        Comment.objects.create(user=self.fan, project=self.project, comment_body="nice")
+        issue = Issue.objects.create(project=self.project, title="Bug", description="d")
+        Issue.objects.create(project=self.project, title="Bug 2", description="d")
+
+        issue.status = Issue.STATUS_CLOSED
+        issue.save()
+        like.delete()
+
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.likes_count, 0)
+        self.assertEqual(self.project.comments_count, 1)
+        self.assertEqual(self.project.open_issues_count, 1)
+        self.assertEqual(self.project.closed_issues_count, 1)
+        self.assertEqual(find_counter_drift(), [])
+
+    def test_saving_a_stale_instance_keeps_trigger_counts(self):
+        stale = Project.objects.get(pk=self.project.pk)
+        Like.objects.create(user=self.fan, project=self.project)
+
+        stale.title = "Renamed"
+        stale.save()
+
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.title, "Renamed")
+        self.assertEqual(self.project.likes_count, 1)
+
+    def test_check_command_repairs_drift(self):
+        Project.objects.filter(pk=self.project.pk).update(likes_count=7)
+        self.assertEqual(len(find_counter_drift()), 1)
+
+        out = StringIO()
+        call_command("check_project_counters", "--repair", stdout=out)
+
+        self.assertIn(
+            f"project {self.project.pk}: likes_count stored=7 actual=0", out.getvalue()
+        )
+        self.assertIn("Repaired 1 project(s).", out.getvalue())
+        self.assertEqual(find_counter_drift(), [])
+
+    def test_check_command_reports_without_repairing(self):
+        out = StringIO()
+        call_command("check_project_counters", stdout=out)
+        self.assertIn("All project counters are consistent.", out.getvalue())
+
+        Project.objects.filter(pk=self.project.pk).update(comments_count=3)
+        out = StringIO()
+        call_command("check_project_counters", stdout=out)
+
+        self.assertIn(
+            f"project {self.project.pk}: comments_count stored=3 actual=0", out.getvalue()
+        )
+        self.assertIn("1 project(s) drifted; rerun with --repair to fix.", out.getvalue())
+        self.assertEqual(len(find_counter_drift()), 1)
+
+    def test_repair_recounts_instead_of_writing_stale_counts(self):
+        Project.objects.filter(pk=self.project.pk).update(likes_count=7)
+        drift = find_counter_drift()
+        # A like lands between the check and the repair.
+        Like.objects.create(user=self.fan, project=self.project)
+
+        repair_counters(drift)
+
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.likes_count, 1)
+        self.assertEqual(find_counter_drift(), [])
+
+
+class RecommendationCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        matching.reset_index()
+        self.client = APIClient()
+        self.owner = User.objects.create_user(
+            nu_email="owner@nu.edu.pk", password="testpassword123", full_name="Owner"
+        )
+        self.viewer = User.objects.create_user(
+            nu_email="viewer@nu.edu.pk", password="testpassword123", full_name="Viewer"
+        )
+        self.client.force_authenticate(user=self.viewer)
+        self.project = Project.objects.create(
+            user=self.owner,
+            title="Django app",
+            description="desc",
+            github_url="https://github.com/example/repo",
+        )
+        Tag.objects.create(project=self.project, tag="Django")
+        out = StringIO()
+        call_command("refresh_project_views", stdout=out)
+        self.assertIn("Refreshed", out.getvalue())
+        self.url = reverse("recommended-projects")
+
+    def test_global_mode_is_shared_and_filters_own_projects(self):
+        first = self.client.get(self.url, {"mode": "spotlight"})
+        self.assertEqual(first.data["cache"], "miss")
+        self.assertEqual([p["project_id"] for p in first.data["projects"]], [self.project.project_id])
+
+        # The owner hits the same shared entry but never sees their own project.
+        self.client.force_authenticate(user=self.owner)
+        second = self.client.get(self.url, {"mode": "spotlight"})
+        self.assertEqual(second.data["cache"], "hit")
+        self.assertEqual(second.data["projects"], [])
+
+    def test_skill_change_invalidates_skill_match(self):
+        response = self.client.get(self.url, {"mode": "skill-match"})
+        self.assertEqual(response.data["projects"], [])
+        self.assertIn("message", response.data)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(reverse("user-update"), {"skills": ["django"]}, format="json")
+
+        response = self.client.get(self.url, {"mode": "skill-match"})
+        self.assertEqual(response.data["cache"], "miss")
+        self.assertEqual([p["project_id"] for p in response.data["projects"]], [self.project.project_id])
+        self.assertEqual(response.data["projects"][0]["tags"], ["Django"])
+
+    def test_every_mode_is_a_single_query(self):
+        Skill.objects.create(user=self.viewer, skill="django")
+        with self.settings(SKILL_MATCH_ENGINE="sql"):
+            for mode in ("spotlight", "with-issues", "skill-match", "network", "latest"):
+                cache.clear()
+                # staleness lookup + the recommendation query itself
+                with self.assertNumQueries(2):
+                    response = self.client.get(self.url, {"mode": mode})
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # Vector engine with a built matrix: staleness, skills, project rows
+        cache.clear()
+        matching.get_index()
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, {"mode": "skill-match"})
+        self.assertEqual(len(response.data["projects"]), 1)
+
+
+class ProjectSearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            nu_email="owner@nu.edu.pk", password="testpassword123", full_name="Owner"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.in_title = Project.objects.create(
+            user=self.user,
+            title="Django marketplace",
+            description="A campus marketplace.",
+            github_url="https://github.com/example/one",
+        )
+        self.in_description = Project.objects.create(
+            user=self.user,
+            title="Campus map",
+            description="Built with Django and Leaflet.",
+            github_url="https://github.com/example/two",
+        )
+        self.unrelated = Project.objects.create(
+            user=self.user,
+            title="Chess engine",
+            description="Bitboards in C.",
+            github_url="https://github.com/example/three",
+        )
+        self.url = reverse("project-search")
+
+    def search(self, q, **params):
+        response = self.client.get(self.url, {"q": q, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [p["project_id"] for p in response.data["results"]]
+
+    def test_prefix_match_ranks_title_above_description(self):
+        self.assertEqual(
+            self.search("djan"),
+            [self.in_title.project_id, self.in_description.project_id],
+        )
+
+    def test_tags_are_indexed_when_added_and_removed(self):
+        Tag.objects.create(project=self.unrelated, tag="rust")
+        self.assertEqual(self.search("rust"), [self.unrelated.project_id])
+
+        Tag.objects.filter(project=self.unrelated).delete()
+        self.assertEqual(self.search("rust"), [])
+
+    def test_operators_in_input_are_ignored(self):
+        self.assertEqual(self.search("!|&()"), [])
+        self.assertEqual(self.search("chess & | bitboards"), [self.unrelated.project_id])
+
+    def test_tag_filters_results(self):
+        Tag.objects.create(project=self.in_description, tag="frontend")
+        Tag.objects.create(project=self.unrelated, tag="frontend")
+
+        self.assertEqual(self.search("djan", tag="frontend"), [self.in_description.project_id])
+        self.assertEqual(self.search("djan", tag="backend"), [])
+
+    def test_tag_without_text_lists_tagged_projects_newest_first(self):
+        Tag.objects.create(project=self.in_title, tag="frontend")
+        Tag.objects.create(project=self.unrelated, tag="frontend")
+
+        self.assertEqual(
+            self.search("", tag="frontend"),
+            [self.unrelated.project_id, self.in_title.project_id],
+        )
+        self.assertEqual(self.search(""), [])
+
+
+class ProjectSparseFieldsetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            nu_email="owner@nu.edu.pk", password="testpassword123", full_name="Owner"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.project = Project.objects.create(
+            user=self.user,
+            title="Long read",
+            description="word " * 100,
+            github_url="https://github.com/example/repo",
+        )
+        Tag.objects.create(project=self.project, tag="Django")
+        Issue.objects.create(project=self.project, title="Bug", description="d")
+        self.url = reverse("project-list-all")
+
+    def test_card_view_is_compact(self):
+        # ETag page lookup + projects + tags prefetch; no issues prefetch,
+        # no flag subqueries
+        with self.assertNumQueries(3) as ctx:
+            response = self.client.get(self.url, {"view": "card"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("EXISTS", ctx.captured_queries[1]["sql"])
+
+        card = response.data["results"][0]
+        self.assertNotIn("description", card)
+        self.assertNotIn("issues", card)
+        self.assertEqual(card["tags"], ["Django"])
+        self.assertEqual(card["open_issues_count"], 1)
+        self.assertTrue(card["description_excerpt"].endswith("…"))
+        self.assertLessEqual(len(card["description_excerpt"]), 201)
+
+    def test_fields_and_expand(self):
+        with self.assertNumQueries(2):  # ETag page lookup + projects
+            response = self.client.get(self.url, {"fields": "project_id,title"})
+        self.assertEqual(set(response.data["results"][0]), {"project_id", "title"})
+
+        response = self.client.get(self.url, {"view": "card", "expand": "issues"})
+        self.assertEqual(len(response.data["results"][0]["issues"]), 1)
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get(self.url, {"fields": "title,password"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = User.objects.create_user(
+            nu_email="owner@nu.edu.pk", password="testpassword123", full_name="Owner"
+        )
+        self.viewer = User.objects.create_user(
+            nu_email="viewer@nu.edu.pk", password="testpassword123", full_name="Viewer"
+        )
+        self.client.force_authenticate(user=self.viewer)
+        self.project = Project.objects.create(
+            user=self.owner,
+            title="Cached",
+            description="desc",
+            github_url="https://github.com/example/repo",
+        )
+        self.detail_url = reverse("project-detail-public", args=[self.project.project_id])
+        self.list_url = reverse("project-list-all")
+
+    def test_detail_revalidates_with_one_query(self):
+        first = self.client.get(self.detail_url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertIn("Last-Modified", first.headers)
+
+        with self.assertNumQueries(1):
+            second = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(second.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_child_rows_change_the_validators(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+        Like.objects.create(user=self.viewer, project=self.project)
+        self.assertEqual(self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        etag = self.client.get(self.detail_url)["ETag"]
+        issue = Issue.objects.create(project=self.project, title="Bug", description="d")
+        etag_after_issue = self.client.get(self.detail_url)["ETag"]
+        self.assertNotEqual(etag, etag_after_issue)
+
+        issue.title = "Renamed bug"
+        issue.save()
+        self.assertNotEqual(etag_after_issue, self.client.get(self.detail_url)["ETag"])
+
+    def test_etag_is_per_viewer(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+        self.client.force_authenticate(user=self.owner)
+        self.assertEqual(self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_list_revalidation(self):
+        etag = self.client.get(self.list_url)["ETag"]
+        with self.assertNumQueries(1):
+            response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Comment.objects.create(user=self.viewer, project=self.project, comment_body="hi")
+        self.assertEqual(self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class CloseIssueAndAddCollaboratorTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = User.objects.create_user(
+            nu_email="owner@nu.edu.pk", password="testpassword123", full_name="Owner"
+        )
+        self.helpers = [
+            User.objects.create_user(
+                nu_email=f"helper{i}@nu.edu.pk", password="testpassword123", full_name=f"Helper {i}"
+            )
+            for i in range(4)
+        ]
+        self.client.force_authenticate(user=self.owner)
+        self.project = Project.objects.create(
+            user=self.owner,
+            title="Closing time",
+            description="desc",
+            github_url="https://github.com/example/repo",
+        )
+        self.issues = [
+            Issue.objects.create(project=self.project, title=f"Bug {i}", description="d")
+            for i in range(3)
+        ]
+        self.url = reverse("issue-close-with-collaborator")
+
+    def test_single_issue_form_still_works(self):
+        issue = self.issues[0]
+        response = self.client.post(
+            self.url, {"issue_id": issue.issue_id, "user_id": self.helpers[0].user_id}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["collaborator_user_ids"], [self.helpers[0].user_id])
+        issue.refresh_from_db()
+        self.assertEqual(issue.status, Issue.STATUS_CLOSED)
+
+    def test_batch_runs_constant_queries(self):
+        helper_ids = [u.user_id for u in self.helpers]
+        payload = {
+            "issues": [
+                {"issue_id": issue.issue_id, "user_ids": helper_ids} for issue in self.issues
+            ]
+        }
+        # issues + users + savepoint + UPDATE + INSERT ... ON CONFLICT + release
+        with self.assertNumQueries(6):
+            response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["issues"]), 3)
+        self.assertEqual(Collaborator.objects.count(), 12)
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.closed_issues_count, 3)
+
+        # Re-sending is idempotent.
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Collaborator.objects.count(), 12)
+
+    def test_unknown_user_rejects_whole_batch(self):
+        payload = {"issues": [{"issue_id": self.issues[0].issue_id, "user_ids": [999999]}]}
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(Issue.objects.filter(status=Issue.STATUS_CLOSED).exists())
+
+    def test_other_owners_issue_is_forbidden(self):
+        self.client.force_authenticate(user=self.helpers[0])
+        response = self.client.post(self.url, {"issue_id": self.issues[0].issue_id}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class CollaboratorDirectoryTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = User.objects.create_user(
+            nu_email="owner@nu.edu.pk", password="testpassword123", full_name="Owner"
+        )
+        self.client.force_authenticate(user=self.owner)
+        self.projects = [
+            Project.objects.create(
+                user=self.owner,
+                title=f"Project {i}",
+                description="desc",
+                github_url="https://github.com/example/repo",
+            )
+            for i in range(2)
+        ]
+        self.helpers = []
+        for i in range(3):
+            helper = User.objects.create_user(
+                nu_email=f"helper{i}@nu.edu.pk", password="testpassword123", full_name=f"Helper {i}"
+            )
+            self.helpers.append(helper)
+            for project in self.projects:
+                issue = Issue.objects.create(project=project, title=f"Bug {i}", description="d")
+                Collaborator.objects.create(user=helper, issue=issue)
+
+    def test_project_collaborators_are_scoped_and_paginated(self):
+        url = reverse("project-collaborators", args=[self.projects[0].project_id])
+        with self.assertNumQueries(2):  # users page + scoped collaborations
+            response = self.client.get(url, {"page_size": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertIsNotNone(response.data["next"])
+        for user in response.data["results"]:
+            self.assertEqual(
+                {issue["project_id"] for issue in user["issues"]}, {self.projects[0].project_id}
+            )
+
+    def test_directory_modes_run_constant_queries(self):
+        url = reverse("issue-close-with-collaborator")
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {"mode": "users"})
+        self.assertEqual(len(response.data["results"]), 3)
+        self.assertEqual(len(response.data["results"][0]["issues"]), 2)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {"mode": "issues"})
+        self.assertEqual(len(response.data["results"]), 6)
+        self.assertEqual(len(response.data["results"][0]["collaborators"]), 1)
+
+
+def scratch_redis():
+    """A Redis client on a scratch database, or None when none is reachable."""
+    import redis
+
+    client = redis.Redis.from_url(os.environ.get("TEST_REDIS_URL", "redis://localhost:6379/15"))
+    try:
+        client.ping()
+    except redis.RedisError:
+        return None
+    return client
+
+
+class LeaderboardMirrorRebuildTests(TestCase):
+    def setUp(self):
+        self.redis = scratch_redis()
+        if self.redis is None:
+            self.skipTest("Redis is not reachable (TEST_REDIS_URL)")
+        self.redis.flushdb()
+        self.addCleanup(self.redis.flushdb)
+        patcher = mock.patch("projects.leaderboard.get_redis", return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.users = [
+            User.objects.create_user(
+                nu_email=f"user{i}@nu.edu.pk", password="testpassword123", full_name=f"User {i}"
+            )
+            for i in range(3)
+        ]
+
+    def mirrored_score(self, user):
+        return self.redis.zscore(leaderboard.LEADERBOARD_KEY, leaderboard.member(user.pk))
+
+    def rebuild_with_concurrent_sync(self):
+        """Rebuild, committing a score change once the snapshot has been read."""
+        stage = leaderboard._stage
+        changed = self.users[1]
+
+        def stage_then_sync(client, staging, batch):
+            stage(client, staging, batch)
+            ContributorScore.objects.filter(user=changed).update(comments_made=5)
+            leaderboard.sync_scores({changed.pk})
+
+        with mock.patch("projects.leaderboard._stage", side_effect=stage_then_sync):
+            leaderboard.rebuild_mirror()
+        return changed
+
+    def test_sync_during_cold_rebuild_is_reapplied(self):
+        changed = self.rebuild_with_concurrent_sync()
+        self.assertEqual(self.mirrored_score(changed), 5)
+        self.assertEqual(self.mirrored_score(self.users[0]), 0)
+
+    def test_sync_during_warm_rebuild_survives_the_rename(self):
+        leaderboard.rebuild_mirror()
+        changed = self.rebuild_with_concurrent_sync()
+        self.assertEqual(self.mirrored_score(changed), 5)
+
+    def test_rebuild_cleans_up_its_keys(self):
+        staged = []
+        stage = leaderboard._stage
+
+        def record(client, staging, batch):
+            staged.append(staging)
+            stage(client, staging, batch)
+
+        with mock.patch("projects.leaderboard._stage", side_effect=record):
+            leaderboard.rebuild_mirror()
+            leaderboard.rebuild_mirror()
+
+        # Each rebuild stages into its own key.
+        self.assertEqual(len(set(staged)), 2)
+        self.assertEqual(self.redis.keys("leaderboard:*"), [leaderboard.LEADERBOARD_KEY.encode()])
+
+
+class ContributorLeaderboardTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.users = [
+            User.objects.create_user(
+                nu_email=f"user{i}@nu.edu.pk", password="testpassword123", full_name=f"User {i}"
+            )
+            for i in range(5)
+        ]
+        self.client.force_authenticate(user=self.users[4])
+        # user0: 1 project (3), user1: 1 project (3), user2: 2 comments (2)
+        self.project = Project.objects.create(
+            user=self.users[0], title="P0", description="d", github_url="https://github.com/e/r"
+        )
+        Project.objects.create(
+            user=self.users[1], title="P1", description="d", github_url="https://github.com/e/r"
+        )
+        for body in ("a", "b"):
+            Comment.objects.create(user=self.users[2], project=self.project, comment_body=body)
+        self.url = reverse("top-contributors")
+
+    def test_triggers_maintain_scores(self):
+        score = ContributorScore.objects.get(user=self.users[2])
+        self.assertEqual((score.comments_made, score.activity_score), (2, 2))
+
+        issue = Issue.objects.create(project=self.project, title="Bug", description="d")
+        Collaborator.objects.create(user=self.users[2], issue=issue)
+        Comment.objects.filter(user=self.users[2]).first().delete()
+        score.refresh_from_db()
+        self.assertEqual(
+            (score.issues_collaborated, score.comments_made, score.activity_score), (1, 1, 3)
+        )
+
+        out = StringIO()
+        call_command("sync_leaderboard", "--recount", stdout=out)
+        self.assertIn("Recounted", out.getvalue())
+        score.refresh_from_db()
+        self.assertEqual(score.activity_score, 3)
+
+    def test_ranks_ties_and_pagination(self):
+        response = self.client.get(self.url, {"limit": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ranks = [(e["user_id"], e["rank"]) for e in response.data["results"]]
+        # Ties share a rank and are ordered by user id descending.
+        self.assertEqual(ranks, [(self.users[1].user_id, 1), (self.users[0].user_id, 1)])
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual(response.data["results"][0]["user_id"], self.users[2].user_id)
+        self.assertEqual(response.data["results"][0]["rank"], 3)
+        self.assertEqual(response.data["me"]["user_id"], self.users[4].user_id)
+        self.assertEqual(response.data["me"]["rank"], 4)
+
+    def test_rank_around_me(self):
+        response = self.client.get(self.url, {"around": "me", "limit": 3})
+        ids = [e["user_id"] for e in response.data["results"]]
+        self.assertIn(self.users[4].user_id, ids)
+        self.assertEqual(len(ids), 3)
+
+
+class ActivityFeedTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.alice = User.objects.create_user(
+            nu_email="alice@nu.edu.pk", password="testpassword123", full_name="Alice"
+        )
+        self.bob = User.objects.create_user(
+            nu_email="bob@nu.edu.pk", password="testpassword123", full_name="Bob"
+        )
+        self.carol = User.objects.create_user(
+            nu_email="carol@nu.edu.pk", password="testpassword123", full_name="Carol"
+        )
+        self.client.force_authenticate(user=self.alice)
+        self.bob_project = Project.objects.create(
+            user=self.bob, title="Bob's", description="d", github_url="https://github.com/e/r"
+        )
+        self.carol_project = Project.objects.create(
+            user=self.carol, title="Carol's", description="d", github_url="https://github.com/e/r"
+        )
+        self.url = reverse("recent-activity")
+
+    def test_triggers_write_and_remove_events(self):
+        comment = Comment.objects.create(user=self.alice, project=self.bob_project, comment_body="hi")
+        events = ActivityEvent.objects.order_by("id").values_list("activity_type", "entity_id", "actor_id")
+        self.assertEqual(
+            list(events),
+            [
+                ("project", self.bob_project.pk, self.bob.pk),
+                ("project", self.carol_project.pk, self.carol.pk),
+                ("comment", comment.pk, self.alice.pk),
+            ],
+        )
+
+        comment.delete()
+        self.assertFalse(ActivityEvent.objects.filter(activity_type="comment").exists())
+        self.carol_project.delete()
+        self.assertEqual(list(ActivityEvent.objects.values_list("entity_id", flat=True)), [self.bob_project.pk])
+
+    def test_keyset_pages_newest_first(self):
+        comments = [
+            Comment.objects.create(user=self.carol, project=self.bob_project, comment_body=str(i))
+            for i in range(3)
+        ]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {"page_size": 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        first = response.data["results"]
+        self.assertEqual([row["entity_id"] for row in first], [c.pk for c in reversed(comments)])
+        self.assertEqual(first[0]["entity_title"], "Bob's")
+        self.assertEqual(first[0]["full_name"], "Carol")
+
+        second = self.client.get(response.data["next"]).data
+        self.assertEqual(
+            [row["activity_type"] for row in second["results"]], ["project", "project"]
+        )
+        self.assertIsNone(second["next"])
+
+    def test_network_feed(self):
+        # Alice liked Bob's project: Bob's activity and activity on his
+        # project are in her feed; Carol's unrelated project is not.
+        Like.objects.create(user=self.alice, project=self.bob_project)
+        Comment.objects.create(user=self.carol, project=self.bob_project, comment_body="c")
+        Comment.objects.create(user=self.alice, project=self.bob_project, comment_body="mine")
+        Comment.objects.create(user=self.carol, project=self.carol_project, comment_body="elsewhere")
+
+        response = self.client.get(self.url, {"feed": "network"})
+        self.assertEqual(
+            [(row["activity_type"], row["user_id"]) for row in response.data["results"]],
+            [("comment", self.carol.pk), ("project", self.bob.pk)],
+        )
+
+    def test_prune_command(self):
+        ActivityEvent.objects.filter(entity_id=self.bob_project.pk).update(
+            created_at=timezone.now() - timedelta(days=100)
+        )
+        call_command("prune_activity_events", days=90, batch_size=1, stdout=StringIO())
+        self.assertEqual(
+            list(ActivityEvent.objects.values_list("entity_id", flat=True)), [self.carol_project.pk]
+        )
+
+
+class UserAffinityGraphTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.users = [
+            User.objects.create_user(
+                nu_email=f"user{i}@nu.edu.pk", password="testpassword123", full_name=f"User {i}"
+            )
+            for i in range(5)
+        ]
+        self.project = Project.objects.create(
+            user=self.users[4], title="Hub", description="d", github_url="https://github.com/e/r"
+        )
+        self.issue = Issue.objects.create(project=self.project, title="I", description="d")
+
+    def edges(self):
+        return {
+            (a.user_id, a.other_id): (a.shared_issues, a.shared_likes)
+            for a in UserAffinity.objects.all()
+        }
+
+    def test_triggers_maintain_edges(self):
+        u0, u1, u2 = self.users[:3]
+        # One statement inserting two collaborators counts each pair once
+        Collaborator.objects.bulk_create(
+            [Collaborator(user=u0, issue=self.issue), Collaborator(user=u1, issue=self.issue)]
+        )
+        Collaborator.objects.create(user=u2, issue=self.issue)
+        Like.objects.create(user=u0, project=self.project)
+        Like.objects.create(user=u1, project=self.project)
+        self.assertEqual(
+            self.edges(),
+            {
+                (u0.pk, u1.pk): (1, 1), (u1.pk, u0.pk): (1, 1),
+                (u0.pk, u2.pk): (1, 0), (u2.pk, u0.pk): (1, 0),
+                (u1.pk, u2.pk): (1, 0), (u2.pk, u1.pk): (1, 0),
+            },
+        )
+
+        Like.objects.filter(user=u1).delete()
+        Collaborator.objects.filter(user__in=[u0, u2]).delete()
+        self.assertEqual(self.edges(), {})
+
+        Collaborator.objects.create(user=u0, issue=self.issue)
+        Like.objects.create(user=u1, project=self.project)
+        before = self.edges()
+        call_command("rebuild_affinity_graph", stdout=StringIO())
+        self.assertEqual(self.edges(), before)
+
+    def test_like_edges_bounded_to_early_likers(self):
+        u0, u1, u2, u3 = self.users[:4]
+        with connection.cursor() as cursor:
+            # Rolled back with the test.
+            cursor.execute(
+                "CREATE OR REPLACE FUNCTION projects_like_affinity_limit() RETURNS INTEGER AS 'SELECT 2' LANGUAGE sql"
+            )
+        for user in (u0, u1, u2):
+            Like.objects.create(user=user, project=self.project)
+        # Only the first two likers are linked.
+        self.assertEqual(self.edges(), {(u0.pk, u1.pk): (0, 1), (u1.pk, u0.pk): (0, 1)})
+
+        # An early liker leaves: the next one moves up.
+        Like.objects.filter(user=u0).delete()
+        self.assertEqual(self.edges(), {(u1.pk, u2.pk): (0, 1), (u2.pk, u1.pk): (0, 1)})
+        # Same when the liker's account goes (its edges cascade first).
+        Like.objects.create(user=u3, project=self.project)
+        u1.delete()
+        self.assertEqual(self.edges(), {(u2.pk, u3.pk): (0, 1), (u3.pk, u2.pk): (0, 1)})
+        before = self.edges()
+        call_command("rebuild_affinity_graph", stdout=StringIO())
+        self.assertEqual(self.edges(), before)
+
+        # Deleting the project removes every like in one statement.
+        self.project.delete()
+        self.assertEqual(self.edges(), {})
+
+    def test_network_recommendations_read_graph(self):
+        u0, u1 = self.users[:2]
+        other = Project.objects.create(
+            user=u1, title="Theirs", description="d", github_url="https://github.com/e/r"
+        )
+        Like.objects.create(user=u0, project=self.project)
+        Like.objects.create(user=u1, project=self.project)
+        call_command("refresh_project_views", stdout=StringIO())
+        self.client.force_authenticate(user=u0)
+
+        response = self.client.get(reverse("recommended-projects"), {"mode": "network"})
+        self.assertEqual([p["project_id"] for p in response.data["projects"]], [other.pk])
+        self.assertEqual(response.data["projects"][0]["affinity"], 1)
+
+    def test_collaborator_suggestions(self):
+        u0, u1, u2, u3 = self.users[:4]
+        Collaborator.objects.create(user=u0, issue=self.issue)
+        Collaborator.objects.create(user=u1, issue=self.issue)
+        # u2 likes what u0 likes; u3 only works with u1 (a friend of a friend)
+        Like.objects.create(user=u0, project=self.project)
+        Like.objects.create(user=u2, project=self.project)
+        second = Issue.objects.create(project=self.project, title="J", description="d")
+        Collaborator.objects.create(user=u1, issue=second)
+        Collaborator.objects.create(user=u3, issue=second)
+        self.client.force_authenticate(user=u0)
+
+        response = self.client.get(reverse("collaborator-suggestions"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = {row["user_id"]: row for row in response.data}
+        # u1 is already a collaborator
+        self.assertEqual(set(rows), {u2.pk, u3.pk})
+        self.assertEqual(rows[u3.pk]["mutual_connections"], 1)
+        self.assertEqual(rows[u2.pk]["shared_likes"], 1)
+        self.assertEqual(response.data[0]["user_id"], u3.pk)
+
+
+class SkillMatchEngineTests(TestCase):
+    def setUp(self):
+        matching.reset_index()
+        self.owner = User.objects.create_user(
+            nu_email="owner@nu.edu.pk", password="testpassword123", full_name="Owner"
+        )
+        self.viewer = User.objects.create_user(
+            nu_email="viewer@nu.edu.pk", password="testpassword123", full_name="Viewer"
+        )
+        self.projects = {}
+        for title, tags in {
+            "common": ["python"],
+            "rare": ["rust"],
+            "both": ["python", "rust"],
+            "other": ["python", "go"],
+            "unrelated": ["java"],
+        }.items():
+            project = Project.objects.create(
+                user=self.owner, title=title, description="d", github_url="https://github.com/e/r"
+            )
+            for tag in tags:
+                Tag.objects.create(project=project, tag=tag.title())
+            self.projects[title] = project.pk
+        Skill.objects.create(user=self.viewer, skill="Python")
+        Skill.objects.create(user=self.viewer, skill="rust")
+
+    def test_rare_tags_weigh_more(self):
+        matches = matching.match_projects(self.viewer.pk, 10)
+        ids = [project_id for project_id, _, _ in matches]
+        self.assertEqual(
+            ids,
+            [self.projects["both"], self.projects["rare"], self.projects["common"], self.projects["other"]],
+        )
+        self.assertEqual(matches[0][2], 2)
+
+    def test_own_projects_excluded_and_k_respected(self):
+        self.assertEqual(matching.match_projects(self.owner.pk, 10), None)
+        Skill.objects.create(user=self.owner, skill="python")
+        self.assertEqual(matching.match_projects(self.owner.pk, 10), [])
+        self.assertEqual(len(matching.match_projects(self.viewer.pk, 2)), 2)
+
+    def test_index_rebuilds_when_tags_change(self):
+        index = matching.get_index()
+        self.assertIs(matching.refresh_index(), index)
+        Tag.objects.create(project_id=self.projects["unrelated"], tag="rust")
+        rebuilt = matching.refresh_index()
+        self.assertIsNot(rebuilt, index)
+        self.assertIs(matching.get_index(), rebuilt)
+        self.assertIn(
+            self.projects["unrelated"],
+            [project_id for project_id, _, _ in matching.match_projects(self.viewer.pk, 10)],
+        )
+
+
+    @override_settings(SKILL_MATCH_REFRESH_INTERVAL=0)
+    def test_stale_index_served_while_refreshing(self):
+        index = matching.get_index()
+        with mock.patch.object(matching.threading, "Thread") as thread, self.assertNumQueries(0):
+            self.assertIs(matching.get_index(), index)
+            self.assertIs(matching.get_index(), index)
+        # One refresh at a time, off the request.
+        thread.assert_called_once()
+        thread.return_value.start.assert_called_once()
+
+
+class TrendingScoreTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            nu_email="owner@nu.edu.pk", password="testpassword123", full_name="Owner"
+        )
+        self.fans = [
+            User.objects.create_user(
+                nu_email=f"fan{i}@nu.edu.pk", password="testpassword123", full_name=f"Fan {i}"
+            )
+            for i in range(3)
+        ]
+        self.old, self.new = [
+            Project.objects.create(
+                user=self.owner, title=title, description="d", github_url="https://github.com/e/r"
+            )
+            for title in ("old", "new")
+        ]
+
+    def scores(self):
+        return dict(Project.objects.values_list("title", "trending_score"))
+
+    @staticmethod
+    def back_dated(hours):
+        """Create rows with ``created_at`` ``hours`` ago (auto_now_add reads timezone.now)."""
+        return mock.patch("django.utils.timezone.now", return_value=timezone.now() - timedelta(hours=hours))
+
+    def test_events_add_decayed_weight(self):
+        Like.objects.create(user=self.fans[0], project=self.old)
+        # One half-life ago: half the weight of the like made now.
+        with self.back_dated(72):
+            Comment.objects.create(user=self.fans[0], project=self.new, comment_body="x")
+        scores = self.scores()
+        self.assertAlmostEqual(scores["new"] / scores["old"], 0.5, places=4)
+
+        Like.objects.filter(project=self.old).delete()
+        self.assertEqual(self.scores()["old"], 0)
+
+    def test_unlike_removes_only_what_the_like_added(self):
+        with self.back_dated(7 * 72):
+            for fan in self.fans:
+                Like.objects.create(user=fan, project=self.old)
+        Like.objects.create(user=self.fans[0], project=self.new)
+        before = self.scores()
+        self.assertAlmostEqual(before["old"] / before["new"], 3 / 128, places=6)
+
+        Like.objects.filter(user=self.fans[0], project=self.old).delete()
+        after = self.scores()
+        self.assertAlmostEqual(after["old"] / before["old"], 2 / 3, places=6)
+        self.assertEqual(Project.objects.get(pk=self.old.pk).likes_count, 2)
+        self.assertEqual(after["new"], before["new"])
+
+    def test_renormalize_keeps_order_and_versions(self):
+        for fan in self.fans:
+            Like.objects.create(user=fan, project=self.new)
+        Like.objects.create(user=self.fans[0], project=self.old)
+        TrendingEpoch.objects.filter(pk=1).update(epoch=timezone.now() - timedelta(hours=144))
+        Project.objects.filter(title="new").update(trending_score=12.0)
+        Project.objects.filter(title="old").update(trending_score=4.0)
+        changed_at = dict(Project.objects.values_list("title", "changed_at"))
+
+        call_command("renormalize_trending", stdout=StringIO())
+
+        scores = self.scores()
+        # Two half-lives since the old epoch: every score divided by 4
+        self.assertAlmostEqual(scores["new"], 3.0, places=2)
+        self.assertAlmostEqual(scores["old"], 1.0, places=2)
+        self.assertEqual(dict(Project.objects.values_list("title", "changed_at")), changed_at)
+
+    def test_spotlight_reads_stored_score(self):
+        Like.objects.create(user=self.fans[0], project=self.old)
+        Like.objects.create(user=self.fans[1], project=self.old)
+        Like.objects.create(user=self.fans[0], project=self.new)
+        client = APIClient()
+        client.force_authenticate(user=self.fans[2])
+        cache.clear()
+
+        response = client.get(reverse("recommended-projects"), {"mode": "spotlight"})
+        self.assertEqual(
+            [p["project_id"] for p in response.data["projects"]], [self.old.pk, self.new.pk]
+        )
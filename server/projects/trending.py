@@ -0,0 +1,74 @@
+"""
+Stored trending score (Project.trending_score): renormalization.
+
+Scores are sums of ``2 ** ((event_time - epoch) / half_life)`` over likes
+and comments (see migration 0016). They grow as the epoch recedes, so the
+scheduler calls ``renormalize()`` to divide every score by the weight of
+"now" and move the epoch forward; the ordering is unchanged. When
+TRENDING_HALF_LIFE_HOURS differs from the stored half-life, the scores are
+recomputed from the likes and comments instead.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import TrendingEpoch
+
+# Divide by the weight of now: the same factor for every row.
+RENORMALIZE_SQL = """
+    UPDATE projects_project SET trending_score = trending_score / %s
+    WHERE trending_score > 0
+"""
+
+RECOUNT_SQL = """
+    UPDATE projects_project p SET trending_score =
+        COALESCE((
+            SELECT SUM(projects_trending_weight(l.created_at, %(epoch)s, %(half_life)s))
+            FROM interactions_like l
+            WHERE l.project_id = p.project_id
+        ), 0)
+        + COALESCE((
+            SELECT SUM(projects_trending_weight(c.created_at, %(epoch)s, %(half_life)s))
+            FROM interactions_comment c
+            WHERE c.project_id = p.project_id
+        ), 0)
+    WHERE p.trending_score > 0 OR p.likes_count > 0 OR p.comments_count > 0
+"""
+
+
+def is_due():
+    epoch = TrendingEpoch.objects.filter(pk=1).values_list("epoch", flat=True).first()
+    interval = timedelta(seconds=settings.TRENDING_RENORMALIZE_INTERVAL)
+    return epoch is None or timezone.now() - epoch >= interval
+
+
+@transaction.atomic
+def renormalize(recount=False):
+    """
+    Move the epoch to now. Returns ``(rows updated, recounted)``.
+
+    Holds the epoch row FOR UPDATE: the like/comment triggers read it FOR
+    SHARE, so no event is weighted against the old epoch and applied after
+    the rewrite.
+    """
+    now = timezone.now()
+    half_life = float(settings.TRENDING_HALF_LIFE_HOURS)
+    current = TrendingEpoch.objects.select_for_update().filter(pk=1).first()
+    recount = recount or current is None or current.half_life_hours != half_life
+
+    with connection.cursor() as cursor:
+        # Not a change to the projects: keep changed_at (and ETags) as is.
+        cursor.execute("SET LOCAL projects.renormalizing_trending = 'on'")
+        if recount:
+            cursor.execute(RECOUNT_SQL, {"epoch": now, "half_life": half_life})
+        else:
+            elapsed = (now - current.epoch).total_seconds()
+            cursor.execute(RENORMALIZE_SQL, [2.0 ** (elapsed / (half_life * 3600.0))])
+        rows = cursor.rowcount
+
+    TrendingEpoch.objects.update_or_create(
+        pk=1, defaults={"epoch": now, "half_life_hours": half_life}
+    )
+    return rows, recount
@@ -8,11 +8,14 @@ from .views import (
     IssueUpdateDeleteView,
     CloseIssueAndAddCollaboratorView,
     AllProjectsListView,
+    ProjectSearchView,
     PublicProjectDetailView,
     UserProjectsListView,
     ProjectCollaboratorsView,
     UserCollaboratedProjectsView,
     RecommendedProjectsView,
+    RecommendationCacheStatsView,
+    CollaboratorSuggestionsView,
     TopContributorsView,
     UserActivityStatsView,
     RecentActivityView,
@@ -22,6 +25,7 @@ from .views import (
 urlpatterns = [
     path("", ProjectListCreateView.as_view(), name="project-list-create"),
     path("all/", AllProjectsListView.as_view(), name="project-list-all"),
+    path("search/", ProjectSearchView.as_view(), name="project-search"),
     path("<int:project_id>/", ProjectDetailView.as_view(), name="project-detail"),
     path(
         "public/<int:project_id>/",
@@ -49,6 +53,16 @@ urlpatterns = [
     ),
     # Endpoints using PostgreSQL DB Views
     path("recommended/", RecommendedProjectsView.as_view(), name="recommended-projects"),
+    path(
+        "recommended/cache-stats/",
+        RecommendationCacheStatsView.as_view(),
+        name="recommended-cache-stats",
+    ),
+    path(
+        "collaborator-suggestions/",
+        CollaboratorSuggestionsView.as_view(),
+        name="collaborator-suggestions",
+    ),
     path("top-contributors/", TopContributorsView.as_view(), name="top-contributors"),
     path("user-stats/", UserActivityStatsView.as_view(), name="user-activity-stats-self"),
     path("user-stats/<int:user_id>/", UserActivityStatsView.as_view(), name="user-activity-stats"),
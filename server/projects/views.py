@@ -1,13 +1,38 @@
+from adrf import generics as async_generics
+from adrf.views import APIView as AsyncAPIView
+from asgiref.sync import sync_to_async
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 from rest_framework.views import APIView
-from django.db import connection, transaction
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Prefetch
+from django.utils import timezone
 
 from accounts.models import User
-
-from .models import Project, Issue, Collaborator, Tag
+from drf_backend.conditional import ConditionalGetMixin
+from drf_backend.db_routing import ReplicaReadMixin, read_connection
+from drf_backend.pagination import KeysetPagination
+
+from .cache import (
+    GLOBAL_MODES,
+    GLOBAL_POOL_SIZE,
+    get_cache_stats,
+    get_recommendations,
+    invalidate_user_recommendations,
+    normalize_mode,
+    set_recommendations,
+)
+from . import leaderboard
+from .affinity import get_collaborator_suggestions
+from .leaderboard import schedule_sync
+from .matviews import get_staleness
+from .recommendations import get_recommended_projects
+from .search import search_projects
+from .models import ActivityEvent, ContributorScore, Project, Issue, Collaborator
 from .serializers import (
     ProjectSerializer,
+    ProjectCardSerializer,
     ProjectCreateSerializer,
     ProjectUpdateSerializer,
     IssueSerializer,
@@ -16,46 +41,134 @@ from .serializers import (
     CollaboratorUserIssueSerializer,
     IssueWithCollaboratorsSerializer,
     CloseIssueInputSerializer,
+    ActivityEventSerializer,
 )
 
 
-class ProjectListCreateView(generics.ListCreateAPIView):
-    permission_classes = [permissions.IsAuthenticated]
+class ProjectRepresentationMixin:
+    """
+    Shared by the views that render projects.
+
+    ``?view=card`` switches GET responses to ProjectCardSerializer, and
+    ``?fields=``/``?expand=`` are handled by the serializer. Querysets go
+    through ``for_projects()``, which loads only the columns, joins and
+    prefetches the rendered fields need.
+    """
+
+    representation_query_param = "view"
+
+    def get_project_serializer_class(self):
+        if self.request.query_params.get(self.representation_query_param) == "card":
+            return ProjectCardSerializer
+        return ProjectSerializer
+
+    def get_serializer_class(self):
+        return self.get_project_serializer_class()
+
+    def get_rendered_fields(self):
+        if not hasattr(self, "_rendered_fields"):
+            serializer_class = self.get_project_serializer_class()
+            serializer = serializer_class(context=self.get_serializer_context())
+            self._rendered_fields = list(serializer.fields)
+        return self._rendered_fields
+
+    def for_projects(self, queryset):
+        return queryset.for_serialization(self.request.user, fields=self.get_rendered_fields())
+
+
+class ProjectListConditionalMixin(ConditionalGetMixin):
+    """
+    ETag for keyset-paginated project lists: the page's project ids with
+    their changed_at and the owners' updated_at. Views provide the
+    unannotated ``get_project_queryset()``.
+    """
+
+    def get_version_rows(self):
+        return self.get_page_version_rows(
+            self.get_project_queryset(), "changed_at", "user__updated_at"
+        )
 
     def get_queryset(self):
+        return self.for_projects(self.get_project_queryset())
+
+
+class ProjectListCreateView(ProjectListConditionalMixin, ProjectRepresentationMixin, generics.ListCreateAPIView):
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-created_at", "-project_id")
+
+    def get_project_queryset(self):
         return Project.objects.filter(user=self.request.user)
 
     def get_serializer_class(self):
         if self.request.method == "POST":
             return ProjectCreateSerializer
-        return ProjectSerializer
+        return self.get_project_serializer_class()
 
 
-class ProjectDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ProjectDetailView(ProjectRepresentationMixin, generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticated]
     lookup_field = "project_id"
 
     def get_serializer_class(self):
         if self.request.method in ["PUT", "PATCH"]:
             return ProjectUpdateSerializer
-        return ProjectSerializer
+        return self.get_project_serializer_class()
 
     def get_queryset(self):
-        return Project.objects.filter(user=self.request.user)
+        qs = Project.objects.filter(user=self.request.user)
+        if self.request.method == "GET":
+            qs = self.for_projects(qs)
+        return qs
 
 
-class AllProjectsListView(generics.ListAPIView):
+class AllProjectsListView(ReplicaReadMixin, ProjectListConditionalMixin, ProjectRepresentationMixin, generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
-    serializer_class = ProjectSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-created_at", "-project_id")
 
-    def get_queryset(self):
-        return Project.objects.select_related("user").all()
+    def get_project_queryset(self):
+        return Project.objects.all()
 
-class PublicProjectDetailView(generics.RetrieveAPIView):
+class PublicProjectDetailView(ConditionalGetMixin, ProjectRepresentationMixin, generics.RetrieveAPIView):
     permission_classes = [permissions.IsAuthenticated]
-    serializer_class = ProjectSerializer
     lookup_field = "project_id"
-    queryset = Project.objects.select_related("user").prefetch_related("tags", "issues")
+
+    def get_queryset(self):
+        return self.for_projects(Project.objects.all())
+
+    def get_version_rows(self):
+        # changed_at covers the project and its likes, comments, tags,
+        # issues and collaborators; the owner's name comes from accounts_user.
+        rows = list(
+            Project.objects.filter(project_id=self.kwargs["project_id"])
+            .values_list("changed_at", "user__updated_at")
+        )
+        return rows or None
+
+    def get_last_modified(self, rows):
+        return max(rows[0])
+
+class ProjectSearchView(ReplicaReadMixin, ProjectRepresentationMixin, generics.ListAPIView):
+    """
+    GET /projects/search/?q=<text>&tag=<tag>
+    Full-text search over title, tags and description with prefix
+    matching, ranked by ts_rank and keyset-paginated. ``tag`` keeps
+    projects carrying that tag; with a tag and no text, every tagged
+    project is returned, newest first.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-rank", "-project_id")
+
+    def get_queryset(self):
+        text = self.request.query_params.get("q", "")
+        tag = self.request.query_params.get("tag", "").strip()
+        projects = Project.objects.all()
+        if tag:
+            projects = projects.filter(tags__tag=tag)
+        return self.for_projects(search_projects(projects, text, match_empty=bool(tag)))
+
 
 class IssueCreateView(generics.CreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -92,113 +205,172 @@ class IssueUpdateDeleteView(generics.RetrieveUpdateDestroyAPIView):
         return Issue.objects.filter(project__user=self.request.user)
 
 
+def collaborators_of(project_id=None):
+    """Users with at least one collaboration (on ``project_id``'s issues, if given)."""
+    collaborations = Collaborator.objects.filter(user=OuterRef("pk"))
+    if project_id is not None:
+        collaborations = collaborations.filter(issue__project_id=project_id)
+    return User.objects.filter(Exists(collaborations))
+
+
+def collaborations_prefetch(project_id=None):
+    """
+    Prefetch each user's Collaborator rows as ``scoped_collaborations``,
+    with the issue and project titles joined in the same query and
+    restricted to ``project_id`` when given.
+    """
+    collaborations = (
+        Collaborator.objects.select_related("issue__project")
+        .only("user", "issue__title", "issue__status", "issue__project__title")
+        .order_by("-issue_id")
+    )
+    if project_id is not None:
+        collaborations = collaborations.filter(issue__project_id=project_id)
+    return Prefetch("issue_collaborations", queryset=collaborations, to_attr="scoped_collaborations")
+
+
 class CloseIssueAndAddCollaboratorView(generics.GenericAPIView):
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
 
     serializer_class = CloseIssueInputSerializer
     queryset = Issue.objects.none()
 
     def post(self, request, *args, **kwargs):
-        print("=== CloseIssue POST called ===")
-        print(f"Request data: {request.data}")
-        
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        issue_id = serializer.validated_data["issue_id"]
-        user_ids = serializer.validated_data.get("user_ids", [])
-        
-        print(f"Validated issue_id: {issue_id}")
-        print(f"Validated user_ids: {user_ids}")
-
-        try:
-            issue = Issue.objects.select_related("project").get(issue_id=issue_id)
-        except Issue.DoesNotExist:
-            return Response(
-                {"detail": "Issue not found."},
-                status=status.HTTP_404_NOT_FOUND,
-            )
+        batch = serializer.validated_data["issues"]
+        issue_ids = [item["issue_id"] for item in batch]
+
+        # One query for the issues (with their project owner) ...
+        issues = {
+            issue.issue_id: issue
+            for issue in Issue.objects.filter(issue_id__in=issue_ids).select_related("project")
+        }
+        missing = [issue_id for issue_id in issue_ids if issue_id not in issues]
+        if missing:
+            detail = "Issue not found." if len(issue_ids) == 1 else f"Issues not found: {missing}."
+            return Response({"detail": detail}, status=status.HTTP_404_NOT_FOUND)
 
         # Only the owner of the issue's project can close it and add collaborators
-        if issue.project.user != request.user:
+        if any(issue.project.user_id != request.user.pk for issue in issues.values()):
             return Response(
                 {"detail": "You do not have permission to modify this issue."},
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        collaborator_ids = []
-        collaborator_users = []
-        for user_id in user_ids:
-            print(f"Processing user_id: {user_id}")
-            try:
-                user = User.objects.get(user_id=user_id)
-                print(f"Found user: {user.full_name}")
-            except User.DoesNotExist:
-                return Response(
-                    {"detail": f"User with id {user_id} not found."},
-                    status=status.HTTP_404_NOT_FOUND,
-                )
-            collaborator_users.append(user)
-            collaborator_ids.append(user.user_id)
+        # ... and one for every referenced user.
+        user_ids = {user_id for item in batch for user_id in item["user_ids"]}
+        found = set(User.objects.filter(user_id__in=user_ids).values_list("user_id", flat=True))
+        missing = sorted(user_ids - found)
+        if missing:
+            detail = (
+                f"User with id {missing[0]} not found."
+                if len(missing) == 1
+                else f"Users not found: {missing}."
+            )
+            return Response({"detail": detail}, status=status.HTTP_404_NOT_FOUND)
 
-        # Close the issue and add collaborators atomically
+        # Close the issues and add collaborators atomically: one UPDATE and
+        # one INSERT ... ON CONFLICT DO NOTHING, whatever the batch size.
         with transaction.atomic():
-            issue.status = Issue.STATUS_CLOSED
-            issue.save(update_fields=["status", "updated_at"])
-            print(f"Issue {issue_id} closed")
-
-            # Create collaborator entries (idempotent via unique_together)
-            for collaborator_user in collaborator_users:
-                collab, created = Collaborator.objects.get_or_create(user=collaborator_user, issue=issue)
-                print(f"Collaborator created={created} for user={collaborator_user.full_name}, issue={issue.issue_id}")
-
-        # Verify what's in the database
-        all_collabs = Collaborator.objects.filter(issue=issue)
-        print(f"Total collaborators for issue {issue_id}: {all_collabs.count()}")
-        for c in all_collabs:
-            print(f"  - user_id={c.user_id}, issue_id={c.issue_id}")
+            Issue.objects.filter(issue_id__in=issue_ids).update(
+                status=Issue.STATUS_CLOSED, updated_at=timezone.now()
+            )
+            Collaborator.objects.bulk_create(
+                [
+                    Collaborator(user_id=user_id, issue_id=item["issue_id"])
+                    for item in batch
+                    for user_id in item["user_ids"]
+                ],
+                ignore_conflicts=True,
+            )
+            # bulk_create skips the post_save receivers in signals.py.
+            for user_id in user_ids:
+                invalidate_user_recommendations(user_id, ["network"])
+            schedule_sync(user_ids)
 
-        return Response(
+        results = [
             {
-                "detail": "Issue closed successfully.",
-                "issue_id": issue.issue_id,
-                "status": issue.status,
-                "collaborator_user_ids": collaborator_ids,
-            },
-            status=status.HTTP_200_OK,
-        )
+                "issue_id": item["issue_id"],
+                "status": Issue.STATUS_CLOSED,
+                "collaborator_user_ids": item["user_ids"],
+            }
+            for item in batch
+        ]
+        data = {"detail": "Issue closed successfully." if len(batch) == 1 else "Issues closed successfully."}
+        if "issue_id" in serializer.validated_data:
+            data.update(results[0])
+        else:
+            data["issues"] = results
+        return Response(data, status=status.HTTP_200_OK)
+
+    @property
+    def keyset_ordering(self):
+        if self.request.query_params.get("mode") == "users":
+            return ("user_id",)
+        return ("-issue_id",)
 
     def get(self, request, *args, **kwargs):
+        """
+        Collaborator directory, keyset-paginated.
+
+        ?mode=users   users who collaborated, each with their issues
+        ?mode=issues  issues with collaborators, each with its users (default)
+
+        ?project_id= narrows both modes to one project. Each page is one
+        query for the rows plus one prefetch for the nested side.
+        """
         mode = request.query_params.get("mode", "issues")
+        project_id = request.query_params.get("project_id")
+        if project_id is not None and not project_id.isdigit():
+            return Response(
+                {"detail": "project_id must be an integer."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
         if mode == "users":
             # Users with their collaborated issues
-            users = (
-                User.objects.filter(issue_collaborations__isnull=False)
-                .distinct()
+            queryset = collaborators_of(project_id).prefetch_related(
+                collaborations_prefetch(project_id)
             )
-            serializer = CollaboratorUserIssueSerializer(users, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            serializer_class = CollaboratorUserIssueSerializer
+        else:
+            # Default: issues with their collaborators
+            queryset = Issue.objects.filter(
+                Exists(Collaborator.objects.filter(issue=OuterRef("pk")))
+            ).prefetch_related(
+                Prefetch(
+                    "collaborators",
+                    queryset=Collaborator.objects.select_related("user").order_by("user_id"),
+                    to_attr="prefetched_collaborators",
+                )
+            )
+            if project_id is not None:
+                queryset = queryset.filter(project_id=project_id)
+            serializer_class = IssueWithCollaboratorsSerializer
 
-        # Default: issues with their collaborators
-        issues = Issue.objects.filter(collaborators__isnull=False).distinct()
-        serializer = IssueWithCollaboratorsSerializer(issues, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        page = self.paginate_queryset(queryset)
+        serializer = serializer_class(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
 
-class ProjectCollaboratorsView(generics.ListAPIView):
+class ProjectCollaboratorsView(ReplicaReadMixin, generics.ListAPIView):
+    """
+    Users who collaborated on this project's issues, each listing only
+    the issues of this project. Keyset-paginated by user_id.
+    """
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = CollaboratorUserIssueSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = ("user_id",)
 
     def get_queryset(self):
         project_id = self.kwargs.get("project_id")
-        # All users who have collaborated on any issue under this project
-        return (
-            User.objects.filter(issue_collaborations__issue__project__project_id=project_id)
-            .distinct()
-        )
+        return collaborators_of(project_id).prefetch_related(collaborations_prefetch(project_id))
 
 
-class UserCollaboratedProjectsView(generics.ListAPIView):
+class UserCollaboratedProjectsView(ReplicaReadMixin, generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
     queryset = Project.objects.none()
 
@@ -220,171 +392,226 @@ class UserCollaboratedProjectsView(generics.ListAPIView):
         ]
         return Response(data)
 
-class UserProjectsListView(generics.ListAPIView):
+class UserProjectsListView(ReplicaReadMixin, ProjectListConditionalMixin, ProjectRepresentationMixin, generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
-    serializer_class = ProjectSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-created_at", "-project_id")
 
-    def get_queryset(self):
+    def get_project_queryset(self):
         user_id = self.kwargs.get("user_id")
-        return Project.objects.select_related("user").filter(user__user_id=user_id)
+        return Project.objects.filter(user__user_id=user_id)
 
 
 # ============================================================
 # Views using PostgreSQL DB Views (created in migration 0007)
 # ============================================================
 
-class RecommendedProjectsView(APIView):
+class RecommendedProjectsView(ReplicaReadMixin, AsyncAPIView):
     """
     GET /projects/recommended/?mode=spotlight|with-issues|skill-match|network
-    Uses DB views for fast pre-computed recommendations.
+    Uses materialized DB views for fast pre-computed recommendations;
+    refreshed_at / stale_seconds report how old that snapshot is.
+
+    Results are cached (see projects.cache): skill-match and network per
+    user, the global modes once for everybody with the caller's own
+    projects filtered out afterwards.
+
+    Async: under ASGI the cache and SQL calls run in the request's worker
+    thread while the event loop keeps serving other requests.
     """
     permission_classes = [permissions.IsAuthenticated]
+    trust_token_claims = True
+    throttle_scope = "recommended"
+    limit = 20
 
-    def get(self, request):
+    async def get(self, request):
         mode = request.query_params.get("mode", "spotlight")
         user_id = request.user.user_id
 
-        with connection.cursor() as cursor:
-            if mode == "spotlight":
-                cursor.execute("""
-                    SELECT project_id, title, description, github_url,
-                        owner_id, owner_full_name, owner_nu_email, owner_avatar_url,
-                        likes_count, comments_count, open_issues, closed_issues,
-                        engagement_score, trending_score, days_since_update,
-                        created_at, updated_at
-                    FROM trending_projects_view
-                    WHERE owner_id != %s
-                    ORDER BY trending_score DESC
-                    LIMIT 20
-                """, [user_id])
-
-            elif mode == "with-issues":
-                cursor.execute("""
-                    SELECT project_id, title, description, github_url,
-                        owner_id, owner_full_name, owner_nu_email, owner_avatar_url,
-                        likes_count, comments_count, open_issues, closed_issues,
-                        engagement_score, 0 AS trending_score, days_since_update,
-                        created_at, updated_at
-                    FROM projects_needing_help_view
-                    WHERE owner_id != %s
-                    ORDER BY open_issues DESC
-                    LIMIT 20
-                """, [user_id])
-
-            elif mode == "skill-match":
-                cursor.execute(
-                    "SELECT LOWER(skill) FROM accounts_skill WHERE user_id = %s",
-                    [user_id]
+        payload = await sync_to_async(get_recommendations)(mode, user_id)
+        cache_status = "miss" if payload is None else "hit"
+
+        if normalize_mode(mode) in GLOBAL_MODES:
+            if payload is None:
+                payload = await sync_to_async(self.build_payload)(
+                    mode, user_id, GLOBAL_POOL_SIZE, exclude_own=False
                 )
-                user_skills = [row[0] for row in cursor.fetchall()]
-
-                if not user_skills:
-                    return Response({
-                        "projects": [],
-                        "mode": mode,
-                        "message": "Add skills to your profile to get personalised recommendations.",
-                    })
-
-                placeholders = ",".join(["%s"] * len(user_skills))
-                cursor.execute(f"""
-                    SELECT DISTINCT
-                        p.project_id, p.title, p.description, p.github_url,
-                        p.owner_id, p.owner_full_name, p.owner_nu_email, p.owner_avatar_url,
-                        p.likes_count, p.comments_count, p.open_issues, p.closed_issues,
-                        p.engagement_score, 0 AS trending_score, p.days_since_update,
-                        p.created_at, p.updated_at,
-                        COUNT(ptf.tag) AS skill_matches
-                    FROM project_summary_view p
-                    JOIN project_tags_flat_view ptf ON p.project_id = ptf.project_id
-                    WHERE ptf.tag IN ({placeholders})
-                    AND p.owner_id != %s
-                    GROUP BY
-                        p.project_id, p.title, p.description, p.github_url,
-                        p.owner_id, p.owner_full_name, p.owner_nu_email, p.owner_avatar_url,
-                        p.likes_count, p.comments_count, p.open_issues, p.closed_issues,
-                        p.engagement_score, p.days_since_update, p.created_at, p.updated_at
-                    ORDER BY skill_matches DESC, p.engagement_score DESC
-                    LIMIT 20
-                """, user_skills + [user_id])
-
-            elif mode == "network":
-                cursor.execute("""
-                    SELECT DISTINCT
-                        p.project_id, p.title, p.description, p.github_url,
-                        p.owner_id, p.owner_full_name, p.owner_nu_email, p.owner_avatar_url,
-                        p.likes_count, p.comments_count, p.open_issues, p.closed_issues,
-                        p.engagement_score, 0 AS trending_score, p.days_since_update,
-                        p.created_at, p.updated_at
-                    FROM project_summary_view p
-                    WHERE p.project_id IN (
-                        SELECT project_id FROM get_user_network_projects(%s)
-                    )
-                    ORDER BY p.engagement_score DESC
-                    LIMIT 20
-                """, [user_id])
-
-            else:
-                cursor.execute("""
-                    SELECT project_id, title, description, github_url,
-                        owner_id, owner_full_name, owner_nu_email, owner_avatar_url,
-                        likes_count, comments_count, open_issues, closed_issues,
-                        engagement_score, 0 AS trending_score, days_since_update,
-                        created_at, updated_at
-                    FROM project_summary_view
-                    WHERE owner_id != %s
-                    ORDER BY created_at DESC
-                    LIMIT 20
-                """, [user_id])
 
-            columns = [col[0] for col in cursor.description]
-            projects = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            projects = [p for p in payload["projects"] if p["owner_id"] != user_id]
+            if len(projects) < self.limit and len(payload["projects"]) >= GLOBAL_POOL_SIZE:
+                # The caller owns most of the shared pool; query just for them.
+                projects, _ = await sync_to_async(get_recommended_projects)(
+                    normalize_mode(mode), user_id, self.limit
+                )
+            payload = {**payload, "projects": projects[: self.limit]}
+
+        elif payload is None:
+            payload = await sync_to_async(self.build_payload)(mode, user_id, self.limit)
+
+        stale_seconds = None
+        if payload["refreshed_at"] is not None:
+            stale_seconds = int((timezone.now() - payload["refreshed_at"]).total_seconds())
+
+        response = {"projects": payload["projects"], "mode": mode}
+        if payload.get("message"):
+            response["message"] = payload["message"]
+        response.update({
+            "refreshed_at": payload["refreshed_at"],
+            "stale_seconds": stale_seconds,
+            "cache": cache_status,
+        })
+        return Response(response)
+
+    def build_payload(self, mode, user_id, limit, exclude_own=True):
+        refreshed_at, _ = get_staleness()
+        projects, message = get_recommended_projects(
+            normalize_mode(mode), user_id, limit, exclude_own=exclude_own
+        )
+        payload = {"projects": projects, "message": message, "refreshed_at": refreshed_at}
+        set_recommendations(mode, user_id, payload)
+        return payload
 
-        # Attach tags to each project
-        for project in projects:
-            tags = Tag.objects.filter(
-                project_id=project["project_id"]
-            ).values_list("tag", flat=True)
-            project["tags"] = list(tags)
 
-        return Response({"projects": projects, "mode": mode})
+class RecommendationCacheStatsView(APIView):
+    """
+    GET /projects/recommended/cache-stats/
+    Hit/miss counters of the recommendation cache (staff only).
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(get_cache_stats())
 
 
-class TopContributorsView(APIView):
+class CollaboratorSuggestionsView(ReplicaReadMixin, APIView):
     """
-    GET /projects/top-contributors/?limit=10
-    Uses top_contributors_view with RANK() window function.
+    GET /projects/collaborator-suggestions/?limit=10
+    People you may want to collaborate with, from the user affinity graph
+    (see projects.affinity): people who like the same projects as you and
+    people connected to your neighbours, excluding current collaborators.
     """
     permission_classes = [permissions.IsAuthenticated]
+    trust_token_claims = True
+    max_limit = 50
 
     def get(self, request):
-        limit = min(int(request.query_params.get("limit", 10)), 50)
+        try:
+            limit = min(max(int(request.query_params.get("limit", 10)), 1), self.max_limit)
+        except ValueError:
+            return Response(
+                {"detail": "limit must be an integer."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(get_collaborator_suggestions(request.user.pk, limit))
 
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT user_id, full_name, nu_email, avatar_url,
-                    projects_created, issues_collaborated, comments_made,
-                    activity_score, rank
-                FROM top_contributors_view
-                LIMIT %s
-            """, [limit])
-            columns = [col[0] for col in cursor.description]
-            contributors = [dict(zip(columns, row)) for row in cursor.fetchall()]
 
-        return Response(contributors)
+class TopContributorsView(ReplicaReadMixin, AsyncAPIView):
+    """
+    GET /projects/top-contributors/?limit=10&offset=0
+    GET /projects/top-contributors/?around=me&limit=10
+
+    Reads the trigger-maintained ContributorScore store through its Redis
+    sorted-set mirror (see projects.leaderboard). ``around=me`` (or a
+    user id) returns the window of ``limit`` users centred on that user.
+    Every response carries the caller's own entry as ``me``.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    trust_token_claims = True
+    max_limit = 50
+
+    async def get(self, request):
+        try:
+            limit = min(max(int(request.query_params.get("limit", 10)), 1), self.max_limit)
+            offset = max(int(request.query_params.get("offset", 0)), 0)
+        except ValueError:
+            return Response(
+                {"detail": "limit and offset must be integers."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
+        around = request.query_params.get("around")
+        if around is not None:
+            target = request.user.pk if around == "me" else around
+            try:
+                position = await sync_to_async(leaderboard.get_position)(int(target))
+            except ValueError:
+                position = None
+            if position is None:
+                return Response({"detail": "User not found."}, status=status.HTTP_404_NOT_FOUND)
+            offset = max(position - limit // 2, 0)
+
+        entries, has_more = await sync_to_async(leaderboard.get_page)(offset, limit)
+        me = await sync_to_async(self.get_my_entry)(request.user.pk, entries)
+
+        all_entries = entries + ([me] if me and me not in entries else [])
+        details = {
+            score.user_id: score
+            async for score in ContributorScore.objects.filter(
+                user_id__in=[user_id for user_id, _, _ in all_entries]
+            ).select_related("user")
+        }
+
+        next_link = None
+        if has_more:
+            url = request.build_absolute_uri()
+            url = remove_query_param(url, "around")
+            next_link = replace_query_param(url, "offset", offset + limit)
+
+        return Response(
+            {
+                "next": next_link,
+                "results": [self.serialize(entry, details) for entry in entries if entry[0] in details],
+                "me": self.serialize(me, details) if me and me[0] in details else None,
+            }
+        )
 
-class UserActivityStatsView(APIView):
+    def get_my_entry(self, user_id, entries):
+        for entry in entries:
+            if entry[0] == user_id:
+                return entry
+        position = leaderboard.get_position(user_id)
+        if position is None:
+            return None
+        mine, _ = leaderboard.get_page(position, 1)
+        return mine[0] if mine else None
+
+    @staticmethod
+    def serialize(entry, details):
+        user_id, activity_score, rank = entry
+        score = details[user_id]
+        return {
+            "user_id": user_id,
+            "full_name": score.user.full_name,
+            "nu_email": score.user.nu_email,
+            "avatar_url": score.user.avatar_url,
+            "projects_created": score.projects_created,
+            "issues_collaborated": score.issues_collaborated,
+            "comments_made": score.comments_made,
+            "activity_score": activity_score,
+            "rank": rank,
+        }
+
+
+class UserActivityStatsView(ReplicaReadMixin, AsyncAPIView):
     """
     GET /projects/user-stats/              → current user
     GET /projects/user-stats/<user_id>/   → specific user
-    Uses user_activity_view.
+    Uses user_activity_view (aggregates over every activity table; the
+    query runs off the event loop under ASGI).
     """
     permission_classes = [permissions.IsAuthenticated]
+    trust_token_claims = True
 
-    def get(self, request, user_id=None):
+    async def get(self, request, user_id=None):
         target_user_id = user_id or request.user.user_id
+        stats = await sync_to_async(self.get_stats)(target_user_id)
+        if stats is None:
+            return Response({"detail": "User not found."}, status=404)
+        return Response(stats)
 
-        with connection.cursor() as cursor:
+    @staticmethod
+    def get_stats(user_id):
+        with read_connection().cursor() as cursor:
             cursor.execute("""
                 SELECT user_id, full_name, nu_email, avatar_url, bio,
                     github_username, is_github_connected, member_since,
@@ -392,35 +619,31 @@ class UserActivityStatsView(APIView):
                     likes_given, comments_made, skill_count, activity_score
                 FROM user_activity_view
                 WHERE user_id = %s
-            """, [target_user_id])
+            """, [user_id])
             row = cursor.fetchone()
-
-        if not row:
-            return Response({"detail": "User not found."}, status=404)
-
-        columns = [col[0] for col in cursor.description]
-        return Response(dict(zip(columns, row)))
+            if not row:
+                return None
+            columns = [col[0] for col in cursor.description]
+        return dict(zip(columns, row))
 
 
-class RecentActivityView(APIView):
+class RecentActivityView(ReplicaReadMixin, async_generics.ListAPIView):
     """
-    GET /projects/recent-activity/?limit=20
-    Uses recent_activity_view (UNION ALL of projects + comments).
+    GET /projects/recent-activity/
+    GET /projects/recent-activity/?feed=network
+
+    Keyset-paginated over the activity_event table (newest first).
+    ``feed=network`` narrows it to the people and projects the caller
+    interacts with.
     """
     permission_classes = [permissions.IsAuthenticated]
+    trust_token_claims = True
+    serializer_class = ActivityEventSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-created_at", "-id")
 
-    def get(self, request):
-        limit = min(int(request.query_params.get("limit", 20)), 100)
-
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT activity_type, entity_id, entity_title,
-                    user_id, full_name, avatar_url, activity_date
-                FROM recent_activity_view
-                ORDER BY activity_date DESC
-                LIMIT %s
-            """, [limit])
-            columns = [col[0] for col in cursor.description]
-            activities = [dict(zip(columns, row)) for row in cursor.fetchall()]
-
-        return Response(activities)
\ No newline at end of file
+    def get_queryset(self):
+        queryset = ActivityEvent.objects.for_feed()
+        if self.request.query_params.get("feed") == "network":
+            return queryset.for_network(self.request.user.pk)
+        return queryset
\ No newline at end of file